@@ -1,13 +1,37 @@
+import click
 from flask import Flask, jsonify
-from .extensions import db, migrate, jwt
+from .extensions import (
+    db, jwt, cache, hasher, adb, sqlite_profile, replica_router, group_commit, metrics, query_budgets, search,
+    events
+)
+from .hashing import HashingBusy
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
 from .routes import register_routes
-from .routes.swagger import swagger_bp
+from .routes.swagger import swagger_ui_blueprint, register_swagger_spec
+from .cli import tasks_cli
+from .serializers import FastJSONProvider
 from .__version__ import __version__, __description__
 import os
 
-def create_app(config_name=None):
-    """Application factory pattern."""
+
+def init_migrate(app):
+    """Register Flask-Migrate and its ``flask db`` commands.
+
+    Alembic is a fifth of the import time and only the CLI needs it, so
+    :func:`create_app` calls this only when built by a ``flask`` command.
+    """
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+
+def create_app(config_name=None, async_mode=None):
+    """Application factory pattern.
+
+    ``async_mode`` overrides the ``ASYNC_MODE`` setting: async task and auth
+    handlers backed by an async SQLAlchemy engine (see ``asgi.py``).
+    """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Load configuration
     if config_name is None:
@@ -25,15 +49,33 @@ def create_app(config_name=None):
     else:
         # Fallback to the Config class for backward compatibility
         app.config.from_object('config.Config')
+    if async_mode is not None:
+        app.config['ASYNC_MODE'] = async_mode
 
     # Initialize extensions
+    adb.init_app(app)  # before db, it may point an in-memory database at a shared one
     db.init_app(app)
-    migrate.init_app(app, db)
+    sqlite_profile.init_app(app)
+    search.init_app(app)
+    if click.get_current_context(silent=True) is not None:
+        init_migrate(app)
     jwt.init_app(app)
+    cache.init_app(app)
+    events.init_app(app)
+    hasher.init_app(app)
+    replica_router.init_app(app)
+    group_commit.init_app(app)
+    metrics.init_app(app)  # first before/after_request hooks, so they time the others
+    query_budgets.init_app(app)
 
     # Register routes
     register_routes(app)
-    app.register_blueprint(swagger_bp, url_prefix='/swagger')
+    if app.config.get('SWAGGER_UI_ENABLED'):
+        app.register_blueprint(swagger_ui_blueprint(), url_prefix='/swagger')
+    register_swagger_spec(app)
+
+    # CLI commands
+    app.cli.add_command(tasks_cli)
     
     # Serve static files for swagger.json
     @app.route('/static/<path:filename>')
@@ -48,9 +90,18 @@ def create_app(config_name=None):
             'message': 'Task Manager API is running!',
             'version': __version__,
             'description': __description__,
-            'environment': config_name
+            'environment': config_name,
+            'async_mode': bool(app.config.get('ASYNC_MODE')),
+            'cache': cache.stats(),
+            'events': events.stats(),
+            'jwt_cache': jwt.cache_stats()
         }, 200
 
+    if app.config.get('METRICS_ENABLED'):
+        @app.route('/metrics')
+        def prometheus_metrics():
+            return metrics.render(), 200, {'Content-Type': METRICS_CONTENT_TYPE}
+
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -60,4 +111,10 @@ def create_app(config_name=None):
     def internal_error(error):
         return jsonify({'error': 'Internal server error'}), 500
 
+    @app.errorhandler(HashingBusy)
+    def hashing_busy(error):
+        return jsonify({'error': 'Server busy, please retry'}), 503, {
+            'Retry-After': str(app.config['PASSWORD_HASH_RETRY_AFTER'])
+        }
+
     return app
@@ -0,0 +1,107 @@
+import threading
+import uuid
+from flask import current_app
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool, StaticPool
+from .replicas import replica_for_request
+
+# Sync driver name -> asyncio driver used by the async engine
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def to_async_url(url):
+    """Swap the driver of a sync database URL for its asyncio counterpart."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver configured for {backend!r} databases')
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+class AsyncDatabase:
+    """Async SQLAlchemy engine and sessions used by the async route handlers.
+
+    Active when ``ASYNC_MODE`` is set. The engine points at the same database
+    as ``db`` (Flask-SQLAlchemy), which keeps serving migrations, the CLI and
+    the streaming export/import endpoints. Flask runs every async view in a
+    fresh event loop unless the app is served through ``asgi.py``, and pooled
+    asyncio connections cannot move between loops, so the engine only pools
+    connections when ``ASYNC_SQLALCHEMY_POOLED`` is on. Each read replica of
+    ``SQLALCHEMY_READ_REPLICAS`` gets an async engine too, and sessions opened
+    by read requests are bound to the one ``app.replicas`` picks.
+    """
+
+    def init_app(self, app):
+        """Prepare ``app`` for async mode; call before ``db.init_app``."""
+        app.extensions['async_db'] = None
+        if not app.config.get('ASYNC_MODE'):
+            return
+        url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+            # A private in-memory database is per connection; switch to a named
+            # shared-cache one so the sync and async engines see the same data
+            app.config['SQLALCHEMY_DATABASE_URI'] = (
+                f'sqlite:///file:/memdb-{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true'
+            )
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+                **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}),
+                'poolclass': StaticPool,
+                'connect_args': {'check_same_thread': False},
+            }
+        app.extensions['async_db'] = {
+            'engine': None, 'replicas': {}, 'sessionmaker': None, 'lock': threading.Lock()
+        }
+
+    def _state(self):
+        state = current_app.extensions.get('async_db')
+        if state is None:
+            raise RuntimeError('Async mode is not enabled for this app (set ASYNC_MODE)')
+        if state['engine'] is None:
+            with state['lock']:
+                if state['engine'] is None:
+                    # Created on first use so they inherit the URLs Flask-SQLAlchemy resolved
+                    from .extensions import db
+                    if current_app.extensions.get('replica_router'):
+                        state['replicas'] = {
+                            key: self._create_engine(db.engines[key].url)
+                            for key in current_app.config['SQLALCHEMY_READ_REPLICAS']
+                        }
+                    engine = self._create_engine(db.engine.url)
+                    state['sessionmaker'] = async_sessionmaker(
+                        engine, class_=AsyncSession, expire_on_commit=False
+                    )
+                    state['engine'] = engine
+        return state
+
+    def _create_engine(self, url):
+        from .extensions import sqlite_profile, metrics, query_budgets
+        options = dict(current_app.config.get('ASYNC_SQLALCHEMY_ENGINE_OPTIONS', {}))
+        if not current_app.config.get('ASYNC_SQLALCHEMY_POOLED'):
+            options['poolclass'] = NullPool
+        engine = create_async_engine(to_async_url(url), **options)
+        sqlite_profile.register(engine.sync_engine, current_app.extensions.get('sqlite_profile'))
+        metrics.register(engine.sync_engine, current_app.extensions.get('metrics'))
+        query_budgets.register(engine.sync_engine, current_app._get_current_object())
+        return engine
+
+    @property
+    def engine(self):
+        return self._state()['engine']
+
+    def session(self):
+        """A new :class:`AsyncSession`; use as ``async with adb.session() as session``.
+
+        In a read request it is bound to that request's replica, following the
+        same rules as ``db.session`` (see :class:`app.replicas.ReplicaRouter`);
+        a read request that is about to write calls ``use_primary()`` first.
+        """
+        state = self._state()
+        key = replica_for_request()
+        if key is not None:
+            return state['sessionmaker'](bind=state['replicas'][key])
+        return state['sessionmaker']()
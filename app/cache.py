@@ -0,0 +1,232 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+class CacheBackend:
+    """Interface every cache backend implements.
+
+    Generation counters are kept apart from cached entries: entries may be
+    evicted or expire at any time, but a generation must never go backwards,
+    otherwise entries written under an older generation could be served again.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def get_generation(self, key):
+        raise NotImplementedError
+
+    def incr_generation(self, key):
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything; disables caching."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def get_generation(self, key):
+        return 0
+
+    def incr_generation(self, key):
+        return 0
+
+    def stats(self):
+        return {'backend': 'null'}
+
+
+class LRUCache(CacheBackend):
+    """In-process LRU cache with per-entry TTL and a cap on the number of entries."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_generation(self, key):
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def incr_generation(self, key):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            return self._generations[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'lru',
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class LocalSharedClient:
+    """Thread-safe in-memory stand-in for the subset of the redis-py client
+    that :class:`SharedCache` uses (``get``, ``set(ex=...)``, ``incr``)."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            item = self._data.get(name)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            expires_at = time.monotonic() + ex if ex else None
+            self._data[name] = (value if isinstance(value, bytes) else str(value).encode(), expires_at)
+        return True
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            value, expires_at = self._data.get(name, (b'0', None))
+            value = int(value) + amount
+            self._data[name] = (str(value).encode(), expires_at)
+            return value
+
+
+class SharedCache(CacheBackend):
+    """Backend for a cache shared between processes (e.g. a redis-py client).
+
+    Values are stored as JSON, entries carry a TTL and generation keys are
+    written without one. Counters are local to this process.
+    """
+
+    def __init__(self, client, prefix='taskcache:'):
+        self.client = client
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        self._count(raw is not None)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    def get_generation(self, key):
+        raw = self.client.get(self.prefix + key)
+        return 0 if raw is None else int(raw)
+
+    def incr_generation(self, key):
+        return self.client.incr(self.prefix + key)
+
+    def stats(self):
+        with self._lock:
+            # Evictions happen inside the shared server and are reported there
+            return {'backend': 'shared', 'hits': self.hits, 'misses': self.misses}
+
+
+class TaskCache:
+    """Per-user read cache for task responses.
+
+    Keys embed the user's generation counter; every write bumps it, so
+    entries cached before the write can no longer be addressed. Generations
+    live in the backend, so only ``'shared'`` invalidates across processes.
+    """
+
+    def init_app(self, app):
+        client = app.config.get('CACHE_SHARED_CLIENT')
+        backend = app.config.get('CACHE_BACKEND') or ('shared' if client else 'null')
+        if backend == 'lru':
+            app.extensions['task_cache'] = LRUCache(app.config.get('CACHE_MAX_ENTRIES', 10000))
+        elif backend == 'shared':
+            if client is None:
+                # An in-process stand-in here would look shared but go stale across workers
+                raise ValueError('CACHE_BACKEND=shared needs CACHE_SHARED_CLIENT, e.g. a redis.Redis instance')
+            app.extensions['task_cache'] = SharedCache(client)
+        elif backend == 'null':
+            app.extensions['task_cache'] = NullCache()
+        else:
+            raise ValueError(f'Unknown CACHE_BACKEND: {backend!r}')
+
+    @property
+    def backend(self):
+        return current_app.extensions['task_cache']
+
+    def key(self, user_id, kind, *parts):
+        """Build a key for ``user_id`` at its current generation.
+
+        Compute the key before reading from the database so a result read
+        concurrently with a write is stored under the superseded generation.
+        """
+        generation = self.backend.get_generation(f'gen:{user_id}')
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+        return f'tasks:{user_id}:{generation}:{kind}:{digest}'
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = current_app.config.get('CACHE_DEFAULT_TTL', 60)
+        self.backend.set(key, value, ttl)
+
+    def invalidate_user(self, user_id):
+        """Call after a write to ``user_id``'s tasks has been committed."""
+        self.backend.incr_generation(f'gen:{user_id}')
+
+    def stats(self):
+        return self.backend.stats()
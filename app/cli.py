@@ -0,0 +1,60 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from .extensions import db
+from .models import User
+from .importer import import_tasks
+from .counters import rebuild_task_counts
+from .sync import purge_tombstones, retention_cutoff
+
+tasks_cli = AppGroup('tasks', help='Task maintenance commands.')
+
+
+@tasks_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--username', required=True, help='Owner of the imported tasks.')
+@click.option('--format', 'import_format', type=click.Choice(['ndjson', 'csv']),
+              help='Input format (default: inferred from the file extension).')
+@click.option('--chunk-size', type=int, help='Rows per commit (default: IMPORT_CHUNK_SIZE).')
+def import_command(path, username, import_format, chunk_size):
+    """Stream tasks from an NDJSON or CSV file into the database."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f'Unknown user: {username}')
+    if import_format is None:
+        import_format = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    with open(path, encoding='utf-8', errors='replace', newline='') as lines:
+        report = import_tasks(
+            lines, import_format, user.id,
+            chunk_size=chunk_size or current_app.config['IMPORT_CHUNK_SIZE'],
+            max_error_samples=current_app.config['IMPORT_MAX_ERROR_SAMPLES']
+        )
+    click.echo(f"Imported {report['inserted']} of {report['rows']} rows "
+               f"({report['rejected']} rejected) in {report['elapsed_seconds']}s "
+               f"- {report['rows_per_second']} rows/sec")
+    for sample in report['errors']:
+        click.echo(f"  line {sample['line']}: {sample['error']}", err=True)
+
+
+@tasks_cli.command('reconcile-counters')
+@click.option('--username', help='Only rebuild this user\'s counters.')
+def reconcile_counters_command(username):
+    """Rebuild the per-user task counters from the task table."""
+    user_id = None
+    if username is not None:
+        user = User.query.filter_by(username=username).first()
+        if user is None:
+            raise click.ClickException(f'Unknown user: {username}')
+        user_id = user.id
+    rebuild_task_counts(user_id)
+    db.session.commit()
+    click.echo('Task counters rebuilt')
+
+
+@tasks_cli.command('purge-tombstones')
+def purge_tombstones_command():
+    """Drop delete records older than SYNC_TOMBSTONE_RETENTION_DAYS; run it periodically."""
+    # Always the configured retention: /tasks/changes expires checkpoints by the same cutoff
+    purged = purge_tombstones(retention_cutoff())
+    db.session.commit()
+    click.echo(f'Purged {purged} tombstones')
@@ -0,0 +1,45 @@
+import hashlib
+from datetime import timezone
+from flask import request, current_app
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from the given version parts."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _as_utc(value):
+    # SQLite hands back naive datetimes; everything we store is UTC
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_conditional():
+    return bool(request.if_none_match) or request.if_modified_since is not None
+
+
+def is_not_modified(etag, last_modified=None):
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent.
+
+    Pass ``last_modified=None`` for resources where a newer timestamp is not
+    the only way to change (e.g. lists, where a delete leaves max(updated_at)
+    untouched) so only the ETag is trusted.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return _as_utc(last_modified).replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _as_utc(last_modified)
+    return response
+
+
+def not_modified(etag, last_modified=None):
+    """An empty 304 carrying the validators, built without touching the payload."""
+    return set_validators(current_app.response_class(status=304), etag, last_modified)
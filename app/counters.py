@@ -0,0 +1,72 @@
+from sqlalchemy import select, update, delete, insert, func, case
+from .extensions import db
+from .models import Task, TaskCounter, User
+
+
+def adjust_task_counts(user_id, total=0, completed=0, session=None):
+    """Apply deltas to ``user_id``'s counters inside the caller's transaction.
+
+    Call this after the task change has been issued to the session. Users
+    without a counter row yet get one rebuilt from the task table, which by
+    then already reflects the change.
+    """
+    if not total and not completed:
+        return
+    session = session or db.session
+    result = session.execute(
+        update(TaskCounter)
+        .where(TaskCounter.user_id == user_id)
+        .values(
+            total=TaskCounter.total + total,
+            completed=TaskCounter.completed + completed,
+            open=TaskCounter.open + (total - completed)
+        ),
+        execution_options={'synchronize_session': False}
+    )
+    if result.rowcount == 0:
+        rebuild_task_counts(user_id, session)
+
+
+def count_column(completed=None):
+    """The counter column matching a ``completed`` filter (None means no filter)."""
+    if completed is None:
+        return TaskCounter.total
+    return TaskCounter.completed if completed else TaskCounter.open
+
+
+def get_task_counts(user_id, session=None):
+    """Return ``{'total', 'completed', 'open'}`` for ``user_id`` or None if not built."""
+    row = (session or db.session).execute(
+        select(TaskCounter.total, TaskCounter.completed, TaskCounter.open)
+        .where(TaskCounter.user_id == user_id)
+    ).first()
+    return dict(row._mapping) if row is not None else None
+
+
+def rebuild_task_counts(user_id=None, session=None):
+    """Recompute counters from the task table, for one user or for everyone.
+
+    Runs in the caller's transaction (``session`` or ``db.session``); the
+    caller commits.
+    """
+    session = session or db.session
+    completed = func.coalesce(func.sum(case((Task.completed.is_(True), 1), else_=0)), 0)
+    stmt = (
+        select(
+            User.id,
+            func.count(Task.id),
+            completed,
+            func.count(Task.id) - completed
+        )
+        .select_from(User)
+        .outerjoin(Task, Task.user_id == User.id)
+        .group_by(User.id)
+    )
+    clear = delete(TaskCounter)
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+        clear = clear.where(TaskCounter.user_id == user_id)
+    session.execute(clear, execution_options={'synchronize_session': False})
+    session.execute(
+        insert(TaskCounter).from_select(['user_id', 'total', 'completed', 'open'], stmt)
+    )
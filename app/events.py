@@ -0,0 +1,277 @@
+import json
+import queue
+import threading
+import uuid
+from collections import deque
+from flask import current_app
+from .serializers import dumps
+
+HEARTBEAT = b': keep-alive\n\n'
+
+
+class TooManyStreams(Exception):
+    """Raised when this process already holds ``EVENTS_MAX_STREAMS`` open streams."""
+
+
+class Subscription:
+    """One ``/tasks/stream`` connection: a bounded queue of encoded SSE frames.
+
+    Idle subscriptions hold no thread-synchronisation objects of their own,
+    only a :class:`queue.SimpleQueue`, so thousands of them stay cheap.
+    """
+    __slots__ = ('broker', 'user_id', 'queue', 'dropped')
+
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.queue = queue.SimpleQueue()
+        self.dropped = False
+
+    def push(self, frame):
+        # Called with the broker lock held
+        if self.dropped:
+            return
+        if self.queue.qsize() >= self.broker.buffer_size:
+            # A consumer this far behind is cut off; it reconnects with Last-Event-ID
+            self.dropped = True
+            self.broker.dropped += 1
+            self.queue.put(None)
+        else:
+            self.queue.put(frame)
+
+    def frames(self, replay, heartbeat):
+        """Yield the replayed frames, then live ones; a comment line after ``heartbeat`` idle seconds."""
+        # Servers send the headers with the first chunk: open with a comment so
+        # the client sees the 200 now rather than at the first event
+        yield HEARTBEAT
+        yield from replay
+        while True:
+            try:
+                frame = self.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield HEARTBEAT
+                continue
+            if frame is None:
+                return
+            yield frame
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """In-process fan-out of task events to each user's stream subscribers.
+
+    Events are numbered ``<epoch>-<seq>``; the epoch is random per broker, so
+    an id issued by another process or before a restart is never mistaken for
+    one of ours. The last ``history_size`` events (all users) are kept to
+    replay after a reconnect; a client whose ``Last-Event-ID`` is older than
+    that, or unknown, gets a ``reset`` event and resyncs via ``/tasks/changes``.
+    """
+
+    def __init__(self, buffer_size=100, history_size=1000):
+        self.buffer_size = buffer_size
+        self.epoch = uuid.uuid4().hex[:8]
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.subscribers = {}
+        self.streams = 0
+        self.history = deque(maxlen=history_size)
+        self.published = self.dropped = 0
+
+    def publish(self, user_id, name, data):
+        """Send event ``name`` with JSON ``data`` to ``user_id``'s subscribers."""
+        self.deliver(user_id, name, data)
+
+    def deliver(self, user_id, name, data):
+        payload = dumps(data)
+        with self.lock:
+            self.seq += 1
+            self.published += 1
+            frame = f'id: {self.epoch}-{self.seq}\nevent: {name}\ndata: {payload}\n\n'.encode()
+            self.history.append((self.seq, user_id, frame))
+            for subscription in self.subscribers.get(user_id, ()):
+                subscription.push(frame)
+
+    def subscribe(self, user_id, last_event_id=None, max_streams=None):
+        """Register a subscription; returns it with the frames to send first.
+
+        Raises :class:`TooManyStreams` when ``max_streams`` are already open.
+        """
+        subscription = Subscription(self, user_id)
+        with self.lock:
+            if max_streams is not None and self.streams >= max_streams:
+                raise TooManyStreams()
+            self.streams += 1
+            self.subscribers.setdefault(user_id, set()).add(subscription)
+            replay = [] if not last_event_id else self._replay(user_id, last_event_id)
+        return subscription, replay
+
+    def _replay(self, user_id, last_event_id):
+        epoch, _, seq = last_event_id.rpartition('-')
+        oldest = self.history[0][0] if self.history else self.seq + 1
+        try:
+            seq = int(seq)
+        except ValueError:
+            seq = None
+        if epoch != self.epoch or seq is None or seq > self.seq or seq + 1 < oldest:
+            # Events may have been missed: tell the client to catch up via /tasks/changes
+            return [f'id: {self.epoch}-{self.seq}\nevent: reset\ndata: {{}}\n\n'.encode()]
+        return [frame for event_seq, owner, frame in self.history if event_seq > seq and owner == user_id]
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = self.subscribers.get(subscription.user_id)
+            if subscribers is not None and subscription in subscribers:
+                self.streams -= 1
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscribers[subscription.user_id]
+
+    def close(self):
+        pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                'backend': 'local',
+                'subscribers': self.streams,
+                'published': self.published,
+                'dropped': self.dropped,
+            }
+
+
+class SharedEventBroker(EventBroker):
+    """Broker whose events cross processes through a pub/sub client (e.g. redis-py).
+
+    :meth:`publish` only sends to the channel; a relay thread, started with
+    the first local subscription, delivers what arrives on it (including this
+    process's own events) to the local subscribers.
+    """
+
+    def __init__(self, client, buffer_size=100, history_size=1000, channel='taskevents'):
+        super().__init__(buffer_size, history_size)
+        self.client = client
+        self.channel = channel
+        self.thread = None
+        self.ready = threading.Event()
+        self.stopping = threading.Event()
+        self.start_lock = threading.Lock()
+
+    def publish(self, user_id, name, data):
+        self.client.publish(self.channel, json.dumps([user_id, name, data]))
+
+    def subscribe(self, user_id, last_event_id=None, max_streams=None):
+        with self.start_lock:
+            # Started on first use, so a preloading server forks before the thread exists
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._relay, name='task-events', daemon=True)
+                self.thread.start()
+        self.ready.wait()
+        return super().subscribe(user_id, last_event_id, max_streams)
+
+    def _relay(self):
+        pubsub = self.client.pubsub()
+        pubsub.subscribe(self.channel)
+        self.ready.set()
+        try:
+            while not self.stopping.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                if message is not None and message['type'] == 'message':
+                    self.deliver(*json.loads(message['data']))
+        finally:
+            pubsub.close()
+
+    def close(self):
+        with self.start_lock:
+            if self.thread is not None:
+                self.stopping.set()
+                self.thread.join()
+                self.thread = None
+
+    def stats(self):
+        return {**super().stats(), 'backend': 'shared'}
+
+
+class LocalPubSubClient:
+    """Thread-safe in-memory stand-in for the subset of the redis-py client
+    that :class:`SharedEventBroker` uses (``publish`` and ``pubsub()``)."""
+
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        data = message if isinstance(message, bytes) else str(message).encode()
+        with self._lock:
+            listeners = list(self._channels.get(channel, ()))
+        for listener in listeners:
+            listener.put({'type': 'message', 'channel': channel, 'data': data})
+        return len(listeners)
+
+    def pubsub(self):
+        return _LocalPubSub(self)
+
+
+class _LocalPubSub:
+    def __init__(self, client):
+        self.client = client
+        self.queue = queue.SimpleQueue()
+        self.channels = []
+
+    def subscribe(self, *channels):
+        with self.client._lock:
+            for channel in channels:
+                self.client._channels.setdefault(channel, []).append(self.queue)
+                self.channels.append(channel)
+                self.queue.put({'type': 'subscribe', 'channel': channel, 'data': len(self.channels)})
+
+    def get_message(self, timeout=0.0):
+        try:
+            return self.queue.get(timeout=timeout) if timeout else self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self):
+        with self.client._lock:
+            for channel in self.channels:
+                self.client._channels[channel].remove(self.queue)
+        self.channels = []
+
+
+class TaskEvents:
+    """Server-sent events of task writes, per user (``/tasks/stream``).
+
+    Handlers :meth:`publish` after their write is committed. ``EVENTS_BACKEND``
+    ``'local'`` fans out within this process; ``'shared'`` goes through
+    ``EVENTS_SHARED_CLIENT`` so subscribers on every worker see every write.
+
+    Each open stream holds a server thread for as long as the client
+    listens, so at most ``EVENTS_MAX_STREAMS`` are served per process.
+    """
+
+    def init_app(self, app):
+        client = app.config.get('EVENTS_SHARED_CLIENT')
+        backend = app.config.get('EVENTS_BACKEND') or ('shared' if client else 'local')
+        sizes = (app.config.get('EVENTS_BUFFER_SIZE', 100), app.config.get('EVENTS_HISTORY_SIZE', 1000))
+        if backend == 'local':
+            app.extensions['task_events'] = EventBroker(*sizes)
+        elif backend == 'shared':
+            if client is None:
+                raise ValueError('EVENTS_BACKEND=shared needs EVENTS_SHARED_CLIENT, e.g. a redis.Redis instance')
+            app.extensions['task_events'] = SharedEventBroker(client, *sizes)
+        else:
+            raise ValueError(f'Unknown EVENTS_BACKEND: {backend!r}')
+
+    @property
+    def broker(self):
+        return current_app.extensions['task_events']
+
+    def publish(self, user_id, name, data):
+        self.broker.publish(user_id, name, data)
+
+    def subscribe(self, user_id, last_event_id=None):
+        return self.broker.subscribe(user_id, last_event_id, current_app.config.get('EVENTS_MAX_STREAMS'))
+
+    def stats(self):
+        return self.broker.stats()
@@ -1,7 +1,25 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
+from .cache import TaskCache
+from .hashing import PasswordHasher
+from .jwt_cache import CachingJWTManager
+from .async_db import AsyncDatabase
+from .sqlite_profile import SQLiteProfile
+from .replicas import RoutingSession, ReplicaRouter
+from .group_commit import GroupCommitter
+from .metrics import Metrics
+from .query_budget import QueryBudget
+from .search import TaskSearch
+from .events import TaskEvents
 
-db = SQLAlchemy()
-migrate = Migrate()
-jwt = JWTManager()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+jwt = CachingJWTManager()
+cache = TaskCache()
+hasher = PasswordHasher()
+adb = AsyncDatabase()
+sqlite_profile = SQLiteProfile()
+replica_router = ReplicaRouter()
+group_commit = GroupCommitter()
+metrics = Metrics()
+query_budgets = QueryBudget()
+search = TaskSearch()
+events = TaskEvents()
@@ -0,0 +1,149 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from flask import current_app
+
+
+class _Write:
+    __slots__ = ('op', 'args', 'future')
+
+    def __init__(self, op, args):
+        self.op = op
+        self.args = args
+        self.future = Future()
+
+
+class _GroupWriter:
+    """One writer thread that applies queued writes and commits them in batches."""
+
+    def __init__(self, app, window, max_batch):
+        self.app = app
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.batches = self.writes = 0
+
+    def submit(self, op, args):
+        write = _Write(op, args)
+        with self.lock:
+            # Started on first use, so a preloading server forks before the thread exists
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+                self.thread.start()
+        self.queue.put(write)
+        return write.future
+
+    def stop(self):
+        with self.lock:
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+                self.thread = None
+
+    def _collect(self):
+        first = self.queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                write = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if write is None:
+                self.queue.put(None)  # stop after this batch
+                break
+            batch.append(write)
+        return batch
+
+    def _run(self):
+        from .extensions import db
+        with self.app.app_context():
+            while True:
+                batch = self._collect()
+                if batch is None:
+                    return
+                self._commit(db, batch)
+                db.session.close()
+                self.batches += 1
+                self.writes += len(batch)
+
+    def _commit(self, db, batch):
+        pending = list(batch)
+        while pending:
+            results = []
+            try:
+                for write in pending:
+                    try:
+                        results.append(write.op(*write.args))
+                    except Exception as exc:
+                        db.session.rollback()
+                        # Fail only this request, then replay the rest without it
+                        write.future.set_exception(exc)
+                        pending.remove(write)
+                        break
+                else:
+                    db.session.commit()
+                    for write, result in zip(pending, results):
+                        write.future.set_result(result)
+                    return
+            except Exception as exc:
+                db.session.rollback()
+                for write in pending:
+                    write.future.set_exception(exc)
+                return
+
+
+class GroupCommitter:
+    """Optional group commit for single-task writes (``GROUP_COMMIT``).
+
+    Request threads hand a write function to one writer thread, which applies
+    the writes of concurrent requests in order and commits them together once
+    ``GROUP_COMMIT_WINDOW_MS`` has passed or ``GROUP_COMMIT_MAX_BATCH`` writes
+    are queued. :meth:`submit` returns only after that commit, so a response
+    is never sent for an undurable write. A write that raises fails its own
+    request; the rest of its batch is replayed without it.
+    """
+
+    def init_app(self, app):
+        app.extensions['group_commit'] = None
+        if app.config.get('GROUP_COMMIT'):
+            app.extensions['group_commit'] = _GroupWriter(
+                app,
+                app.config.get('GROUP_COMMIT_WINDOW_MS', 2) / 1000,
+                app.config.get('GROUP_COMMIT_MAX_BATCH', 64)
+            )
+
+    @property
+    def enabled(self):
+        return current_app.extensions.get('group_commit') is not None
+
+    def submit(self, op, *args):
+        """Run ``op(*args)`` on the writer's session, wait for its batch to commit and return its result."""
+        return current_app.extensions['group_commit'].submit(op, args).result()
+
+    async def submit_async(self, op, *args):
+        """:meth:`submit` for async views: waits for the commit without blocking the event loop."""
+        return await asyncio.wrap_future(current_app.extensions['group_commit'].submit(op, args))
+
+    def stop(self):
+        """Stop the writer thread after the queued writes are committed."""
+        writer = current_app.extensions.get('group_commit')
+        if writer is not None:
+            writer.stop()
+
+    def stats(self):
+        writer = current_app.extensions.get('group_commit')
+        if writer is None:
+            return None
+        return {
+            'batches': writer.batches,
+            'writes': writer.writes,
+            'average_batch': round(writer.writes / writer.batches, 2) if writer.batches else 0.0,
+        }
@@ -0,0 +1,88 @@
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    """Raised when the password hashing pool is saturated; surfaced as 503."""
+
+
+@lru_cache(maxsize=16)
+def _canonical_method(method, salt_length):
+    # werkzeug expands shorthands ('scrypt', 'pbkdf2') to their full parameters
+    # in the stored prefix, so learn that prefix once per configured method
+    return generate_password_hash('', method=method, salt_length=salt_length).split('$', 1)[0]
+
+
+class _HashingPool:
+    """A bounded executor: at most ``workers`` KDFs run and ``queue_size`` more wait."""
+
+    def __init__(self, workers, queue_size, executor, timeout):
+        pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        self.executor = pool_class(max_workers=workers)
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+
+    def run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy()
+
+
+class PasswordHasher:
+    """Runs password KDF work off the request thread on a bounded pool.
+
+    Configured by the ``PASSWORD_HASH_*`` settings; ``PASSWORD_HASH_WORKERS = 0``
+    hashes inline on the calling thread.
+    """
+
+    def init_app(self, app):
+        app.extensions['password_hasher'] = None
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        if workers:
+            pool = _HashingPool(
+                workers,
+                app.config.get('PASSWORD_HASH_QUEUE_SIZE', 0),
+                app.config.get('PASSWORD_HASH_EXECUTOR', 'thread'),
+                app.config.get('PASSWORD_HASH_TIMEOUT')
+            )
+            app.extensions['password_hasher'] = pool
+            weakref.finalize(app, pool.executor.shutdown, wait=False)
+
+    def _run(self, fn, *args):
+        pool = current_app.extensions.get('password_hasher')
+        if pool is None:
+            return fn(*args)
+        return pool.run(fn, *args)
+
+    def hash(self, password):
+        config = current_app.config
+        return self._run(
+            generate_password_hash, password,
+            config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+            config.get('PASSWORD_HASH_SALT_LENGTH', 16)
+        )
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when ``password_hash`` was made with a method or cost other than the configured one."""
+        config = current_app.config
+        method = _canonical_method(
+            config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+            config.get('PASSWORD_HASH_SALT_LENGTH', 16)
+        )
+        return password_hash.split('$', 1)[0] != method
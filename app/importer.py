@@ -0,0 +1,61 @@
+import time
+from marshmallow import ValidationError
+from sqlalchemy import insert
+from .extensions import db, cache
+from .models import Task
+from .schemas import TaskSchema
+from .streaming import ndjson_records, csv_records
+from .counters import adjust_task_counts
+from .query_budget import allow_queries
+
+task_schema = TaskSchema()
+
+
+def import_tasks(lines, import_format, user_id, chunk_size, max_error_samples):
+    """Validate tasks from an iterable of text lines and insert them for ``user_id``.
+
+    Rows are inserted with one executemany and one commit per ``chunk_size``
+    valid rows, so neither the input nor the pending rows are held in memory.
+    Returns a report with row counts, throughput and at most
+    ``max_error_samples`` rejected lines.
+    """
+    records = csv_records(lines) if import_format == 'csv' else ndjson_records(lines)
+    report = {'rows': 0, 'inserted': 0, 'rejected': 0, 'errors': []}
+    started = time.perf_counter()
+    chunk = []
+    for line_number, record, error in records:
+        report['rows'] += 1
+        if error is None:
+            try:
+                data = task_schema.load(record)
+            except ValidationError as e:
+                error = e.messages
+        if error is not None:
+            report['rejected'] += 1
+            if len(report['errors']) < max_error_samples:
+                report['errors'].append({'line': line_number, 'error': error})
+            continue
+        chunk.append({
+            'title': data['title'],
+            'description': data.get('description', ''),
+            'completed': data.get('completed', False),
+            'user_id': user_id
+        })
+        if len(chunk) >= chunk_size:
+            report['inserted'] += _insert_chunk(chunk, user_id)
+            chunk = []
+    if chunk:
+        report['inserted'] += _insert_chunk(chunk, user_id)
+    elapsed = time.perf_counter() - started
+    report['elapsed_seconds'] = round(elapsed, 3)
+    report['rows_per_second'] = round(report['inserted'] / elapsed) if elapsed else report['inserted']
+    return report
+
+
+def _insert_chunk(rows, user_id):
+    allow_queries(4)  # the insert, the counter update and a possible counter rebuild
+    db.session.execute(insert(Task), rows)
+    adjust_task_counts(user_id, total=len(rows), completed=sum(1 for row in rows if row['completed']))
+    db.session.commit()
+    cache.invalidate_user(user_id)
+    return len(rows)
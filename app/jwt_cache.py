@@ -0,0 +1,51 @@
+import hashlib
+import time
+from flask import current_app
+from flask_jwt_extended import JWTManager
+from .cache import LRUCache
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that can remember the claims of tokens it has already verified.
+
+    Enabled with ``JWT_CLAIMS_CACHE``. Entries are keyed by a SHA-256 digest of
+    the encoded token, capped at ``JWT_CLAIMS_CACHE_MAX_ENTRIES`` and expire at
+    the token's ``exp`` claim, so an expired token is always re-verified (and
+    rejected). Tokens without ``exp`` are never cached. Blocklist and user
+    lookup callbacks still run on every request; only the decode and signature
+    check are skipped.
+    """
+
+    def init_app(self, app):
+        super().init_app(app)
+        app.extensions['jwt_claims_cache'] = None
+        if app.config.get('JWT_CLAIMS_CACHE'):
+            app.extensions['jwt_claims_cache'] = LRUCache(app.config.get('JWT_CLAIMS_CACHE_MAX_ENTRIES', 10000))
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        claims_cache = current_app.extensions.get('jwt_claims_cache')
+        if claims_cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = hashlib.sha256(encoded_token.encode()).digest()
+        claims = claims_cache.get(key)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            exp = claims.get('exp')
+            if exp is not None:
+                ttl = exp - time.time()
+                if ttl > 0:
+                    claims_cache.set(key, claims, ttl)
+        # callers may mutate the claims they are handed; keep the cached dict pristine
+        return dict(claims)
+
+    def cache_stats(self):
+        """Hit/miss counters of the claims cache, or ``None`` when it is disabled."""
+        claims_cache = current_app.extensions.get('jwt_claims_cache')
+        if claims_cache is None:
+            return None
+        stats = claims_cache.stats()
+        del stats['backend']
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
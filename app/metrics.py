@@ -0,0 +1,228 @@
+import threading
+import weakref
+from bisect import bisect_left
+from time import perf_counter
+from flask import current_app, g, has_request_context, request
+from .sql_events import on_statement
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# name -> (type, help, label names, buckets)
+METRICS = {
+    'http_requests_total': (
+        'counter', 'Requests served.', ('endpoint', 'method', 'status'), None),
+    'http_request_duration_seconds': (
+        'histogram', 'Time to build the response, per endpoint.', ('endpoint', 'method'), LATENCY_BUCKETS),
+    'http_response_size_bytes': (
+        'histogram', 'Response body size, when known up front.', ('endpoint',), SIZE_BUCKETS),
+    'http_request_db_statements': (
+        'histogram', 'SQL statements executed per request.', ('endpoint',), STATEMENT_BUCKETS),
+    'http_request_db_seconds': (
+        'histogram', 'Time spent executing SQL per request.', ('endpoint',), LATENCY_BUCKETS),
+    'db_statements_total': (
+        'counter', 'SQL statements executed, including work outside requests.', (), None),
+    'db_statement_seconds_total': (
+        'counter', 'Time spent executing SQL statements.', (), None),
+    'db_pool_checkout_seconds': (
+        'histogram', 'Wait to check a connection out of the pool.', (), WAIT_BUCKETS),
+}
+
+
+class _ThreadStats:
+    """Counters and histograms written by a single thread, so updates need no lock."""
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        entry = self.histograms.get(key)
+        if entry is None:
+            entry = self.histograms[key] = [[0] * (len(METRICS[name][3]) + 1), 0.0]
+        entry[0][bisect_left(METRICS[name][3], value)] += 1
+        entry[1] += value
+
+    def merge_into(self, other):
+        for key, value in list(self.counters.items()):
+            other.counters[key] = other.counters.get(key, 0) + value
+        for key, (counts, total) in list(self.histograms.items()):
+            entry = other.histograms.get(key)
+            if entry is None:
+                entry = other.histograms[key] = [[0] * len(counts), 0.0]
+            entry[0] = [a + b for a, b in zip(entry[0], counts)]
+            entry[1] += total
+
+
+class _Registry:
+    """Per-thread stats, merged only when ``/metrics`` is scraped.
+
+    Stats of finished threads are folded into ``retired`` so servers that
+    start a thread per request do not grow the registry without bound.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.retired = _ThreadStats()
+        self.fold_at = 64
+
+    def stats(self):
+        stats = getattr(self.local, 'stats', None)
+        if stats is None:
+            stats = self.local.stats = _ThreadStats()
+            with self.lock:
+                if len(self.threads) >= self.fold_at:
+                    self._fold()
+                    self.fold_at = max(64, 2 * len(self.threads))
+                self.threads.append((weakref.ref(threading.current_thread()), stats))
+        return stats
+
+    def _fold(self):
+        alive = []
+        for ref, stats in self.threads:
+            thread = ref()
+            if thread is not None and thread.is_alive():
+                alive.append((ref, stats))
+            else:
+                stats.merge_into(self.retired)
+        self.threads = alive
+
+    def snapshot(self):
+        total = _ThreadStats()
+        with self.lock:
+            self._fold()
+            self.retired.merge_into(total)
+            for _, stats in self.threads:
+                stats.merge_into(total)
+        return total
+
+
+def _label_text(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(stats):
+    """Prometheus text exposition of a merged :class:`_ThreadStats`."""
+    lines = []
+    for name, (kind, help_text, label_names, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (metric, labels), value in sorted(stats.counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_label_text(label_names, labels)} {_format_number(value)}')
+            continue
+        for (metric, labels), (counts, total) in sorted(stats.histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), counts):
+                cumulative += count
+                le = f'le="{bound if bound == "+Inf" else _format_number(float(bound))}"'
+                lines.append(f'{name}_bucket{_label_text(label_names, labels, le)} {cumulative}')
+            lines.append(f'{name}_sum{_label_text(label_names, labels)} {_format_number(total)}')
+            lines.append(f'{name}_count{_label_text(label_names, labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+class Metrics:
+    """Request and SQL instrumentation exposed at ``/metrics`` (``METRICS_ENABLED``).
+
+    Records per-endpoint latency, response size, SQL statement count and time
+    per request, and the wait for a pooled connection. Each thread writes its
+    own counters; they are only merged when the endpoint is scraped, so the
+    request path takes no locks. Latency of a streamed response covers the
+    view, not the streaming of its body.
+    """
+
+    def init_app(self, app):
+        app.extensions['metrics'] = None
+        if not app.config.get('METRICS_ENABLED'):
+            return
+        registry = app.extensions['metrics'] = _Registry()
+        app.before_request(_start_request)
+        app.after_request(lambda response: _finish_request(registry, response))
+        from .extensions import db
+        with app.app_context():
+            for engine in db.engines.values():
+                self.register(engine, registry)
+
+    def register(self, engine, registry):
+        """Instrument ``engine``'s statements and connection checkouts."""
+        if registry is None:
+            return
+
+        def record(statement, elapsed, context):
+            stats = registry.stats()
+            stats.inc('db_statements_total', ())
+            stats.inc('db_statement_seconds_total', (), elapsed)
+            if has_request_context():
+                state = g.get('_metrics')
+                if state is not None:
+                    state[1] += 1
+                    state[2] += elapsed
+
+        on_statement(engine, record)
+
+        # The pool has no event before a checkout starts, so time the call that waits for it
+        raw_connection = engine.raw_connection
+
+        def timed_raw_connection():
+            started = perf_counter()
+            try:
+                return raw_connection()
+            finally:
+                registry.stats().observe('db_pool_checkout_seconds', (), perf_counter() - started)
+
+        engine.raw_connection = timed_raw_connection
+
+    def render(self):
+        return render(current_app.extensions['metrics'].snapshot())
+
+
+def _start_request():
+    # [started, SQL statements, SQL seconds]; the SQL listeners add to the last two
+    g._metrics = [perf_counter(), 0, 0.0]
+
+
+def _finish_request(registry, response):
+    state = g.pop('_metrics', None)
+    if state is None:
+        return response
+    started, statements, sql_seconds = state
+    elapsed = perf_counter() - started
+    environ = request.environ
+    method = environ['REQUEST_METHOD']
+    endpoint = request.endpoint or 'unmatched'
+    stats = registry.stats()
+    stats.inc('http_requests_total', (endpoint, method, response.status_code))
+    stats.observe('http_request_duration_seconds', (endpoint, method), elapsed)
+    stats.observe('http_request_db_statements', (endpoint,), statements)
+    stats.observe('http_request_db_seconds', (endpoint,), sql_seconds)
+    size = response.content_length
+    if size is not None:
+        stats.observe('http_response_size_bytes', (endpoint,), size)
+    return response
@@ -1,6 +1,6 @@
-from .extensions import db
+from .extensions import db, hasher
+from .search import install_ddl
 from datetime import datetime, timezone
-from werkzeug.security import generate_password_hash, check_password_hash
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -10,10 +10,10 @@ class User(db.Model):
     tasks = db.relationship('Task', backref='user', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return hasher.verify(self.password_hash, password)
 
 class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -23,3 +23,31 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    # Every task query is scoped by user_id; these back the list/filter/sort paths
+    __table_args__ = (
+        db.Index('ix_task_user_id_created_at', 'user_id', 'created_at', 'id'),
+        db.Index('ix_task_user_id_completed_created_at', 'user_id', 'completed', 'created_at', 'id'),
+        db.Index('ix_task_user_id_updated_at', 'user_id', 'updated_at', 'id'),
+        db.Index('ix_task_user_id_completed_updated_at', 'user_id', 'completed', 'updated_at'),
+    )
+
+install_ddl(Task.__table__)  # full-text index for /tasks/search (SQLite FTS5)
+
+class TaskTombstone(db.Model):
+    """A deleted task, kept for SYNC_TOMBSTONE_RETENTION_DAYS so /tasks/changes can report it."""
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    deleted_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.Index('ix_task_tombstone_user_id_deleted_at', 'user_id', 'deleted_at', 'id'),
+    )
+
+class TaskCounter(db.Model):
+    """Per-user task totals, kept in step with every task write (see app/counters.py)."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    open = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,92 @@
+import base64
+import json
+from datetime import datetime, timezone
+from flask import current_app
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client supplies a cursor we did not issue."""
+
+
+def clamp_page_size(value):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE, falling back to the default."""
+    if value is None:
+        value = current_app.config['DEFAULT_PAGE_SIZE']
+    return max(1, min(value, current_app.config['MAX_PAGE_SIZE']))
+
+
+def _encode(values):
+    raw = json.dumps(values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at, task_id):
+    """Encode the (created_at, id) sort key of the last row into an opaque token."""
+    return _encode([created_at.isoformat(), task_id])
+
+
+def decode_cursor(cursor):
+    """Decode a token produced by :func:`encode_cursor` back into (created_at, id)."""
+    try:
+        created_at, task_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def _encode_position(position):
+    if position is None:
+        return None
+    moment, row_id = position
+    # SQLite hands back naive datetimes; everything we store is UTC
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return [moment.isoformat(), row_id]
+
+
+def _decode_position(value):
+    moment, row_id = value
+    moment = datetime.fromisoformat(moment)
+    if moment.tzinfo is None:
+        # We only issue UTC offsets; a naive one cannot be compared with our clock
+        raise ValueError(f'Naive timestamp in checkpoint: {moment}')
+    return moment, int(row_id)
+
+
+def encode_checkpoint(tasks_after, deleted_after):
+    """Encode a ``/tasks/changes`` position into an opaque token.
+
+    ``tasks_after`` is the (updated_at, id) of the last changed task sent, or
+    None before the first; ``deleted_after`` the (deleted_at, id) of the last
+    tombstone.
+    """
+    return _encode([_encode_position(tasks_after), _encode_position(deleted_after)])
+
+
+def decode_checkpoint(token):
+    """Decode a token produced by :func:`encode_checkpoint` back into its two positions."""
+    try:
+        tasks_after, deleted_after = _decode(token)
+        return (_decode_position(tasks_after) if tasks_after is not None else None,
+                _decode_position(deleted_after))
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+
+
+def encode_rank_cursor(rank, task_id):
+    """Encode the (rank, id) sort key of the last search result into an opaque token."""
+    return _encode([rank, task_id])
+
+
+def decode_rank_cursor(cursor):
+    """Decode a token produced by :func:`encode_rank_cursor` back into (rank, id)."""
+    try:
+        rank, task_id = _decode(cursor)
+        return float(rank), int(task_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
@@ -0,0 +1,104 @@
+import re
+from flask import current_app, g, has_request_context, request
+from .sql_events import on_statement
+
+_STRING_OR_NUMBER = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more SQL statements than its view's :func:`query_budget`."""
+
+
+def query_budget(max_queries):
+    """Declare the most queries one request to this view may run.
+
+    A query is one ``execute()``: the batches SQLAlchemy splits a multi-row
+    INSERT into count once. Goes directly under ``@bp.route`` so the
+    attribute lands on the registered view. A request over budget raises
+    :class:`QueryBudgetExceeded` when ``QUERY_BUDGET_ENFORCE`` is on (as in
+    testing) and logs a warning otherwise. Queries a streamed response runs
+    after the view returns are not counted.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def allow_queries(count):
+    """Let the current request run ``count`` more queries than its budget.
+
+    For work that scales with the input, such as one import chunk; a no-op
+    outside a request.
+    """
+    if has_request_context():
+        state = g.get('_query_count')
+        if state is not None:
+            state[2] += count
+
+
+def normalize_sql(statement):
+    """Collapse whitespace, literals and placeholder lists so one query shape reads the same every time."""
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _STRING_OR_NUMBER.sub('?', statement)
+    return _PLACEHOLDER_LIST.sub('(...)', statement)
+
+
+class QueryBudget:
+    """Counts queries per request for :func:`query_budget`, and logs slow statements.
+
+    Statements slower than ``SLOW_QUERY_MS`` are logged normalized, with the
+    endpoint that ran them; ``SLOW_QUERY_MS = 0`` turns the log off.
+    """
+
+    def init_app(self, app):
+        app.extensions['query_budget'] = {
+            'enforce': app.config.get('QUERY_BUDGET_ENFORCE', False),
+            'slow_seconds': (app.config.get('SLOW_QUERY_MS') or 0) / 1000,
+        }
+        app.before_request(_start_request)
+        app.after_request(_check_budget)
+        from .extensions import db
+        with app.app_context():
+            for engine in db.engines.values():
+                self.register(engine, app)
+
+    def register(self, engine, app):
+        """Count and time the statements ``engine`` runs for ``app``."""
+        slow_seconds = app.extensions['query_budget']['slow_seconds']
+        logger = app.logger
+
+        def record(statement, elapsed, context):
+            in_request = has_request_context()
+            if in_request:
+                state = g.get('_query_count')
+                if state is not None and state[1] is not context:
+                    state[0] += 1
+                    state[1] = context
+            if slow_seconds and elapsed >= slow_seconds:
+                logger.warning(
+                    'Slow query (%.1f ms) in %s: %s', elapsed * 1000,
+                    (request.endpoint or 'unmatched') if in_request else 'no request',
+                    normalize_sql(statement)
+                )
+
+        on_statement(engine, record)
+
+
+def _start_request():
+    # [queries, context of the last one, allowance from allow_queries()]
+    g._query_count = [0, None, 0]
+
+
+def _check_budget(response):
+    state = g.pop('_query_count', None)
+    budget = getattr(current_app.view_functions.get(request.endpoint), 'query_budget', None)
+    if state is None or budget is None or state[0] <= budget + state[2]:
+        return response
+    message = f'{request.method} {request.endpoint} ran {state[0]} queries, budget is {budget + state[2]}'
+    if current_app.extensions['query_budget']['enforce']:
+        raise QueryBudgetExceeded(message)
+    current_app.logger.warning('Query budget exceeded: %s', message)
+    return response
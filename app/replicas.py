@@ -0,0 +1,114 @@
+import itertools
+import threading
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from .cache import LRUCache, SharedCache
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def use_primary():
+    """Send the rest of the current request's queries to the primary."""
+    g._read_from_primary = True
+
+
+class RoutingSession(Session):
+    """``db.session`` class that sends SELECTs made by read requests to a replica.
+
+    Everything else goes to the primary: writes, flushes, ``FOR UPDATE``
+    reads, work outside a request and every query of a request once it has
+    written (read-after-write). See :class:`ReplicaRouter`.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and current_app.extensions.get('replica_router'):
+            if self._flushing or (clause is not None and not _is_plain_select(clause)):
+                record_write()
+            elif has_request_context():
+                key = replica_for_request()
+                if key is not None:
+                    from .extensions import db
+                    return db.engines[key]
+        return super().get_bind(mapper, clause, bind, **kwargs)
+
+
+def _is_plain_select(clause):
+    return getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None
+
+
+def _current_user_id():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:  # no JWT verified in this request
+        return None
+
+
+def record_write():
+    """Note that the current request wrote: its later queries and, for a while,
+    the same user's next requests read from the primary."""
+    state = current_app.extensions.get('replica_router')
+    if state is None or not has_request_context() or g.get('_read_from_primary_after_write'):
+        return
+    g._read_from_primary = g._read_from_primary_after_write = True
+    user_id = _current_user_id()
+    if user_id is not None and state['sticky_seconds']:
+        # Later requests from this user read from the primary until replicas catch up
+        state['sticky'].set(f'sticky:{user_id}', 1, state['sticky_seconds'])
+
+
+def replica_for_request():
+    """Bind key of the replica the current request reads from, or None for the primary."""
+    state = current_app.extensions.get('replica_router')
+    if not state or not has_request_context():
+        return None
+    if request.method not in READ_METHODS or g.get('_read_from_primary'):
+        return None
+    key = g.get('_replica_key')
+    if key is None:
+        user_id = _current_user_id()
+        if user_id is not None and state['sticky'].get(f'sticky:{user_id}') is not None:
+            use_primary()
+            return None
+        # One replica per request, so a paginated read sees one consistent snapshot
+        with state['lock']:
+            key = g._replica_key = next(state['cycle'])
+    return key
+
+
+class ReplicaRouter:
+    """Routes read requests to the read replicas listed in ``SQLALCHEMY_READ_REPLICAS``.
+
+    Each entry names a ``SQLALCHEMY_BINDS`` key; replicas are used round-robin,
+    one per request. After a user writes, their requests stay on the primary
+    for ``REPLICA_STICKY_SECONDS`` to hide replication lag. Stickiness goes
+    through ``CACHE_SHARED_CLIENT`` when one is set, so it holds across worker
+    processes; otherwise it is kept in this process only, which is enough for
+    a single worker (``app.serving.check_workers`` refuses more).
+    """
+
+    def init_app(self, app):
+        app.extensions['replica_router'] = None
+        replicas = list(app.config.get('SQLALCHEMY_READ_REPLICAS') or ())
+        if not replicas:
+            return
+        missing = set(replicas) - set(app.config.get('SQLALCHEMY_BINDS') or {})
+        if missing:
+            raise ValueError(f'SQLALCHEMY_READ_REPLICAS not in SQLALCHEMY_BINDS: {sorted(missing)}')
+        from .extensions import db
+        for key in replicas:
+            # Replicas mirror the primary and own no models; drop the empty MetaData
+            # Flask-SQLAlchemy made for each bind so create_all/drop_all skip them
+            if key in db.metadatas and not db.metadatas[key].tables:
+                del db.metadatas[key]
+        client = app.config.get('CACHE_SHARED_CLIENT')
+        if client is not None:
+            sticky = SharedCache(client, prefix='replicas:')
+        else:
+            sticky = LRUCache(app.config.get('CACHE_MAX_ENTRIES', 10000))
+        app.extensions['replica_router'] = {
+            'cycle': itertools.cycle(replicas),
+            'lock': threading.Lock(),
+            'sticky': sticky,
+            'sticky_seconds': app.config.get('REPLICA_STICKY_SECONDS', 0),
+        }
@@ -2,5 +2,11 @@ from .auth import auth_bp
 from .tasks import tasks_bp
 
 def register_routes(app):
+    if app.config.get('ASYNC_MODE'):
+        from .async_auth import async_auth_bp
+        from .async_tasks import async_tasks_bp
+        app.register_blueprint(async_auth_bp)
+        app.register_blueprint(async_tasks_bp)
+        return
     app.register_blueprint(auth_bp)
     app.register_blueprint(tasks_bp)
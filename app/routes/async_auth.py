@@ -0,0 +1,41 @@
+import asyncio
+from flask import Blueprint, request, jsonify
+from sqlalchemy import select
+from ..models import User
+from ..extensions import adb, hasher
+from ..query_budget import query_budget
+from flask_jwt_extended import create_access_token
+
+# Registered instead of auth_bp in async mode; password hashing runs in a
+# worker thread so it never blocks the event loop
+async_auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
+
+@async_auth_bp.route('/register', methods=['POST'])
+@query_budget(2)
+async def register():
+    data = request.get_json()
+    if not data or not data.get('username') or not data.get('password'):
+        return jsonify({'msg': 'Username and password required'}), 400
+    async with adb.session() as session:
+        if await session.scalar(select(User.id).filter_by(username=data['username'])):
+            return jsonify({'msg': 'Username already exists'}), 400
+        user = User(username=data['username'])
+        await asyncio.to_thread(user.set_password, data['password'])
+        session.add(user)
+        await session.commit()
+    return jsonify({'msg': 'User registered successfully'}), 201
+
+@async_auth_bp.route('/login', methods=['POST'])
+@query_budget(3)
+async def login():
+    data = request.get_json()
+    async with adb.session() as session:
+        user = await session.scalar(select(User).filter_by(username=data.get('username')))
+        if user and await asyncio.to_thread(user.check_password, data.get('password')):
+            if hasher.needs_rehash(user.password_hash):
+                # Upgrade hashes made with outdated parameters while we have the password
+                await asyncio.to_thread(user.set_password, data.get('password'))
+                await session.commit()
+            access_token = create_access_token(identity=str(user.id))
+            return jsonify({'access_token': access_token}), 200
+    return jsonify({'msg': 'Invalid credentials'}), 401
@@ -0,0 +1,204 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..models import Task
+from ..extensions import adb, cache, group_commit
+from ..counters import get_task_counts
+from ..conditional import is_conditional, is_not_modified, not_modified, set_validators
+from ..query_budget import query_budget
+from ..replicas import record_write
+from ..sync import changes_page
+from .tasks import (
+    task_schema, export_tasks, import_tasks_upload, search_tasks, stream_task_events, options_tasks, options_task,
+    _list_cache_key, _list_request, _list_etag, _list_body, _cache_entry, _cached_response, _changes_request,
+    _rebuilt_task_counts, _fields_arg, _task_select, _task_version_select, _task_revalidation, _task_response,
+    _load_task_input, _published, _insert_task, _update_task, _delete_task, _insert_tasks, _update_tasks,
+    _delete_tasks, _load_bulk_create, _load_bulk_update, _load_bulk_delete, _bulk_create_response,
+    _bulk_update_response, _bulk_delete_response
+)
+
+# Registered instead of tasks_bp in async mode (same name, so endpoints match).
+# Parsing, statements, write operations and responses are app/routes/tasks.py's;
+# these views only run them through the async session.
+async_tasks_bp = Blueprint('tasks', __name__, url_prefix='/tasks')
+
+@async_tasks_bp.route('', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+async def get_tasks():
+    user_id = int(get_jwt_identity())
+    cache_key = _list_cache_key(user_id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return _cached_response(cached, honor_last_modified=False)
+    listing, error = _list_request(user_id)
+    if error:
+        return error
+    async with adb.session() as session:
+        last_modified, total = (await session.execute(listing['validators'])).one()
+        if total is None:
+            total = await session.scalar(listing['count'])
+        etag = _list_etag(user_id, last_modified, total)
+        if is_not_modified(etag):
+            return not_modified(etag, last_modified)
+        rows = (await session.execute(listing['rows'])).all()
+    body = _list_body(listing, rows, total)
+    cache.set(cache_key, _cache_entry(body, etag, last_modified))
+    return set_validators(jsonify(body), etag, last_modified)
+
+@async_tasks_bp.route('/changes', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+async def get_task_changes():
+    user_id = int(get_jwt_identity())
+    changes, error = _changes_request(user_id)
+    if error:
+        return error
+    async with adb.session() as session:
+        task_rows = (await session.execute(changes['tasks'])).all()
+        tombstone_rows = (await session.execute(changes['tombstones'])).all()
+    return jsonify(changes_page(task_rows, tombstone_rows, *changes['window']))
+
+@async_tasks_bp.route('/stats', methods=['GET'])
+@query_budget(4)
+@jwt_required()
+async def get_task_stats():
+    user_id = int(get_jwt_identity())
+    async with adb.session() as session:
+        counts = await session.run_sync(lambda sync_session: get_task_counts(user_id, sync_session))
+    if counts is None:
+        # Rebuilding writes: it and the read after it go to the primary
+        record_write()
+        async with adb.session() as session:
+            counts = await session.run_sync(lambda sync_session: _rebuilt_task_counts(user_id, sync_session))
+    return jsonify(counts)
+
+@async_tasks_bp.route('/<int:task_id>', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+async def get_task(task_id):
+    user_id = int(get_jwt_identity())
+    fields, error = _fields_arg()
+    if error:
+        return error
+    cache_key = cache.key(user_id, 'task', task_id, fields)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return _cached_response(cached)
+    async with adb.session() as session:
+        if is_conditional():
+            updated_at = await session.scalar(_task_version_select(user_id, task_id))
+            response = _task_revalidation(task_id, fields, updated_at)
+            if response is not None:
+                return response
+        task = await session.scalar(_task_select(user_id, task_id, fields))
+    return _task_response(task, fields, cache_key)
+
+@async_tasks_bp.route('', methods=['POST'])
+@query_budget(5)
+@jwt_required()
+async def create_task():
+    user_id = int(get_jwt_identity())
+    valid_data, error = _load_task_input()
+    if error:
+        return error
+    async with adb.session() as session:
+        task_id = await _write(session, _insert_task, user_id, valid_data)
+        body = await _written_task(session, task_id)
+    _published(user_id, 'created', [body])
+    return jsonify(body), 201
+
+@async_tasks_bp.route('/<int:task_id>', methods=['PUT'])
+@query_budget(6)
+@jwt_required()
+async def update_task(task_id):
+    user_id = int(get_jwt_identity())
+    async with adb.session() as session:
+        task = await session.scalar(_task_select(user_id, task_id))
+        if task is None:
+            return jsonify({'msg': 'Task not found'}), 404
+        valid_data, error = _load_task_input(partial=True)
+        if error:
+            return error
+        if not await _write(session, _update_task, user_id, task_id, valid_data):
+            return jsonify({'msg': 'Task not found'}), 404
+        body = await _written_task(session, task_id)
+    _published(user_id, 'updated', [body])
+    return jsonify(body)
+
+@async_tasks_bp.route('/<int:task_id>', methods=['DELETE'])
+@query_budget(6)
+@jwt_required()
+async def delete_task(task_id):
+    user_id = int(get_jwt_identity())
+    async with adb.session() as session:
+        task = await session.scalar(_task_select(user_id, task_id))
+        if task is None or not await _write(session, _delete_task, user_id, task_id):
+            return jsonify({'msg': 'Task not found'}), 404
+    _published(user_id, 'deleted', [{'id': task_id}])
+    return jsonify({'msg': 'Task deleted'})
+
+async def _written_task(session, task_id):
+    # Reloaded: with group commit the write was made outside this session
+    return task_schema.dump(await session.get(Task, task_id, populate_existing=True))
+
+async def _run(session, op, *args):
+    """Run the write ``op(*args)`` in ``session``'s transaction and commit it."""
+    # The rest of the request and, for a while, the user's next reads use the primary
+    record_write()
+    result = await session.run_sync(lambda sync_session: op(*args, session=sync_session))
+    await session.commit()
+    return result
+
+async def _write(session, op, *args):
+    """Async :func:`app.routes.tasks._write`: single-task writes join the group commit when it is on."""
+    if not group_commit.enabled:
+        return await _run(session, op, *args)
+    # End our read transaction: it must not hold locks the writer needs
+    await session.rollback()
+    record_write()
+    return await group_commit.submit_async(op, *args)
+
+@async_tasks_bp.route('/bulk', methods=['POST'])
+@query_budget(4)
+@jwt_required()
+async def bulk_create_tasks():
+    user_id = int(get_jwt_identity())
+    valid_items, error = _load_bulk_create()
+    if error:
+        return error
+    async with adb.session() as session:
+        results = await _run(session, _insert_tasks, user_id, valid_items)
+    return _bulk_create_response(user_id, results)
+
+@async_tasks_bp.route('/bulk', methods=['PUT'])
+@query_budget(6)
+@jwt_required()
+async def bulk_update_tasks():
+    user_id = int(get_jwt_identity())
+    valid_items, error = _load_bulk_update()
+    if error:
+        return error
+    async with adb.session() as session:
+        updated = await _run(session, _update_tasks, user_id, valid_items)
+    return _bulk_update_response(user_id, valid_items, updated)
+
+@async_tasks_bp.route('/bulk', methods=['DELETE'])
+@query_budget(6)
+@jwt_required()
+async def bulk_delete_tasks():
+    user_id = int(get_jwt_identity())
+    ids, error = _load_bulk_delete()
+    if error:
+        return error
+    async with adb.session() as session:
+        deleted = await _run(session, _delete_tasks, user_id, ids)
+    return _bulk_delete_response(user_id, ids, deleted)
+
+# Streaming export/import and preflight handlers are shared with the sync blueprint
+async_tasks_bp.add_url_rule('/search', view_func=search_tasks, methods=['GET'])
+async_tasks_bp.add_url_rule('/export', view_func=export_tasks, methods=['GET'])
+async_tasks_bp.add_url_rule('/import', view_func=import_tasks_upload, methods=['POST'])
+async_tasks_bp.add_url_rule('/stream', view_func=stream_task_events, methods=['GET'])
+async_tasks_bp.add_url_rule('', view_func=options_tasks, methods=['OPTIONS'])
+async_tasks_bp.add_url_rule('/bulk', view_func=options_tasks, methods=['OPTIONS'])
+async_tasks_bp.add_url_rule('/<int:task_id>', view_func=options_task, methods=['OPTIONS'])
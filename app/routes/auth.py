@@ -1,11 +1,13 @@
 from flask import Blueprint, request, jsonify
 from ..models import User
-from ..extensions import db
+from ..extensions import db, hasher
+from ..query_budget import query_budget
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
 @auth_bp.route('/register', methods=['POST'])
+@query_budget(2)
 def register():
     data = request.get_json()
     if not data or not data.get('username') or not data.get('password'):
@@ -19,10 +21,15 @@ def register():
     return jsonify({'msg': 'User registered successfully'}), 201
 
 @auth_bp.route('/login', methods=['POST'])
+@query_budget(3)
 def login():
     data = request.get_json()
     user = User.query.filter_by(username=data.get('username')).first()
     if user and user.check_password(data.get('password')):
+        if hasher.needs_rehash(user.password_hash):
+            # Upgrade hashes made with outdated parameters while we have the password
+            user.set_password(data.get('password'))
+            db.session.commit()
         # Use user.id as a string for JWT identity (subject)
         access_token = create_access_token(identity=str(user.id))
         return jsonify({'access_token': access_token}), 200
@@ -1,13 +1,40 @@
-from flask import Blueprint
-from flask_swagger_ui import get_swaggerui_blueprint
+import hashlib
+import os
+from flask import request
 
 SWAGGER_URL = '/swagger'
 API_URL = '/static/swagger.json'
+SPEC_MAX_AGE = 3600  # seconds clients and proxies may reuse swagger.json without asking
 
-swagger_bp = get_swaggerui_blueprint(
-    SWAGGER_URL,
-    API_URL,
-    config={
-        'app_name': "Task Manager API"
-    }
-)
+
+def swagger_ui_blueprint():
+    """The swagger UI blueprint; flask_swagger_ui is only imported when the UI is enabled."""
+    from flask_swagger_ui import get_swaggerui_blueprint
+    return get_swaggerui_blueprint(
+        SWAGGER_URL,
+        API_URL,
+        config={
+            'app_name': "Task Manager API"
+        }
+    )
+
+
+def register_swagger_spec(app):
+    """Serve ``static/swagger.json`` from bytes read and hashed once, here.
+
+    Done while the app is built, so a preloading server reads it before
+    forking and the workers share the copy.
+    """
+    with open(os.path.join(app.static_folder, 'swagger.json'), 'rb') as spec:
+        body = spec.read()
+    etag = hashlib.sha1(body).hexdigest()
+
+    def swagger_spec():
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = SPEC_MAX_AGE
+        return response.make_conditional(request)
+
+    # A plain rule wins over the /static/<path:filename> ones
+    app.add_url_rule(API_URL, 'swagger_spec', swagger_spec)
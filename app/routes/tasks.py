@@ -1,96 +1,683 @@
-from flask import Blueprint, request, jsonify
+import io
+from datetime import datetime
+from math import ceil
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..models import Task, User
-from ..extensions import db
+from sqlalchemy import tuple_, select, insert, update, delete, func
+from sqlalchemy.orm import load_only
+from marshmallow import ValidationError
+from ..models import Task, TaskCounter, User
+from ..extensions import db, cache, group_commit, search, events
 from ..schemas import TaskSchema
+from ..serializers import serialize_task, serialize_tasks, parse_task_fields, InvalidFields, TASK_FIELDS
+from ..pagination import (
+    clamp_page_size, encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor, InvalidCursor
+)
+from ..streaming import MIMETYPES, ndjson_chunks, csv_chunks
+from ..importer import import_tasks
+from ..counters import adjust_task_counts, count_column, get_task_counts, rebuild_task_counts
+from ..conditional import make_etag, is_conditional, is_not_modified, not_modified, set_validators
+from ..replicas import record_write
+from ..query_budget import query_budget
+from ..search import search_terms
+from ..events import TooManyStreams
+from ..sync import (
+    CheckpointExpired, record_tombstones, changes_window, changed_tasks_select, tombstones_select, changes_page
+)
 
+# Request parsing, statements, write operations and response building below
+# are shared with app/routes/async_tasks.py, whose views only differ in how
+# they execute the statements.
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/tasks')
 task_schema = TaskSchema()
 tasks_schema = TaskSchema(many=True)
+EXPORT_FIELDS = list(TaskSchema().fields)
+# List and export read plain Core rows: no ORM instances, identity map or state tracking
+TASK_COLUMNS = tuple(Task.__table__.c)
 
 @tasks_bp.route('', methods=['GET'])
+@query_budget(3)
 @jwt_required()
 def get_tasks():
-    user_id = get_jwt_identity()
-    query = Task.query.filter_by(user_id=int(user_id))
+    user_id = int(get_jwt_identity())
+    cache_key = _list_cache_key(user_id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        # Lists only trust the ETag; see is_not_modified
+        return _cached_response(cached, honor_last_modified=False)
+    listing, error = _list_request(user_id)
+    if error:
+        return error
+    # max(updated_at) plus the maintained count version the whole list, so an
+    # unchanged poll returns 304 before any page query or serialization
+    last_modified, total = db.session.execute(listing['validators']).one()
+    if total is None:
+        # Counters not built for this user yet
+        total = db.session.scalar(listing['count'])
+    etag = _list_etag(user_id, last_modified, total)
+    if is_not_modified(etag):
+        return not_modified(etag, last_modified)
+    body = _list_body(listing, db.session.execute(listing['rows']).all(), total)
+    cache.set(cache_key, _cache_entry(body, etag, last_modified))
+    return set_validators(jsonify(body), etag, last_modified)
+
+def _fields_arg():
+    """Parse ``?fields=``; returns ``(fields, error_response)``."""
+    try:
+        return parse_task_fields(request.args.get('fields')), None
+    except InvalidFields as exc:
+        return None, (jsonify({'msg': str(exc)}), 400)
+
+def _completed_arg():
     completed = request.args.get('completed')
+    return None if completed is None else completed.lower() == 'true'
+
+def _task_columns(fields, *required):
+    """Columns for a ``fields=`` projection (all when ``None``) plus ``required`` ones."""
+    if fields is None:
+        return TASK_COLUMNS
+    wanted = set(fields).union(required)
+    return tuple(column for column in TASK_COLUMNS if column.key in wanted)
+
+def _task_load_options(fields):
+    """``load_only`` for a single-task read of ``fields``; updated_at versions the response."""
+    if fields is None:
+        return ()
+    wanted = set(fields) | {'updated_at'}
+    return (load_only(*(getattr(Task, name) for name in TASK_FIELDS if name in wanted)),)
+
+def _task_rows_select(user_id, completed=None, columns=TASK_COLUMNS):
+    stmt = select(*columns).where(Task.user_id == user_id)
     if completed is not None:
-        query = query.filter_by(completed=completed.lower() == 'true')
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-    return jsonify({
-        'tasks': tasks_schema.dump(paginated.items),
-        'total': paginated.total,
-        'pages': paginated.pages,
-        'current_page': paginated.page
-    })
+        stmt = stmt.where(Task.completed == completed)
+    return stmt
+
+def _list_cache_key(user_id):
+    return cache.key(user_id, 'list', sorted(request.args.items(multi=True)))
+
+def _list_request(user_id):
+    """Parse the ``GET /tasks`` arguments; returns ``(listing, error_response)``.
+
+    ``listing`` holds the statements that answer the request (``validators``,
+    ``count`` and the page of ``rows``) and what :func:`_list_body` needs.
+    """
+    fields, error = _fields_arg()
+    if error:
+        return None, error
+    completed = _completed_arg()
+    cursor_mode = 'cursor' in request.args or 'limit' in request.args
+    # The next cursor is built from the last row's sort key, so cursor pages always select it
+    columns = _task_columns(fields, *(('created_at', 'id') if cursor_mode else ()))
+    query = _task_rows_select(user_id, completed, columns)
+    listing = {
+        'fields': fields,
+        'cursor_mode': cursor_mode,
+        'validators': _list_validators(user_id, completed),
+        'count': select(func.count()).select_from(query.subquery()),
+    }
+    if cursor_mode:
+        seek_after = None
+        if request.args.get('cursor'):
+            try:
+                seek_after = decode_cursor(request.args['cursor'])
+            except InvalidCursor:
+                return None, (jsonify({'msg': 'Invalid cursor'}), 400)
+        listing.update(_cursor_page(query, seek_after))
+    else:
+        listing.update(_offset_page(query))
+    return listing, None
+
+def _list_validators(user_id, completed):
+    """(max(updated_at), count) in one statement: an index seek plus a counter row."""
+    latest = select(func.max(Task.updated_at)).where(Task.user_id == user_id)
+    if completed is not None:
+        latest = latest.where(Task.completed == completed)
+    count = select(count_column(completed)).where(TaskCounter.user_id == user_id)
+    return select(latest.scalar_subquery(), count.scalar_subquery())
+
+def _list_etag(user_id, last_modified, total):
+    return make_etag('tasks', user_id, last_modified, total, sorted(request.args.items(multi=True)))
+
+def _offset_page(query):
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = clamp_page_size(request.args.get('per_page', type=int))
+    # The total is already known from the validators, so no COUNT here
+    return {
+        'rows': query.order_by(Task.created_at, Task.id).limit(per_page).offset((page - 1) * per_page),
+        'page': page,
+        'per_page': per_page
+    }
+
+def _cursor_page(query, seek_after):
+    # Cursor mode: seek on (created_at, id) instead of OFFSET
+    limit = clamp_page_size(request.args.get('limit', type=int))
+    if seek_after is not None:
+        query = query.where(tuple_(Task.created_at, Task.id) > seek_after)
+    # Fetch one extra row to learn whether another page exists
+    return {'rows': query.order_by(Task.created_at, Task.id).limit(limit + 1), 'limit': limit}
+
+def _list_body(listing, rows, total):
+    fields = listing['fields']
+    if not listing['cursor_mode']:
+        return {
+            'tasks': serialize_tasks(rows, fields),
+            'total': total,
+            'pages': ceil(total / listing['per_page']),
+            'current_page': listing['page']
+        }
+    limit = listing['limit']
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    body = {
+        'tasks': serialize_tasks(rows, fields),
+        'next_cursor': next_cursor,
+        'limit': limit
+    }
+    if request.args.get('include_total', 'false').lower() == 'true':
+        body['total'] = total
+    return body
+
+def _cache_entry(body, etag, last_modified):
+    return {
+        'body': body,
+        'etag': etag,
+        'last_modified': last_modified.isoformat() if last_modified else None
+    }
+
+def _cached_response(entry, honor_last_modified=True):
+    last_modified = entry['last_modified'] and datetime.fromisoformat(entry['last_modified'])
+    if is_not_modified(entry['etag'], last_modified if honor_last_modified else None):
+        return not_modified(entry['etag'], last_modified)
+    return set_validators(jsonify(entry['body']), entry['etag'], last_modified)
+
+@tasks_bp.route('/search', methods=['GET'])
+@query_budget(1)
+@jwt_required()
+def search_tasks():
+    user_id = int(get_jwt_identity())
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({'msg': 'Search query required'}), 400
+    seek_after = None
+    if request.args.get('cursor'):
+        try:
+            seek_after = decode_rank_cursor(request.args['cursor'])
+        except InvalidCursor:
+            return jsonify({'msg': 'Invalid cursor'}), 400
+    limit = clamp_page_size(request.args.get('limit', type=int))
+    # Best matches first, paged on (rank, id); one extra row tells whether there is a next page
+    rows = db.session.execute(search.statement(TASK_COLUMNS, user_id, terms, seek_after, limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+    return jsonify({'tasks': serialize_tasks(rows), 'next_cursor': next_cursor, 'limit': limit})
+
+@tasks_bp.route('/changes', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+def get_task_changes():
+    user_id = int(get_jwt_identity())
+    changes, error = _changes_request(user_id)
+    if error:
+        return error
+    task_rows = db.session.execute(changes['tasks']).all()
+    tombstone_rows = db.session.execute(changes['tombstones']).all()
+    return jsonify(changes_page(task_rows, tombstone_rows, *changes['window']))
+
+def _changes_request(user_id):
+    """Parse the ``GET /tasks/changes`` arguments; returns ``(changes, error_response)``.
+
+    ``changes`` holds the ``tasks`` and ``tombstones`` statements and the
+    ``window`` arguments that :func:`~app.sync.changes_page` takes after the rows.
+    """
+    fields, error = _fields_arg()
+    if error:
+        return None, error
+    try:
+        tasks_after, deleted_after, cutoff = changes_window(request.args.get('since'))
+    except InvalidCursor:
+        return None, (jsonify({'msg': 'Invalid checkpoint'}), 400)
+    except CheckpointExpired:
+        return None, (jsonify({'msg': 'Checkpoint expired, sync again without since'}), 410)
+    limit = clamp_page_size(request.args.get('limit', type=int))
+    columns = _task_columns(fields, 'updated_at', 'id')
+    return {
+        'tasks': changed_tasks_select(user_id, columns, tasks_after, cutoff, limit),
+        'tombstones': tombstones_select(user_id, deleted_after, cutoff, limit),
+        'window': (tasks_after, deleted_after, cutoff, limit, fields)
+    }, None
+
+@tasks_bp.route('/export', methods=['GET'])
+@query_budget(0)
+@jwt_required()
+def export_tasks():
+    user_id = int(get_jwt_identity())
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in MIMETYPES:
+        return jsonify({'msg': 'Unsupported format, use ndjson or csv'}), 400
+    fields, error = _fields_arg()
+    if error:
+        return error
+    stmt = _task_rows_select(user_id, _completed_arg(), _task_columns(fields)).order_by(Task.created_at, Task.id)
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+
+    def batches():
+        # yield_per streams from a server-side cursor, so only one batch is held at a time
+        result = db.session.execute(stmt, execution_options={'yield_per': batch_size})
+        for partition in result.partitions():
+            yield serialize_tasks(partition, fields)
+
+    if export_format == 'csv':
+        chunks = csv_chunks(batches(), list(fields) if fields else EXPORT_FIELDS)
+    else:
+        chunks = ndjson_chunks(batches())
+    return Response(
+        stream_with_context(chunks),
+        mimetype=MIMETYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename=tasks.{export_format}'}
+    )
+
+@tasks_bp.route('/import', methods=['POST'])
+@query_budget(0)
+@jwt_required()
+def import_tasks_upload():
+    user_id = int(get_jwt_identity())
+    upload = request.files.get('file')
+    filename = upload.filename.lower() if upload and upload.filename else ''
+    default_format = 'csv' if filename.endswith('.csv') or request.mimetype == 'text/csv' else 'ndjson'
+    import_format = request.args.get('format', default_format).lower()
+    if import_format not in MIMETYPES:
+        return jsonify({'msg': 'Unsupported format, use ndjson or csv'}), 400
+    # Read the body line by line instead of request.get_json() on the whole upload
+    stream = upload.stream if upload else request.stream
+    lines = io.TextIOWrapper(stream, encoding='utf-8', errors='replace', newline='')
+    report = import_tasks(
+        lines, import_format, user_id,
+        chunk_size=current_app.config['IMPORT_CHUNK_SIZE'],
+        max_error_samples=current_app.config['IMPORT_MAX_ERROR_SAMPLES']
+    )
+    if report['inserted']:
+        # Too many to stream one by one; subscribers catch up through /tasks/changes
+        events.publish(user_id, 'imported', {'inserted': report['inserted']})
+    return jsonify(report)
+
+@tasks_bp.route('/stream', methods=['GET'])
+@query_budget(0)
+@jwt_required()
+def stream_task_events():
+    user_id = int(get_jwt_identity())
+    try:
+        subscription, replay = events.subscribe(user_id, request.headers.get('Last-Event-ID'))
+    except TooManyStreams:
+        # Past the cap every new stream would take a thread normal requests need
+        return jsonify({'msg': 'Too many open event streams, retry later'}), 503, {
+            'Retry-After': str(current_app.config['EVENTS_RETRY_AFTER'])
+        }
+    response = Response(
+        subscription.frames(replay, current_app.config['EVENTS_HEARTBEAT_SECONDS']),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Unsubscribe once the server closes the response, even if no frame was ever sent
+    response.call_on_close(subscription.close)
+    return response
+
+@tasks_bp.route('/stats', methods=['GET'])
+@query_budget(4)
+@jwt_required()
+def get_task_stats():
+    user_id = int(get_jwt_identity())
+    counts = get_task_counts(user_id)
+    if counts is None:
+        counts = _rebuilt_task_counts(user_id)
+    return jsonify(counts)
+
+def _rebuilt_task_counts(user_id, session=None):
+    """Build ``user_id``'s missing counters, commit them and return the counts."""
+    session = session or db.session
+    rebuild_task_counts(user_id, session)
+    session.commit()
+    return get_task_counts(user_id, session)
 
 @tasks_bp.route('/<int:task_id>', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_task(task_id):
-    user_id = get_jwt_identity()
-    task = Task.query.filter_by(id=task_id, user_id=int(user_id)).first()
+    user_id = int(get_jwt_identity())
+    fields, error = _fields_arg()
+    if error:
+        return error
+    cache_key = cache.key(user_id, 'task', task_id, fields)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return _cached_response(cached)
+    if is_conditional():
+        # Revalidation only needs the row version, read through the primary key
+        response = _task_revalidation(task_id, fields, db.session.scalar(_task_version_select(user_id, task_id)))
+        if response is not None:
+            return response
+    return _task_response(db.session.scalar(_task_select(user_id, task_id, fields)), fields, cache_key)
+
+def _task_select(user_id, task_id, fields=None):
+    return select(Task).options(*_task_load_options(fields)).filter_by(id=task_id, user_id=user_id)
+
+def _task_version_select(user_id, task_id):
+    return select(Task.updated_at).where(Task.id == task_id, Task.user_id == user_id)
+
+def _task_revalidation(task_id, fields, updated_at):
+    """The 304 response when the client's copy of the task is current, else None."""
+    if updated_at is None:
+        return None
+    etag = make_etag('task', task_id, updated_at, fields)
+    if is_not_modified(etag, updated_at):
+        return not_modified(etag, updated_at)
+    return None
+
+def _task_response(task, fields, cache_key):
     if not task:
         return jsonify({'msg': 'Task not found'}), 404
-    return jsonify(task_schema.dump(task))
+    etag = make_etag('task', task.id, task.updated_at, fields)
+    body = serialize_task(task, fields)
+    cache.set(cache_key, _cache_entry(body, etag, task.updated_at))
+    return set_validators(jsonify(body), etag, task.updated_at)
 
 @tasks_bp.route('', methods=['POST'])
+@query_budget(5)
 @jwt_required()
 def create_task():
-    user_id = get_jwt_identity()
-    data = request.get_json()
-    # Validate input using Marshmallow
-    try:
-        valid_data = task_schema.load(data)
-    except Exception as e:
-        return jsonify({'msg': 'Invalid input', 'error': str(e)}), 400
-    task = Task(
-        title=valid_data['title'],
-        description=valid_data.get('description', ''),
-        user_id=int(user_id)
-    )
-    db.session.add(task)
-    db.session.commit()
-    return jsonify(task_schema.dump(task)), 201
+    user_id = int(get_jwt_identity())
+    valid_data, error = _load_task_input()
+    if error:
+        return error
+    task_id = _write(_insert_task, user_id, valid_data)
+    body = task_schema.dump(db.session.get(Task, task_id))
+    _published(user_id, 'created', [body])
+    return jsonify(body), 201
 
 @tasks_bp.route('/<int:task_id>', methods=['PUT'])
+@query_budget(6)
 @jwt_required()
 def update_task(task_id):
-    user_id = get_jwt_identity()
-    task = Task.query.filter_by(id=task_id, user_id=int(user_id)).first()
-    if not task:
+    user_id = int(get_jwt_identity())
+    task = db.session.scalar(_task_select(user_id, task_id))
+    if task is None:
+        return jsonify({'msg': 'Task not found'}), 404
+    # partial=True for PATCH-like behavior
+    valid_data, error = _load_task_input(partial=True)
+    if error:
+        return error
+    if not _write(_update_task, user_id, task_id, valid_data):
+        return jsonify({'msg': 'Task not found'}), 404
+    body = task_schema.dump(db.session.get(Task, task_id))
+    _published(user_id, 'updated', [body])
+    return jsonify(body)
+
+@tasks_bp.route('/<int:task_id>', methods=['DELETE'])
+@query_budget(6)
+@jwt_required()
+def delete_task(task_id):
+    user_id = int(get_jwt_identity())
+    task = db.session.scalar(_task_select(user_id, task_id))
+    if task is None or not _write(_delete_task, user_id, task_id):
         return jsonify({'msg': 'Task not found'}), 404
-    data = request.get_json()
-    # Validate input using Marshmallow (partial=True for PATCH-like behavior)
+    _published(user_id, 'deleted', [{'id': task_id}])
+    return jsonify({'msg': 'Task deleted'})
+
+def _load_task_input(partial=False):
+    """Validate the request's task JSON with Marshmallow; returns ``(valid_data, error_response)``."""
     try:
-        valid_data = task_schema.load(data, partial=True)
+        return task_schema.load(request.get_json(), partial=partial), None
     except Exception as e:
-        return jsonify({'msg': 'Invalid input', 'error': str(e)}), 400
+        return None, (jsonify({'msg': 'Invalid input', 'error': str(e)}), 400)
+
+def _published(user_id, name, payloads):
+    """After a committed write: drop the user's cached reads and tell their streams."""
+    cache.invalidate_user(user_id)
+    for payload in payloads:
+        events.publish(user_id, name, payload)
+
+def _write(op, *args):
+    """Apply the write ``op(*args)`` and commit it; returns what ``op`` returned.
+
+    In group-commit mode the write runs on the group writer's session and is
+    committed together with other requests' writes.
+    """
+    if not group_commit.enabled:
+        result = op(*args)
+        db.session.commit()
+        return result
+    # End our read transaction: it must not hold locks the writer needs, and
+    # instances loaded so far are expired so reads after the write are fresh
+    db.session.rollback()
+    record_write()
+    return group_commit.submit(op, *args)
+
+# Write operations run in the caller's transaction on ``session`` (default
+# db.session) and leave the commit to it: _write, the group writer or, in
+# async mode, AsyncSession.run_sync.
+
+def _insert_task(user_id, valid_data, session=None):
+    session = session or db.session
+    task = Task(
+        title=valid_data['title'],
+        description=valid_data.get('description', ''),
+        user_id=user_id
+    )
+    session.add(task)
+    adjust_task_counts(user_id, total=1, session=session)
+    session.flush()
+    return task.id
+
+def _update_task(user_id, task_id, valid_data, session=None):
+    session = session or db.session
+    task = session.get(Task, task_id)
+    if task is None or task.user_id != user_id:
+        return False
     if 'title' in valid_data:
         task.title = valid_data['title']
     if 'description' in valid_data:
         task.description = valid_data['description']
     if 'completed' in valid_data:
+        was_completed = bool(task.completed)
         task.completed = valid_data['completed']
+        if bool(task.completed) != was_completed:
+            adjust_task_counts(user_id, completed=1 if task.completed else -1, session=session)
+    return True
+
+def _delete_task(user_id, task_id, session=None):
+    session = session or db.session
+    task = session.get(Task, task_id)
+    if task is None or task.user_id != user_id:
+        return False
+    session.delete(task)
+    adjust_task_counts(user_id, total=-1, completed=-1 if task.completed else 0, session=session)
+    record_tombstones(user_id, [task_id], session)
+    return True
+
+def _insert_tasks(user_id, valid_items, session=None):
+    """Create the tasks of a bulk request; returns their results, serialized before commit."""
+    session = session or db.session
+    rows = [{
+        'title': item['title'],
+        'description': item.get('description', ''),
+        'user_id': user_id
+    } for item in valid_items]
+    # One multi-row INSERT ... RETURNING and a single commit for the whole batch
+    created = session.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True), rows
+    ).all()
+    adjust_task_counts(user_id, total=len(created), session=session)
+    # Serialize before commit: expire_on_commit would reload every task with its own SELECT
+    return [
+        {'index': index, 'status': 201, 'task': task_schema.dump(task)}
+        for index, task in enumerate(created)
+    ]
+
+def _update_tasks(user_id, valid_items, session=None):
+    """Apply a bulk update to the tasks ``user_id`` owns; returns ``{id: serialized task}``."""
+    session = session or db.session
+    owned = _owned_tasks(user_id, [item['id'] for item in valid_items], session)
+    completed_before = sum(owned.values())
+    rows = []
+    for item in valid_items:
+        if item['id'] in owned:
+            row = {key: item[key] for key in ('title', 'description', 'completed') if key in item}
+            row['id'] = item['id']
+            rows.append(row)
+            if 'completed' in item:
+                owned[item['id']] = bool(item['completed'])
+    if rows:
+        # ORM bulk UPDATE by primary key: executemany grouped by column set
+        session.execute(
+            update(Task).where(Task.user_id == user_id), rows,
+            execution_options={'synchronize_session': None}
+        )
+    adjust_task_counts(user_id, completed=sum(owned.values()) - completed_before, session=session)
+    if not owned:
+        return {}
+    return {task.id: task_schema.dump(task) for task in session.scalars(
+        select(Task).where(Task.user_id == user_id, Task.id.in_(owned))
+        .execution_options(populate_existing=True)
+    )}
+
+def _delete_tasks(user_id, ids, session=None):
+    """Delete the tasks of ``ids`` that ``user_id`` owns; returns the deleted ones as :func:`_owned_tasks` does."""
+    session = session or db.session
+    owned = _owned_tasks(user_id, ids, session)
+    if owned:
+        session.execute(
+            delete(Task).where(Task.user_id == user_id, Task.id.in_(owned)),
+            execution_options={'synchronize_session': False}
+        )
+    adjust_task_counts(user_id, total=-len(owned), completed=-sum(owned.values()), session=session)
+    record_tombstones(user_id, list(owned), session)
+    return owned
+
+def _owned_tasks(user_id, ids, session=None):
+    """Map each of ``ids`` owned by ``user_id`` to its current completed flag."""
+    rows = (session or db.session).execute(
+        select(Task.id, Task.completed).where(Task.user_id == user_id, Task.id.in_(set(ids)))
+    )
+    return {task_id: bool(completed) for task_id, completed in rows}
+
+def _load_bulk_items(key):
+    """Pull the item list for a bulk request, enforcing BULK_MAX_BATCH_SIZE."""
+    data = request.get_json(silent=True) or {}
+    items = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({'msg': f"'{key}' must be a non-empty list"}), 400)
+    max_batch = current_app.config['BULK_MAX_BATCH_SIZE']
+    if len(items) > max_batch:
+        return None, (jsonify({'msg': f'Batch too large (max {max_batch} items)'}), 400)
+    return items, None
+
+def _load_bulk_create():
+    """Validated items of a bulk create; returns ``(valid_items, error_response)``."""
+    items, error = _load_bulk_items('tasks')
+    if error:
+        return None, error
+    try:
+        return tasks_schema.load(items), None
+    except ValidationError as e:
+        return None, (jsonify({'msg': 'Invalid input', 'errors': e.messages}), 400)
+
+def _load_bulk_update():
+    """Validated items of a bulk update, each with its task id; returns ``(valid_items, error_response)``."""
+    items, error = _load_bulk_items('tasks')
+    if error:
+        return None, error
+    errors = {}
+    for index, item in enumerate(items):
+        task_id = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            errors[index] = {'id': ['Missing or invalid task id.']}
+    try:
+        valid_items = TaskSchema(many=True, partial=True).load(items)
+    except ValidationError as e:
+        for index, messages in e.messages.items():
+            errors.setdefault(index, {}).update(messages)
+    if errors:
+        return None, (jsonify({'msg': 'Invalid input', 'errors': errors}), 400)
+    return valid_items, None
+
+def _load_bulk_delete():
+    """Task ids of a bulk delete; returns ``(ids, error_response)``."""
+    ids, error = _load_bulk_items('ids')
+    if error:
+        return None, error
+    if not all(isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in ids):
+        return None, (jsonify({'msg': "'ids' must be a list of task ids"}), 400)
+    return ids, None
+
+def _bulk_create_response(user_id, results):
+    _published(user_id, 'created', [result['task'] for result in results])
+    return jsonify({'results': results}), 201
+
+def _bulk_update_response(user_id, valid_items, updated):
+    results = []
+    for item in valid_items:
+        task = updated.get(item['id'])
+        if task is None:
+            results.append({'id': item['id'], 'status': 404, 'msg': 'Task not found'})
+        else:
+            results.append({'id': item['id'], 'status': 200, 'task': task})
+    _published(user_id, 'updated', list(updated.values()))
+    return jsonify({'results': results})
+
+def _bulk_delete_response(user_id, ids, deleted):
+    _published(user_id, 'deleted', [{'id': task_id} for task_id in deleted])
+    return jsonify({'results': [
+        {'id': task_id, 'status': 200, 'msg': 'Task deleted'} if task_id in deleted
+        else {'id': task_id, 'status': 404, 'msg': 'Task not found'}
+        for task_id in ids
+    ]})
+
+@tasks_bp.route('/bulk', methods=['POST'])
+@query_budget(4)
+@jwt_required()
+def bulk_create_tasks():
+    user_id = int(get_jwt_identity())
+    valid_items, error = _load_bulk_create()
+    if error:
+        return error
+    results = _insert_tasks(user_id, valid_items)
     db.session.commit()
-    return jsonify(task_schema.dump(task))
+    return _bulk_create_response(user_id, results)
 
-@tasks_bp.route('/<int:task_id>', methods=['DELETE'])
+@tasks_bp.route('/bulk', methods=['PUT'])
+@query_budget(6)
 @jwt_required()
-def delete_task(task_id):
-    user_id = get_jwt_identity()
-    task = Task.query.filter_by(id=task_id, user_id=int(user_id)).first()
-    if not task:
-        return jsonify({'msg': 'Task not found'}), 404
-    db.session.delete(task)
+def bulk_update_tasks():
+    user_id = int(get_jwt_identity())
+    valid_items, error = _load_bulk_update()
+    if error:
+        return error
+    updated = _update_tasks(user_id, valid_items)
     db.session.commit()
-    return jsonify({'msg': 'Task deleted'})
+    return _bulk_update_response(user_id, valid_items, updated)
+
+@tasks_bp.route('/bulk', methods=['DELETE'])
+@query_budget(6)
+@jwt_required()
+def bulk_delete_tasks():
+    user_id = int(get_jwt_identity())
+    ids, error = _load_bulk_delete()
+    if error:
+        return error
+    deleted = _delete_tasks(user_id, ids)
+    db.session.commit()
+    return _bulk_delete_response(user_id, ids, deleted)
 
 @tasks_bp.route('', methods=['OPTIONS'])
+@tasks_bp.route('/bulk', methods=['OPTIONS'])
+@query_budget(0)
 def options_tasks():
     return '', 200
 
 @tasks_bp.route('/<int:task_id>', methods=['OPTIONS'])
+@query_budget(0)
 def options_task(task_id):
     return '', 200
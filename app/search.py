@@ -0,0 +1,138 @@
+import re
+from flask import current_app
+from sqlalchemy import DDL, event, select, literal_column, func, case, and_, or_, tuple_, Float, table, column
+
+# FTS5 external-content index over task.title/description. user_id is indexed
+# as a token too, so a search is scoped to one user by the index itself rather
+# than by filtering every match afterwards. Triggers keep it in step with task.
+# The migration that creates it carries a copy of these statements.
+FTS5_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "title, description, user_id, content='task', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description, user_id) "
+    "VALUES (new.id, new.title, new.description, new.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description, user_id ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); "
+    "INSERT INTO task_fts(rowid, title, description, user_id) "
+    "VALUES (new.id, new.title, new.description, new.user_id); END",
+)
+FTS5_DROP = 'DROP TABLE IF EXISTS task_fts'
+
+# bm25 column weights: a hit in the title counts ten times one in the description
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+def install_ddl(task_table):
+    """Build the FTS5 index whenever ``db.create_all()`` creates the task table on SQLite."""
+    for statement in FTS5_DDL:
+        event.listen(task_table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(task_table, 'before_drop', DDL(FTS5_DROP).execute_if(dialect='sqlite'))
+
+
+def search_terms(query):
+    """Split a user's query into plain word terms; FTS5 operators and quotes are dropped."""
+    return _TERM.findall(query or '')
+
+
+class SearchBackend:
+    """Builds the ranked search statement for one database.
+
+    :meth:`select` returns the task columns plus a ``rank`` column, lower is
+    better, for ``user_id``'s tasks matching every term; the caller orders by
+    ``(rank, id)`` and pages on it.
+    """
+
+    name = None
+
+    def select(self, columns, user_id, terms):
+        raise NotImplementedError
+
+
+class FTS5Backend(SearchBackend):
+    """SQLite FTS5 index (``task_fts``) ranked by bm25."""
+
+    name = 'fts5'
+    fts = table('task_fts', column('rowid'))
+
+    def match_expression(self, user_id, terms):
+        # Every term quoted (no operator injection). No prefix match on the last term:
+        # expanding a short prefix over a large index dominated tail latency.
+        quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+        return f'user_id : "{int(user_id)}" AND {{title description}} : ({" ".join(quoted)})'
+
+    def select(self, columns, user_id, terms):
+        from .models import Task
+        rank = func.bm25(literal_column('task_fts'), TITLE_WEIGHT, DESCRIPTION_WEIGHT, 0.0)
+        return (
+            select(*columns, rank.label('rank'))
+            .select_from(self.fts)
+            .join(Task, Task.id == self.fts.c.rowid)
+            .where(literal_column('task_fts').op('MATCH')(self.match_expression(user_id, terms)))
+            .where(Task.user_id == user_id)
+        )
+
+
+class LikeBackend(SearchBackend):
+    """Portable fallback: a LIKE scan of the user's tasks, title matches first.
+
+    Used where no full-text backend exists for the database yet (a Postgres
+    tsvector backend would register itself in ``BACKENDS``) and as the
+    baseline in ``benchmarks.search``.
+    """
+
+    name = 'like'
+
+    def select(self, columns, user_id, terms):
+        from .models import Task
+        conditions, title_hits = [], []
+        for term in terms:
+            pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            in_title = Task.title.ilike(pattern, escape='\\')
+            conditions.append(or_(in_title, Task.description.ilike(pattern, escape='\\')))
+            title_hits.append(in_title)
+        rank = case((and_(*title_hits), 0.0), else_=1.0).cast(Float)
+        return select(*columns, rank.label('rank')).where(Task.user_id == user_id, *conditions)
+
+
+BACKENDS = {backend.name: backend for backend in (FTS5Backend(), LikeBackend())}
+# Dialect -> default backend when SEARCH_BACKEND is not set
+DIALECT_BACKENDS = {'sqlite': 'fts5'}
+
+
+class TaskSearch:
+    """Picks the search backend for the app's database (``SEARCH_BACKEND``).
+
+    ``SEARCH_BACKEND`` names an entry of ``BACKENDS``; left unset, SQLite
+    uses FTS5 and other databases fall back to ``like``.
+    """
+
+    def init_app(self, app):
+        from .extensions import db
+        name = app.config.get('SEARCH_BACKEND')
+        if not name:
+            with app.app_context():
+                name = DIALECT_BACKENDS.get(db.engine.dialect.name, 'like')
+        if name not in BACKENDS:
+            raise ValueError(f'Unknown SEARCH_BACKEND {name!r}; choose from {", ".join(BACKENDS)}')
+        app.extensions['search'] = BACKENDS[name]
+
+    @property
+    def backend(self):
+        return current_app.extensions['search']
+
+    def statement(self, columns, user_id, terms, seek_after=None, limit=None):
+        """Ranked, keyset-paginated search statement: rows carry ``rank`` after ``columns``."""
+        ranked = self.backend.select(columns, user_id, terms).subquery()
+        stmt = select(ranked)
+        if seek_after is not None:
+            stmt = stmt.where(tuple_(ranked.c.rank, ranked.c.id) > tuple_(*seek_after))
+        stmt = stmt.order_by(ranked.c.rank, ranked.c.id)
+        return stmt.limit(limit) if limit is not None else stmt
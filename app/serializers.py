@@ -0,0 +1,117 @@
+import json
+from functools import lru_cache
+from flask.json.provider import DefaultJSONProvider
+from marshmallow import fields
+from .schemas import TaskSchema
+
+try:
+    import orjson
+except ImportError:  # optional dependency; fall back to the stdlib encoder
+    orjson = None
+
+# Field names accepted by ``fields=``, in the order they are serialized
+TASK_FIELDS = tuple(TaskSchema().dump_fields)
+
+
+class InvalidFields(ValueError):
+    """Raised when ``fields=`` names something :class:`TaskSchema` does not dump."""
+
+
+def dumps(obj):
+    """Encode ``obj`` as compact JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with orjson when available.
+
+    Datetimes and dataclasses are passed back to Flask's ``default`` so the
+    output matches the stdlib provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+
+def _converter(field):
+    """Return (kind, helper) describing how to serialize one attribute like ``field`` does."""
+    if isinstance(field, fields.DateTime):
+        return 'call', field.SERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+    if isinstance(field, fields.Integer) and not field.as_string:
+        return 'call', int
+    if isinstance(field, fields.String):
+        return 'call', str
+    if type(field) is fields.Boolean or type(field) is fields.Raw:
+        return 'identity', None
+    return 'field', field
+
+
+def compile_serializer(schema, only=None):
+    """Compile a function that turns one object into the dict ``schema.dump`` would.
+
+    The generated code reads each attribute once and converts it inline,
+    skipping marshmallow's per-field dispatch. Field types without a known
+    fast conversion fall back to that field's own ``serialize``.
+    """
+    namespace = {}
+    lines = ['def serialize(obj):']
+    items = []
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        if only is not None and name not in only:
+            continue
+        key = field.data_key or name
+        attr = field.attribute or name
+        kind, helper = _converter(field)
+        if kind == 'field':
+            namespace[f'f{index}'] = helper
+            items.append(f'{key!r}: f{index}.serialize({name!r}, obj)')
+            continue
+        lines.append(f'    v{index} = obj.{attr}')
+        if kind == 'identity':
+            items.append(f'{key!r}: v{index}')
+        else:
+            namespace[f'c{index}'] = helper
+            items.append(f'{key!r}: None if v{index} is None else c{index}(v{index})')
+    lines.append('    return {' + ', '.join(items) + '}')
+    exec('\n'.join(lines), namespace)
+    return namespace['serialize']
+
+
+@lru_cache(maxsize=64)
+def task_serializer(only=None):
+    """Cached compiled serializer for :class:`TaskSchema`, optionally limited to ``only`` fields."""
+    return compile_serializer(TaskSchema(), only)
+
+
+def parse_task_fields(value):
+    """Parse a comma-separated ``fields=`` value into :data:`TASK_FIELDS` order.
+
+    Returns ``None`` (every field) when ``value`` is missing or empty, so
+    equivalent requests share one serializer and one column list.
+    """
+    requested = {name.strip() for name in (value or '').split(',') if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(TASK_FIELDS)
+    if unknown:
+        raise InvalidFields(f'Unknown fields: {", ".join(sorted(unknown))}')
+    fields = tuple(name for name in TASK_FIELDS if name in requested)
+    return None if fields == TASK_FIELDS else fields
+
+
+def serialize_task(task, fields=None):
+    return task_serializer(fields)(task)
+
+
+def serialize_tasks(tasks, fields=None):
+    serialize = task_serializer(fields)
+    return [serialize(task) for task in tasks]
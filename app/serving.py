@@ -0,0 +1,101 @@
+import os
+from .cache import LRUCache
+from .events import SharedEventBroker
+from .extensions import db
+
+# gunicorn settings file used by serve() and `gunicorn -c gunicorn.conf.py run:app`
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+THREADS_PER_WORKER = 4
+
+
+def worker_layout(cpus=None):
+    """``(workers, threads)`` for this machine.
+
+    One worker process per CPU plus one, so a worker busy with a slow request
+    or being recycled leaves every CPU in use. Each worker runs a few
+    threads: ``/tasks/stream`` holds one for as long as a client listens, so
+    single-threaded workers would be used up by a handful of open streams.
+    ``WEB_CONCURRENCY`` and ``WEB_THREADS`` override either; see
+    ``benchmarks/serving.py`` for what each layout costs.
+    """
+    cpus = cpus or os.cpu_count() or 1
+    workers = int(os.environ.get('WEB_CONCURRENCY') or cpus + 1)
+    threads = int(os.environ.get('WEB_THREADS') or THREADS_PER_WORKER)
+    return max(workers, 1), max(threads, 1)
+
+
+def dispose_engines(app):
+    """Forget the database connections a forked worker inherited from its parent.
+
+    Pooled connections are sockets or file handles; used from two processes
+    they corrupt each other's protocol state. ``close=False`` drops the pool
+    references without closing them, which would disrupt the parent, and the
+    worker opens its own on first use. Call it in each worker after fork.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    state = app.extensions.get('async_db')
+    if state and state['engine'] is not None:
+        for engine in (state['engine'], *state['replicas'].values()):
+            engine.sync_engine.dispose(close=False)
+
+
+def check_workers(app, workers):
+    """Refuse to serve ``app`` from ``workers`` processes where they would disagree.
+
+    The ``lru`` read cache and replica stickiness without
+    ``CACHE_SHARED_CLIENT`` live in each process: a write only reaches the
+    worker that handled it, and the others keep serving stale tasks or
+    reading a lagging replica. Raises ``RuntimeError`` naming the setting to
+    change. Returns warnings for per-process state that is only incomplete:
+    with local events a stream sees the writes of its own worker.
+    """
+    if workers <= 1:
+        return []
+    problems = []
+    if isinstance(app.extensions.get('task_cache'), LRUCache):
+        problems.append('CACHE_BACKEND=lru is per process; use null, or shared with CACHE_SHARED_CLIENT')
+    router = app.extensions.get('replica_router')
+    if router and router['sticky_seconds'] and isinstance(router['sticky'], LRUCache):
+        problems.append('REPLICA_STICKY_SECONDS needs CACHE_SHARED_CLIENT to hold across workers')
+    if problems:
+        raise RuntimeError(f'Cannot run {workers} workers: ' + '; '.join(problems))
+    if not isinstance(app.extensions.get('task_events'), SharedEventBroker):
+        return ['EVENTS_BACKEND=local: /tasks/stream only sees writes handled by its own worker']
+    return []
+
+
+def limit_streams(app, worker_class, threads):
+    """Keep ``/tasks/stream`` from taking every thread of a worker.
+
+    Under the sync and gthread workers an open stream holds one of the
+    worker's ``threads`` until the client goes away, so unless
+    ``EVENTS_MAX_STREAMS`` is set half of them are left for other requests
+    (a single-threaded worker serves no streams). Async workers (gevent,
+    eventlet) hold a stream on a greenlet and are not limited.
+    """
+    if app.config.get('EVENTS_MAX_STREAMS') is None and worker_class in ('sync', 'gthread'):
+        app.config['EVENTS_MAX_STREAMS'] = threads // 2
+
+
+def serve(app, config_file=CONFIG_FILE):
+    """Run ``app`` under gunicorn with the settings in ``config_file``.
+
+    ``app`` is already built, so the master preloads it and the workers fork
+    from it. Needs gunicorn (``pip install gunicorn``; not on Windows).
+    """
+    from gunicorn.app.base import Application
+
+    class Server(Application):
+        def init(self, parser, opts, args):
+            pass
+
+        def load_config(self):
+            # Only the settings file: sys.argv belongs to run.py, not gunicorn
+            self.load_config_from_file(config_file)
+
+        def load(self):
+            return app
+
+    Server().run()
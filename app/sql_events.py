@@ -0,0 +1,41 @@
+import weakref
+from time import perf_counter
+from sqlalchemy import event
+
+# dialect -> callbacks; one timing hook per dialect, shared by every subscriber
+_callbacks = weakref.WeakKeyDictionary()
+
+
+def _timed_execute(execute, callbacks):
+    def listener(cursor, statement, *args):
+        started = perf_counter()
+        try:
+            execute(cursor, statement, *args)
+        finally:
+            elapsed = perf_counter() - started
+            for callback in callbacks:
+                callback(statement, elapsed, args[-1])
+        return True  # executed here, so SQLAlchemy skips its own call
+
+    return listener
+
+
+def on_statement(engine, callback):
+    """Call ``callback(statement, seconds, context)`` after every DBAPI execute on ``engine``.
+
+    ``context`` is the statement's ExecutionContext; it is shared by the
+    batches SQLAlchemy splits one ``execute()`` into (insertmanyvalues).
+
+    Hooks the dialect's ``do_execute*`` events rather than
+    ``before/after_cursor_execute``: those make every Connection join the
+    engine's event dispatch, which costs ~30us per statement on SQLite. A
+    ``do_execute`` listener that runs the statement must be the only one, so
+    all callbacks share a single listener per dialect.
+    """
+    dialect = engine.dialect
+    callbacks = _callbacks.get(dialect)
+    if callbacks is None:
+        callbacks = _callbacks[dialect] = []
+        for name in ('do_execute', 'do_execute_no_params', 'do_executemany'):
+            event.listen(engine, name, _timed_execute(getattr(dialect, name), callbacks))
+    callbacks.append(callback)
@@ -0,0 +1,36 @@
+from sqlalchemy import event
+
+
+def _pragma_listener(pragmas):
+    statements = [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return set_pragmas
+
+
+class SQLiteProfile:
+    """Applies ``SQLITE_PRAGMAS`` to every new connection of the app's SQLite engines.
+
+    Call ``init_app`` after ``db.init_app`` so the engines exist; other
+    databases are left alone. Engines created later (the async engine) are
+    registered through :meth:`register`.
+    """
+
+    def init_app(self, app):
+        from .extensions import db
+        pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+        app.extensions['sqlite_profile'] = pragmas
+        with app.app_context():
+            for engine in db.engines.values():
+                self.register(engine, pragmas)
+
+    def register(self, engine, pragmas):
+        if pragmas and engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', _pragma_listener(pragmas))
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from .serializers import dumps
+
+# Response media types for the supported streaming formats
+MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def ndjson_chunks(batches):
+    """Encode batches of dicts as newline-delimited JSON, one chunk per batch."""
+    for batch in batches:
+        yield ''.join(dumps(record) + '\n' for record in batch)
+
+
+def csv_chunks(batches, fieldnames):
+    """Encode batches of dicts as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+
+
+def ndjson_records(lines):
+    """Parse NDJSON lines lazily, yielding (line_number, record, error) per non-blank line."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Expected a JSON object'
+            continue
+        yield line_number, record, None
+
+
+def csv_records(lines):
+    """Parse CSV lines lazily, yielding (line_number, record, error) per data row.
+
+    Empty cells are treated as missing so optional columns can be left blank.
+    """
+    reader = csv.DictReader(lines)
+    try:
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, 'Too many columns'
+                continue
+            record = {key: value for key, value in row.items() if value not in ('', None) or key == 'title'}
+            yield reader.line_num, record, None
+    except csv.Error as e:
+        yield reader.line_num, None, f'Invalid CSV: {e}'
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import select, insert, delete, tuple_
+from .extensions import db
+from .models import Task, TaskTombstone
+from .pagination import encode_checkpoint, decode_checkpoint
+from .serializers import serialize_tasks
+
+
+class CheckpointExpired(Exception):
+    """Raised for a checkpoint older than the tombstone retention: deletes it
+    has not seen may already be purged, so the client has to sync from scratch."""
+
+
+def record_tombstones(user_id, task_ids, session=None):
+    """Record deleted ``task_ids`` inside the caller's transaction for ``/tasks/changes``."""
+    if not task_ids:
+        return
+    deleted_at = datetime.now(timezone.utc)
+    (session or db.session).execute(insert(TaskTombstone), [
+        {'task_id': task_id, 'user_id': user_id, 'deleted_at': deleted_at} for task_id in task_ids
+    ])
+
+
+def purge_tombstones(older_than, session=None):
+    """Delete tombstones recorded before ``older_than``; returns how many. The caller commits."""
+    result = (session or db.session).execute(
+        delete(TaskTombstone).where(TaskTombstone.deleted_at < older_than),
+        execution_options={'synchronize_session': False}
+    )
+    return result.rowcount
+
+
+def retention_cutoff(now=None):
+    """Tombstones older than this may be purged; checkpoints older than it are expired."""
+    days = current_app.config['SYNC_TOMBSTONE_RETENTION_DAYS']
+    return (now or datetime.now(timezone.utc)) - timedelta(days=days)
+
+
+def settled_cutoff(now=None):
+    """Changes newer than this are held back: a write that took its timestamp
+    earlier may not have committed yet, and a checkpoint past it would skip it."""
+    seconds = current_app.config['SYNC_SETTLE_SECONDS']
+    return (now or datetime.now(timezone.utc)) - timedelta(seconds=seconds)
+
+
+def changes_window(since, now=None):
+    """Resolve a ``since`` token into ``(tasks_after, deleted_after, cutoff)``.
+
+    Raises :class:`~app.pagination.InvalidCursor` for a token we did not
+    issue and :class:`CheckpointExpired` for one past the retention.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = settled_cutoff(now)
+    if not since:
+        # A first sync downloads every task, so earlier deletes do not matter
+        return None, (cutoff, 0), cutoff
+    tasks_after, deleted_after = decode_checkpoint(since)
+    if deleted_after[0] < retention_cutoff(now):
+        raise CheckpointExpired(since)
+    return tasks_after, deleted_after, cutoff
+
+
+def changed_tasks_select(user_id, columns, tasks_after, cutoff, limit):
+    """Tasks written after ``tasks_after``, oldest first, via ix_task_user_id_updated_at."""
+    stmt = select(*columns).where(Task.user_id == user_id, Task.updated_at <= cutoff)
+    if tasks_after is not None:
+        stmt = stmt.where(tuple_(Task.updated_at, Task.id) > tasks_after)
+    # One extra row tells whether the client has to come back for more
+    return stmt.order_by(Task.updated_at, Task.id).limit(limit + 1)
+
+
+def tombstones_select(user_id, deleted_after, cutoff, limit):
+    """Tombstones recorded after ``deleted_after``, oldest first.
+
+    An id that belongs to one of the user's tasks again (SQLite reuses the
+    highest rowid after a delete) is left out; the task itself is reported.
+    """
+    recreated = select(Task.id).where(
+        Task.id == TaskTombstone.task_id, Task.user_id == TaskTombstone.user_id
+    ).exists()
+    return (
+        select(TaskTombstone.deleted_at, TaskTombstone.id, TaskTombstone.task_id)
+        .where(
+            TaskTombstone.user_id == user_id,
+            TaskTombstone.deleted_at <= cutoff,
+            tuple_(TaskTombstone.deleted_at, TaskTombstone.id) > deleted_after,
+            ~recreated
+        )
+        .order_by(TaskTombstone.deleted_at, TaskTombstone.id)
+        .limit(limit + 1)
+    )
+
+
+def changes_page(task_rows, tombstone_rows, tasks_after, deleted_after, cutoff, limit, fields=None):
+    """Build the ``/tasks/changes`` body from the rows of the two selects above.
+
+    Each stream's position moves to its last row sent. Once the tombstones
+    are drained their position moves up to ``cutoff``, which also dates the
+    checkpoint for :func:`retention_cutoff`.
+    """
+    more_tasks, more_tombstones = len(task_rows) > limit, len(tombstone_rows) > limit
+    task_rows, tombstone_rows = task_rows[:limit], tombstone_rows[:limit]
+    if task_rows:
+        tasks_after = (task_rows[-1].updated_at, task_rows[-1].id)
+    if more_tombstones:
+        deleted_after = (tombstone_rows[-1].deleted_at, tombstone_rows[-1].id)
+    else:
+        deleted_after = (cutoff, 0)
+    return {
+        'tasks': serialize_tasks(task_rows, fields),
+        'deleted': [row.task_id for row in tombstone_rows],
+        'checkpoint': encode_checkpoint(tasks_after, deleted_after),
+        'has_more': more_tasks or more_tombstones,
+    }
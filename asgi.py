@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Task Manager API ASGI Entry Point
+
+Serves the app in async mode under an ASGI server, e.g.:
+
+    uvicorn asgi:app --workers 2
+
+Flask stays a WSGI app; each request runs in a worker thread while its async
+view is scheduled on the server's event loop, so database waits from many
+requests overlap on one loop and share one pool of async connections.
+"""
+
+import os
+from asgiref.sync import SyncToAsync
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+# Every async view runs on the server's loop, so async connections can be pooled
+os.environ.setdefault('ASYNC_MODE', 'true')
+os.environ.setdefault('ASYNC_SQLALCHEMY_POOLED', 'true')
+
+from app import create_app  # noqa: E402
+
+
+class _ConcurrentWsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs WSGI apps thread-sensitively, i.e. one request at a time
+    run_wsgi_app = SyncToAsync(WsgiToAsgiInstance.__dict__['run_wsgi_app'].func, thread_sensitive=False)
+
+
+class ConcurrentWsgiToAsgi(WsgiToAsgi):
+    """``WsgiToAsgi`` that lets requests run in parallel worker threads."""
+
+    async def __call__(self, scope, receive, send):
+        await _ConcurrentWsgiInstance(self.wsgi_application, self.duplicate_header_limit)(
+            scope, receive, send
+        )
+
+
+flask_app = create_app()
+app = ConcurrentWsgiToAsgi(flask_app)
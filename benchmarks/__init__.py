@@ -0,0 +1,6 @@
+"""Performance benchmarks for the Task Manager API.
+
+Run a benchmark from the repository root, e.g.::
+
+    python -m benchmarks.serialization --count 100
+"""
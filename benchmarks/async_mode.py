@@ -0,0 +1,133 @@
+"""Benchmark: concurrent-request throughput and memory, sync vs async mode.
+
+Each mode runs in its own process against a fresh SQLite file and is driven
+through the ASGI adapter in ``asgi.py`` with ``--concurrency`` requests in
+flight: a mix of list, single-task reads and creates. Reports requests/sec,
+latency percentiles and the process's peak RSS.
+
+    python -m benchmarks.async_mode [--requests 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+async def _call(app, method, path, body=None, token=None):
+    payload = json.dumps(body).encode() if body is not None else b''
+    headers = [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())]
+    if token:
+        headers.append((b'authorization', token.encode()))
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'root_path': '', 'query_string': query.encode(), 'headers': headers,
+        'server': ('bench', 80), 'client': ('bench', 1),
+    }
+    messages = [{'type': 'http.request', 'body': payload}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]['status'], b''.join(m.get('body', b'') for m in sent[1:])
+
+
+async def _drive(app, args):
+    await _call(app, 'POST', '/auth/register', {'username': 'bench', 'password': 'bench'})
+    _, body = await _call(app, 'POST', '/auth/login', {'username': 'bench', 'password': 'bench'})
+    token = json.loads(body)['access_token']
+    ids = []
+    for i in range(100):
+        _, body = await _call(app, 'POST', '/tasks', {'title': f'Seed {i}'}, token)
+        ids.append(json.loads(body)['id'])
+
+    rng = random.Random(7)
+    plan = []
+    for i in range(args.requests):
+        roll = rng.random()
+        if roll < 0.5:
+            plan.append(('GET', f'/tasks?page={rng.randint(1, 5)}&per_page=20', None))
+        elif roll < 0.9:
+            plan.append(('GET', f'/tasks/{rng.choice(ids)}', None))
+        else:
+            plan.append(('POST', '/tasks', {'title': f'Task {i}'}))
+
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies, errors = [], 0
+
+    async def one(method, path, body):
+        nonlocal errors
+        async with gate:
+            started = time.perf_counter()
+            status, _ = await _call(app, method, path, body, token)
+            latencies.append(time.perf_counter() - started)
+            errors += status >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*step) for step in plan))
+    elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        'rps': args.requests / elapsed,
+        'p50_ms': cuts[49] * 1000,
+        'p99_ms': cuts[98] * 1000,
+        'errors': errors,
+        'peak_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_mode(args):
+    fd, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(fd)
+    os.environ.update({
+        'DATABASE_URL': f'sqlite:///{path}',
+        'ASYNC_MODE': 'true' if args.run == 'async' else 'false',
+        'CACHE_BACKEND': 'null',
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+    })
+    try:
+        import asgi
+        from app.extensions import db
+        with asgi.flask_app.app_context():
+            db.create_all()
+        print(json.dumps(asyncio.run(_drive(asgi.app, args))))
+    finally:
+        os.remove(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--run', choices=['sync', 'async'], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.run:
+        return run_mode(args)
+
+    print(f'{args.requests} requests, {args.concurrency} in flight')
+    print(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'peak RSS MiB':>13}")
+    for mode in ('sync', 'async'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.async_mode', '--run', mode,
+             '--requests', str(args.requests), '--concurrency', str(args.concurrency)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<6} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['errors']:>7} {r['peak_rss_mib']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
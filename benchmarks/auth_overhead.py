@@ -0,0 +1,67 @@
+"""Benchmark: JWT verification cost per request with and without the claims cache.
+
+Measures ``verify_jwt_in_request`` alone (what ``@jwt_required()`` adds to
+every task endpoint) and a full ``GET /tasks`` round trip through the test
+client, for the same token reused across requests.
+
+    python -m benchmarks.auth_overhead [--requests 5000] [--tokens 1]
+"""
+import argparse
+import time
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+from app import create_app
+from app.extensions import db, jwt
+from app.models import User
+
+
+def setup(enabled, tokens):
+    app = create_app('testing')
+    app.config.update(JWT_CLAIMS_CACHE=enabled, CACHE_BACKEND='null')
+    jwt.init_app(app)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+        # distinct tokens for the same user model many clients behind one cache
+        issued = [create_access_token(identity=str(user.id), additional_claims={'n': n}) for n in range(tokens)]
+    return app, issued
+
+
+def verify_only(app, issued, count):
+    started = time.perf_counter()
+    for i in range(count):
+        with app.test_request_context(headers={'Authorization': issued[i % len(issued)]}):
+            verify_jwt_in_request()
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def full_request(app, issued, count):
+    client = app.test_client()
+    started = time.perf_counter()
+    for i in range(count):
+        client.get('/tasks', headers={'Authorization': issued[i % len(issued)]})
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--tokens', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f'{args.requests} requests over {args.tokens} token(s)')
+    print(f"{'cache':<6} {'verify us/req':>14} {'GET /tasks us/req':>18} {'hit rate':>9}")
+    for enabled in (False, True):
+        app, issued = setup(enabled, args.tokens)
+        verify = verify_only(app, issued, args.requests)
+        full = full_request(app, issued, args.requests)
+        with app.app_context():
+            stats = jwt.cache_stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats else '-'
+        print(f"{'on' if enabled else 'off':<6} {verify:>14.1f} {full:>18.1f} {hit_rate:>9}")
+
+
+if __name__ == '__main__':
+    main()
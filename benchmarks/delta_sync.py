@@ -0,0 +1,98 @@
+"""Benchmark: delta sync vs re-downloading the task list, by collection size.
+
+For each collection size, seeds one user's tasks, takes a checkpoint, then
+updates, creates and deletes ``--changes`` tasks and measures what a client
+pays to catch up: paging ``GET /tasks?limit=`` through the whole list versus
+``GET /tasks/changes?since=``. Delta sync should stay flat as the
+collection grows.
+
+    python -m benchmarks.delta_sync [--sizes 1000 10000 100000] [--changes 10] [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+import config
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+from app import create_app
+from app.extensions import db
+from app.models import User, Task
+
+
+def seed(size):
+    config.TestingConfig.CACHE_BACKEND = 'null'
+    config.TestingConfig.SLOW_QUERY_MS = 0
+    app = create_app('testing', async_mode=False)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        db.session.execute(insert(Task), [
+            {'title': f'Task {i}', 'description': 'Benchmark task description', 'user_id': user.id}
+            for i in range(size)
+        ])
+        db.session.commit()
+        headers = {'Authorization': create_access_token(identity=str(user.id))}
+    return app, headers
+
+
+def full_download(client, headers):
+    requests = size = 0
+    url = '/tasks?limit=100'
+    while url:
+        res = client.get(url, headers=headers)
+        requests, size = requests + 1, size + len(res.get_data())
+        cursor = res.get_json()['next_cursor']
+        url = cursor and f'/tasks?limit=100&cursor={cursor}'
+    return requests, size
+
+
+def delta(client, headers, checkpoint):
+    requests = size = 0
+    while True:
+        res = client.get(f"/tasks/changes?limit=100&since={checkpoint or ''}", headers=headers)
+        requests, size = requests + 1, size + len(res.get_data())
+        body = res.get_json()
+        checkpoint = body['checkpoint']
+        if not body['has_more']:
+            return requests, size, checkpoint
+
+
+def measure(fn, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        requests, size = fn(*args)[:2]
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, requests, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--changes', type=int, default=10, help='tasks updated, created and deleted each')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f'{args.changes} updates, creates and deletes since the checkpoint, median of {args.repeat} runs')
+    print(f"{'tasks':>8} {'mode':<7} {'ms':>9} {'requests':>9} {'bytes':>12}")
+    for size in args.sizes:
+        app, headers = seed(size)
+        client = app.test_client()
+        # The client's first sync, after which it only asks for changes
+        checkpoint = delta(client, headers, None)[2]
+        for n in range(args.changes):
+            client.put(f'/tasks/{n + 1}', json={'completed': True}, headers=headers)
+            client.post('/tasks', json={'title': f'New {n}'}, headers=headers)
+            client.delete(f'/tasks/{size - n}', headers=headers)
+        for mode, fn, extra in (('full', full_download, ()), ('delta', delta, (checkpoint,))):
+            ms, requests, body_bytes = measure(fn, args.repeat, client, headers, *extra)
+            print(f'{size:>8} {mode:<7} {ms:>9.1f} {requests:>9} {body_bytes:>12,}')
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Benchmark: /tasks/stream broker memory per idle subscriber and publish cost.
+
+Subscribes ``--subscribers`` idle streams spread over ``--users`` users and
+reports the memory held per subscription, then times publishing to one
+user, whose cost follows that user's own subscribers rather than the total,
+with none of them reading so every one ends up dropped as a slow consumer.
+
+    python -m benchmarks.events [--subscribers 1000 10000 50000] [--users 1000] [--publishes 10000]
+"""
+import argparse
+import time
+import tracemalloc
+from app.events import EventBroker
+
+EVENT = {'id': 1, 'title': 'Benchmark task', 'description': 'Benchmark task description', 'completed': False}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subscribers', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--publishes', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    print(f"{'subscribers':>11} {'B/subscriber':>13} {'publish us':>11} {'dropped':>8}")
+    for count in args.subscribers:
+        broker = EventBroker()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        subscriptions = [broker.subscribe(n % args.users)[0] for n in range(count)]
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / count
+        tracemalloc.stop()
+        # Publishing to user 0 fills its subscribers' buffers; none of them reads
+        started = time.perf_counter()
+        for _ in range(args.publishes):
+            broker.publish(0, 'updated', EVENT)
+        publish_us = (time.perf_counter() - started) / args.publishes * 1e6
+        print(f'{count:>11} {per_subscriber:>13.0f} {publish_us:>11.2f} {broker.stats()["dropped"]:>8}')
+        for subscription in subscriptions:
+            subscription.close()
+
+
+if __name__ == '__main__':
+    main()
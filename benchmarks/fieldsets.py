@@ -0,0 +1,77 @@
+"""Benchmark: full task representations vs a ?fields= projection.
+
+Seeds tasks with long descriptions and requests the same list page and
+export with and without ``fields=id,title,completed`` (what the list views
+show), reporting median latency and response size. The read cache is off so
+every request selects its rows.
+
+    python -m benchmarks.fieldsets [--tasks 2000] [--description-bytes 2000] [--per-page 100] [--repeat 30]
+"""
+import argparse
+import statistics
+import time
+import config
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+from app import create_app
+from app.extensions import db
+from app.models import User, Task
+
+LIST_FIELDS = 'id,title,completed'
+
+
+def measure(client, headers, path, repeat):
+    client.get(path, headers=headers).get_data()  # warm up statement caches
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(client.get(path, headers=headers).get_data())
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=2000)
+    parser.add_argument('--description-bytes', type=int, default=2000)
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args(argv)
+
+    config.TestingConfig.CACHE_BACKEND = 'null'
+    app = create_app('testing', async_mode=False)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        db.session.execute(insert(Task), [
+            {'title': f'Task {i}', 'description': 'x' * args.description_bytes,
+             'completed': i % 2 == 0, 'user_id': user.id}
+            for i in range(args.tasks)
+        ])
+        db.session.commit()
+        headers = {'Authorization': create_access_token(identity=str(user.id))}
+    client = app.test_client()
+
+    paths = {
+        'list': f'/tasks?per_page={args.per_page}',
+        'cursor': f'/tasks?limit={args.per_page}',
+        'get': '/tasks/1',
+        'export': '/tasks/export',
+    }
+    print(f'{args.tasks} tasks with {args.description_bytes} B descriptions, median of {args.repeat} runs')
+    print(f"{'endpoint':<8} {'fields':<20} {'ms':>8} {'bytes':>11}")
+    for name, path in paths.items():
+        results = {}
+        for fields in ('all', LIST_FIELDS):
+            url = path if fields == 'all' else f"{path}{'&' if '?' in path else '?'}fields={fields}"
+            results[fields] = measure(client, headers, url, args.repeat)
+            ms, size = results[fields]
+            print(f'{name:<8} {fields:<20} {ms:>8.2f} {size:>11,}')
+        print(f'{"":<8} projection is {results["all"][0] / results[LIST_FIELDS][0]:.1f}x faster, '
+              f'{results["all"][1] / results[LIST_FIELDS][1]:.1f}x smaller')
+
+
+if __name__ == '__main__':
+    main()
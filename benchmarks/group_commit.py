@@ -0,0 +1,91 @@
+"""Benchmark: task-creation throughput and latency at different group-commit windows.
+
+``--clients`` threads POST /tasks for ``--seconds`` against a fresh SQLite
+file per run. "off" commits per request; the other runs batch commits within
+each window. Use ``--synchronous FULL`` and a real disk (``--dir``) to make
+every commit pay for an fsync, which is what group commit amortizes.
+
+    python -m benchmarks.group_commit [--windows 1 2 5 10] [--clients 16] [--dir PATH]
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+import config
+from app import create_app
+from app.extensions import db, group_commit
+from app.models import User
+from flask_jwt_extended import create_access_token
+
+
+def run(window, args, directory):
+    uri = f'sqlite:///{directory}/group-{window}.sqlite3'
+    config.TestingConfig.SQLALCHEMY_DATABASE_URI = uri
+    config.TestingConfig.SQLALCHEMY_ENGINE_OPTIONS = config.engine_options(uri)
+    config.TestingConfig.SQLITE_PRAGMAS = {**config.Config.SQLITE_PRAGMAS, 'synchronous': args.synchronous}
+    config.TestingConfig.GROUP_COMMIT = window is not None
+    config.TestingConfig.GROUP_COMMIT_WINDOW_MS = window or 0
+    app = create_app('testing', async_mode=False)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+        headers = {'Authorization': create_access_token(identity=str(user.id))}
+
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def client_loop():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            res = client.post('/tasks', json={'title': 'Benchmark task'}, headers=headers)
+            elapsed = time.perf_counter() - started
+            with lock:
+                if res.status_code == 201:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client_loop) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        stats = group_commit.stats()
+        group_commit.stop()
+        db.engine.dispose()
+    cuts = statistics.quantiles(latencies, n=100)
+    label = 'off' if window is None else f'{window:g} ms'
+    batch = f"{stats['average_batch']:.1f}" if stats else '1.0'
+    print(f'{label:>7} {len(latencies) / args.seconds:>9.1f} {cuts[49] * 1000:>8.1f} '
+          f'{cuts[98] * 1000:>8.1f} {batch:>7} {errors[0]:>7}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--windows', type=float, nargs='+', default=[1, 2, 5, 10])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--synchronous', default='FULL', choices=['OFF', 'NORMAL', 'FULL'])
+    parser.add_argument('--dir', help='where to create the database files (use a real disk, not tmpfs)')
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(dir=args.dir)
+    try:
+        print(f'{args.clients} clients, synchronous={args.synchronous}, {args.seconds:g}s per run')
+        print(f"{'window':>7} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'batch':>7} {'errors':>7}")
+        for window in [None, *args.windows]:
+            run(window, args, directory)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+"""Load and latency suite: seed a database, replay a request mix, compare against a baseline.
+
+    python -m benchmarks.load --users 20 --tasks 200 --requests 5000 --concurrency 8 \\
+        --mix login=1,list=4,get=4,create=2,update=2,delete=1 \\
+        --output results.json --baseline baseline.json --threshold 0.15
+
+See ``python -m benchmarks.load --help``; the exit status is 1 when the run
+regresses past the threshold against the baseline.
+"""
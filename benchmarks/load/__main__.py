@@ -0,0 +1,90 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import config
+from app import create_app
+from app.extensions import db, group_commit
+from . import __doc__ as DOC
+from .report import summarize, save, load, compare, format_result, format_comparison
+from .seed import seed
+from .workload import parse_mix, replay, FlaskClientTransport, ServerTransport
+
+DEFAULT_MIX = 'login=1,list=4,get=4,create=2,update=2,delete=1'
+# Run settings that must match for a baseline comparison to be meaningful
+COMPARABLE = ('users', 'tasks_per_user', 'requests', 'concurrency', 'mix', 'transport', 'async_mode')
+
+
+def build_app(directory, args):
+    uri = f'sqlite:///{directory}/load.sqlite3'
+    config.TestingConfig.SQLALCHEMY_DATABASE_URI = uri
+    config.TestingConfig.SQLALCHEMY_ENGINE_OPTIONS = config.engine_options(uri)
+    config.TestingConfig.PASSWORD_HASH_METHOD = args.hash_method
+    return create_app('testing', async_mode=args.async_mode)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.load', description=DOC.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--tasks', type=int, default=200, help='tasks seeded per user')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='operation=weight pairs')
+    parser.add_argument('--server', action='store_true',
+                        help='go through a local threaded WSGI server instead of the test client')
+    parser.add_argument('--async-mode', action='store_true', help='build the app with ASYNC_MODE on')
+    parser.add_argument('--hash-method', default='pbkdf2:sha256:1000',
+                        help="PASSWORD_HASH_METHOD; use 'scrypt' to include production login cost")
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the request sequence')
+    parser.add_argument('--dir', help='where to create the database file')
+    parser.add_argument('--output', help='write the results as JSON to this path')
+    parser.add_argument('--baseline', help='compare against a JSON results file from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed relative regression before the comparison fails')
+    parser.add_argument('--metric', default='p95_ms', choices=['p50_ms', 'p95_ms', 'p99_ms', 'mean_ms'],
+                        help='latency figure compared against the baseline')
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    directory = tempfile.mkdtemp(dir=args.dir)
+    try:
+        app = build_app(directory, args)
+        owned = seed(app, args.users, args.tasks)
+        transport = ServerTransport(app) if args.server else FlaskClientTransport(app)
+        try:
+            samples, elapsed = replay(transport, owned, mix, args.requests, args.concurrency, args.seed)
+        finally:
+            transport.close()
+            with app.app_context():
+                group_commit.stop()
+                db.engine.dispose()
+    finally:
+        shutil.rmtree(directory)
+
+    result = summarize(samples, elapsed, {
+        'users': args.users, 'tasks_per_user': args.tasks, 'requests': args.requests,
+        'concurrency': args.concurrency, 'mix': mix, 'seed': args.seed,
+        'transport': 'server' if args.server else 'test_client', 'async_mode': args.async_mode,
+    })
+    print(format_result(result))
+    if args.output:
+        save(result, args.output)
+    if args.baseline:
+        baseline = load(args.baseline)
+        changed = [key for key in COMPARABLE if baseline['meta'].get(key) != result['meta'].get(key)]
+        if changed:
+            print(f"\nwarning: baseline was recorded with different {', '.join(changed)}")
+        rows, failures = compare(result, baseline, args.threshold, args.metric)
+        print()
+        print(format_comparison(rows, args.metric))
+        if failures:
+            print(f'\nFAIL: {len(failures)} regression(s) beyond {args.threshold:.0%}')
+            return 1
+        print(f'\nPASS: within {args.threshold:.0%} of the baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
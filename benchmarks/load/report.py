@@ -0,0 +1,112 @@
+"""Summaries of a replay, JSON results and baseline comparison."""
+import json
+import platform
+import statistics
+from datetime import datetime, timezone
+
+PERCENTILES = (50, 95, 99)
+
+
+def _summary(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        points = {f'p{p}_ms': round(cuts[p - 1] * 1000, 3) for p in PERCENTILES}
+    else:
+        points = {f'p{p}_ms': round(latencies[0] * 1000, 3) if latencies else None for p in PERCENTILES}
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3) if latencies else None,
+        **points,
+    }
+
+
+def summarize(samples, elapsed, meta):
+    """Build the result document for ``samples`` from :func:`workload.replay`."""
+    by_operation = {}
+    for name, seconds, status in samples:
+        entry = by_operation.setdefault(name, ([], [0]))
+        entry[0].append(seconds)
+        entry[1][0] += status >= 400
+    return {
+        'meta': {
+            **meta,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            'elapsed_s': round(elapsed, 3),
+        },
+        'overall': _summary([s for _, s, _ in samples], sum(st >= 400 for _, _, st in samples), elapsed),
+        'endpoints': {
+            name: _summary(latencies, errors[0], elapsed)
+            for name, (latencies, errors) in sorted(by_operation.items())
+        },
+    }
+
+
+def save(result, path):
+    with open(path, 'w') as handle:
+        json.dump(result, handle, indent=2)
+
+
+def load(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def compare(result, baseline, threshold, metric='p95_ms'):
+    """Compare ``result`` with ``baseline`` per endpoint and overall.
+
+    A row regresses when ``metric`` grows, or throughput drops, by more than
+    ``threshold`` (a fraction, 0.15 = 15%), or when a baseline without errors
+    now has errors. Returns ``(rows, failures)``.
+    """
+    rows, failures = [], []
+    sections = [('overall', result['overall'], baseline.get('overall'))]
+    sections += [(name, current, baseline.get('endpoints', {}).get(name))
+                 for name, current in result['endpoints'].items()]
+    for name, current, before in sections:
+        if not before:
+            rows.append((name, None, None, 'new'))
+            continue
+        latency = _ratio(current.get(metric), before.get(metric))
+        throughput = _ratio(current.get('throughput_rps'), before.get('throughput_rps'))
+        problems = []
+        if latency is not None and latency > 1 + threshold:
+            problems.append(f'{metric} +{(latency - 1):.0%}')
+        if throughput is not None and throughput < 1 - threshold:
+            problems.append(f'throughput -{(1 - throughput):.0%}')
+        if current.get('errors') and not before.get('errors'):
+            problems.append(f"{current['errors']} errors")
+        rows.append((name, latency, throughput, ', '.join(problems) or 'ok'))
+        if problems:
+            failures.append((name, problems))
+    return rows, failures
+
+
+def _ratio(current, before):
+    if current is None or not before:
+        return None
+    return current / before
+
+
+def format_result(result):
+    lines = [f"{'endpoint':<10} {'requests':>8} {'errors':>6} {'req/s':>9} "
+             f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"]
+    for name, row in [*result['endpoints'].items(), ('overall', result['overall'])]:
+        lines.append(
+            f"{name:<10} {row['requests']:>8} {row['errors']:>6} {row['throughput_rps'] or 0:>9.1f} "
+            + ' '.join(f"{row[f'p{p}_ms'] or 0:>8.2f}" for p in PERCENTILES)
+        )
+    return '\n'.join(lines)
+
+
+def format_comparison(rows, metric):
+    lines = [f"{'endpoint':<10} {metric + ' x':>9} {'req/s x':>9}  verdict"]
+    for name, latency, throughput, verdict in rows:
+        latency = f'{latency:.2f}' if latency is not None else '-'
+        throughput = f'{throughput:.2f}' if throughput is not None else '-'
+        lines.append(f'{name:<10} {latency:>9} {throughput:>9}  {verdict}')
+    return '\n'.join(lines)
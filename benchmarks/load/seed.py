@@ -0,0 +1,39 @@
+"""Seeding step: N users with M tasks each, written with multi-row inserts."""
+from sqlalchemy import insert, select
+from app.counters import rebuild_task_counts
+from app.extensions import db, hasher
+from app.models import User, Task
+
+PASSWORD = 'load-test-password'
+CHUNK = 5000
+
+
+def seed(app, users, tasks_per_user, prefix='load'):
+    """Create the schema plus ``users`` x ``tasks_per_user`` rows.
+
+    Returns ``{username: [task ids]}``. All users share one password hash so
+    seeding pays for a single KDF run.
+    """
+    with app.app_context():
+        db.create_all()
+        password_hash = hasher.hash(PASSWORD)
+        usernames = [f'{prefix}{index}' for index in range(users)]
+        db.session.execute(insert(User), [
+            {'username': username, 'password_hash': password_hash} for username in usernames
+        ])
+        user_ids = dict(db.session.execute(
+            select(User.username, User.id).where(User.username.in_(usernames))
+        ).all())
+        rows = [
+            {'title': f'Task {n}', 'description': 'Seeded task', 'completed': n % 3 == 0, 'user_id': user_id}
+            for user_id in user_ids.values() for n in range(tasks_per_user)
+        ]
+        for start in range(0, len(rows), CHUNK):
+            db.session.execute(insert(Task), rows[start:start + CHUNK])
+        rebuild_task_counts()
+        db.session.commit()
+        owned = {username: [] for username in usernames}
+        names = {user_id: username for username, user_id in user_ids.items()}
+        for task_id, user_id in db.session.execute(select(Task.id, Task.user_id).where(Task.user_id.in_(names))):
+            owned[names[user_id]].append(task_id)
+        return owned
@@ -0,0 +1,164 @@
+"""Replays a weighted mix of API operations from concurrent virtual clients."""
+import http.client
+import json
+import random
+import threading
+import time
+from werkzeug.serving import make_server, WSGIRequestHandler
+from .seed import PASSWORD
+
+OPERATIONS = ('login', 'list', 'get', 'create', 'update', 'delete')
+
+
+def parse_mix(text):
+    """Parse ``'login=1,list=4,...'`` into ``{operation: weight}``."""
+    mix = {}
+    for part in filter(None, (item.strip() for item in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in OPERATIONS:
+            raise ValueError(f'Unknown operation {name!r}; choose from {", ".join(OPERATIONS)}')
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError('The mix needs at least one operation with a positive weight')
+    return mix
+
+
+class FlaskClientTransport:
+    """Calls the app in-process through Flask's test client (one per thread)."""
+
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        res = client.open(path, method=method, json=body, headers=headers)
+        return res.status_code, res.get_data()
+
+    def close(self):
+        pass
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class HTTPTransport:
+    """Calls an already running server on localhost over HTTP."""
+
+    def __init__(self, port):
+        self.port = port
+
+    def request(self, method, path, body=None, headers=None):
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        try:
+            payload = json.dumps(body).encode() if body is not None else None
+            conn.request(method, path, body=payload, headers={
+                'Content-Type': 'application/json', **(headers or {})
+            })
+            res = conn.getresponse()
+            return res.status, res.read()
+        finally:
+            conn.close()
+
+    def close(self):
+        pass
+
+
+class ServerTransport(HTTPTransport):
+    """Serves the app from a threaded werkzeug WSGI server on localhost and calls it over HTTP."""
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=_QuietHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        super().__init__(self.server.server_port)
+
+    def close(self):
+        self.server.shutdown()
+        self.thread.join()
+
+
+class _Client:
+    """One virtual user: logs in once, then runs operations on its own tasks."""
+
+    def __init__(self, transport, username, task_ids, rng):
+        self.transport = transport
+        self.username = username
+        self.task_ids = list(task_ids)
+        self.rng = rng
+        self.headers = None
+
+    def login(self):
+        status, body = self.transport.request(
+            'POST', '/auth/login', {'username': self.username, 'password': PASSWORD})
+        if status == 200:
+            self.headers = {'Authorization': json.loads(body)['access_token']}
+        return status
+
+    def list(self):
+        page = self.rng.randint(1, 5)
+        return self.transport.request('GET', f'/tasks?page={page}&per_page=20', headers=self.headers)[0]
+
+    def get(self):
+        if not self.task_ids:
+            return self.create()
+        task_id = self.rng.choice(self.task_ids)
+        return self.transport.request('GET', f'/tasks/{task_id}', headers=self.headers)[0]
+
+    def create(self):
+        status, body = self.transport.request(
+            'POST', '/tasks', {'title': 'Load test task', 'description': 'Created under load'}, self.headers)
+        if status == 201:
+            self.task_ids.append(json.loads(body)['id'])
+        return status
+
+    def update(self):
+        if not self.task_ids:
+            return self.create()
+        task_id = self.rng.choice(self.task_ids)
+        return self.transport.request(
+            'PUT', f'/tasks/{task_id}', {'completed': self.rng.random() < 0.5}, self.headers)[0]
+
+    def delete(self):
+        if not self.task_ids:
+            return self.create()
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        return self.transport.request('DELETE', f'/tasks/{task_id}', headers=self.headers)[0]
+
+
+def replay(transport, owned, mix, requests, concurrency, seed=0):
+    """Run ``requests`` operations drawn from ``mix`` across ``concurrency`` threads.
+
+    Returns ``(samples, elapsed)``, where each sample is
+    ``(operation, seconds, status)``.
+    """
+    names, weights = zip(*mix.items())
+    usernames = sorted(owned)
+    samples = []
+    lock = threading.Lock()
+    per_thread = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+
+    def run(index):
+        rng = random.Random(seed + index)
+        username = usernames[index % len(usernames)]
+        client = _Client(transport, username, owned[username], rng)
+        client.login()
+        local = []
+        for name in rng.choices(names, weights, k=per_thread[index]):
+            started = time.perf_counter()
+            status = getattr(client, name)()
+            local.append((name, time.perf_counter() - started, status))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
@@ -0,0 +1,87 @@
+"""Benchmark: POST /auth/login throughput at different hashing pool sizes.
+
+Each run drives the app with ``--clients`` concurrent threads for
+``--seconds`` and reports successful logins/sec, 503 fast-fails and
+median latency, using the production hash method unless overridden.
+
+    python -m benchmarks.login_throughput [--workers 1 2 4 8] [--clients 16]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+# Logins from many threads need a file database; config reads it at import time
+fd, DB_PATH = tempfile.mkstemp(suffix='.sqlite3')
+os.close(fd)
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+
+from app import create_app  # noqa: E402
+from app.extensions import db, hasher  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+def run(workers, args):
+    app = create_app('development')
+    app.config.update(
+        PASSWORD_HASH_METHOD=args.method,
+        PASSWORD_HASH_WORKERS=workers,
+        PASSWORD_HASH_QUEUE_SIZE=args.queue_size,
+    )
+    hasher.init_app(app)  # rebuild the pool from the overridden settings
+    with app.app_context():
+        db.create_all()
+        if not User.query.filter_by(username='bench').first():
+            user = User(username='bench')
+            user.set_password('bench-password')
+            db.session.add(user)
+            db.session.commit()
+
+    ok, busy, latencies = [0], [0], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def client_loop():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            res = client.post('/auth/login', json={'username': 'bench', 'password': 'bench-password'})
+            elapsed = time.perf_counter() - started
+            with lock:
+                if res.status_code == 200:
+                    ok[0] += 1
+                    latencies.append(elapsed)
+                elif res.status_code == 503:
+                    busy[0] += 1
+
+    threads = [threading.Thread(target=client_loop) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    median = statistics.median(latencies) * 1000 if latencies else float('nan')
+    print(f'{workers:>7}  {ok[0] / args.seconds:>10.1f}  {busy[0]:>8}  {median:>10.1f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--queue-size', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--method', default='scrypt:32768:8:1')
+    args = parser.parse_args(argv)
+
+    try:
+        print(f'{args.clients} clients, queue {args.queue_size}, method {args.method}')
+        print(f"{'workers':>7}  {'logins/s':>10}  {'503s':>8}  {'p50 ms':>10}")
+        for workers in args.workers:
+            run(workers, args)
+    finally:
+        os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: per-request cost of the /metrics instrumentation.
+
+Runs the same requests against an app with ``METRICS_ENABLED`` off and on,
+interleaved in short rounds so background noise lands on both sides, and
+compares the median round. The read cache is off so every request runs its
+SQL through the statement listeners. The test client has no network in the
+way, so the percentage is an upper bound on what a real server would see.
+
+    python -m benchmarks.metrics_overhead [--requests 200] [--rounds 30] [--tasks 50]
+"""
+import argparse
+import statistics
+import time
+import config
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models import User, Task
+
+PATHS = ('/tasks?per_page=20', '/tasks/{task_id}')
+
+
+def setup(enabled, tasks):
+    config.TestingConfig.METRICS_ENABLED = enabled
+    config.TestingConfig.CACHE_BACKEND = 'null'
+    app = create_app('testing', async_mode=False)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(Task(title=f'Task {n}', user_id=user.id) for n in range(tasks))
+        db.session.commit()
+        headers = {'Authorization': create_access_token(identity=str(user.id))}
+    return app, headers
+
+
+def round_trip(client, headers, path, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        client.get(path, headers=headers)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='requests per round')
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--tasks', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    apps = {enabled: setup(enabled, args.tasks) for enabled in (False, True)}
+    clients = {enabled: app.test_client() for enabled, (app, _) in apps.items()}
+    print(f'{args.rounds} rounds of {args.requests} requests per side, median round')
+    print(f"{'path':<20} {'off us/req':>11} {'on us/req':>10} {'overhead':>9}")
+    for template in PATHS:
+        path = template.format(task_id=1)
+        rounds = {False: [], True: []}
+        for n in range(args.rounds):
+            # swap the order every round so neither side always runs first
+            for enabled in ((False, True) if n % 2 else (True, False)):
+                headers = apps[enabled][1]
+                rounds[enabled].append(round_trip(clients[enabled], headers, path, args.requests))
+        off, on = statistics.median(rounds[False]), statistics.median(rounds[True])
+        print(f'{template:<20} {off:>11.1f} {on:>10.1f} {(on - off) / off:>9.1%}')
+
+if __name__ == '__main__':
+    main()
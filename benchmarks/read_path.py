@@ -0,0 +1,86 @@
+"""Benchmark: ORM instances vs Core rows for one page of GET /tasks.
+
+Both paths select the same page and serialize it with the compiled Task
+serializer, so the difference is the cost of materializing ORM objects
+(identity map, instance state, attribute instrumentation).
+
+    python -m benchmarks.read_path [--tasks 20000] [--per-page 100 1000] [--repeat 50]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from sqlalchemy import insert, select
+from app import create_app
+from app.extensions import db
+from app.models import User, Task
+from app.routes.tasks import TASK_COLUMNS
+from app.serializers import serialize_tasks
+
+
+def orm_page(per_page):
+    tasks = (Task.query.filter_by(user_id=1).order_by(Task.created_at, Task.id)
+             .limit(per_page).all())
+    body = serialize_tasks(tasks)
+    db.session.expunge_all()
+    return body
+
+
+def core_page(per_page):
+    rows = db.session.execute(
+        select(*TASK_COLUMNS).where(Task.user_id == 1)
+        .order_by(Task.created_at, Task.id).limit(per_page)
+    )
+    return serialize_tasks(rows)
+
+
+def measure(fn, per_page, repeat):
+    fn(per_page)  # warm up statement caches
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(per_page)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn(per_page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings) * 1000, peak / per_page
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--per-page', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+        db.session.execute(insert(Task), [
+            {'title': f'Task {i}', 'description': 'Benchmark task description ' * 4,
+             'completed': i % 2 == 0, 'user_id': user.id}
+            for i in range(args.tasks)
+        ])
+        db.session.commit()
+
+        print(f'{args.tasks} tasks, median of {args.repeat} runs')
+        print(f"{'per_page':>8}  {'path':<10} {'ms/page':>9} {'peak B/item':>12}")
+        for per_page in args.per_page:
+            results = {}
+            for name, fn in (('orm', orm_page), ('core', core_page)):
+                results[name] = measure(fn, per_page, args.repeat)
+                ms, per_item = results[name]
+                print(f'{per_page:>8}  {name:<10} {ms:>9.2f} {per_item:>12,.0f}')
+            speedup = results['orm'][0] / results['core'][0]
+            memory = results['orm'][1] / results['core'][1]
+            print(f'{"":>8}  core is {speedup:.1f}x faster and uses {memory:.1f}x less memory per item')
+
+
+if __name__ == '__main__':
+    main()
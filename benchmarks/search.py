@@ -0,0 +1,110 @@
+"""Benchmark: task search latency, FTS5 index vs a LIKE scan, at a million tasks.
+
+Seeds ``--tasks`` generated tasks across ``--users`` users into a SQLite file
+(the FTS5 triggers index them as they go), then runs the first page of
+``GET /tasks/search`` for one user with common, mid-frequency and rare words,
+one and two terms per query, through both backends.
+
+    python -m benchmarks.search [--tasks 1000000] [--users 10] [--queries 50] [--dir PATH]
+"""
+import argparse
+import itertools
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import config
+from sqlalchemy import insert
+from app import create_app
+from app.extensions import db, search
+from app.models import User, Task
+from app.routes.tasks import TASK_COLUMNS
+from app.search import BACKENDS
+
+SYLLABLES = ['ka', 'lo', 'mi', 're', 'su', 'ta', 'ne', 'vo', 'pi', 'dra', 'ck', 'ez', 'mon', 'tri', 'ul']
+BANDS = {'common': (0, 20), 'mid': (200, 600), 'rare': (3000, 5000)}
+
+
+def vocabulary(rng, size=5000):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def seed(app, args, words, rng):
+    # Zipf-like word frequencies, like natural text
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(User), [
+            {'username': f'searcher{n}', 'password_hash': 'x'} for n in range(args.users)
+        ])
+        user_ids = [user.id for user in User.query.all()]
+        started = time.perf_counter()
+        for start in range(0, args.tasks, 10000):
+            count = min(10000, args.tasks - start)
+            db.session.execute(insert(Task), [{
+                'title': ' '.join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(3, 6))),
+                'description': ' '.join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(10, 30))),
+                'user_id': user_ids[(start + n) % len(user_ids)],
+            } for n in range(count)])
+        db.session.commit()
+        return user_ids[0], time.perf_counter() - started
+
+
+def run_queries(app, backend, user_id, queries, limit):
+    app.extensions['search'] = BACKENDS[backend]
+    with app.app_context():
+        # Warm the page cache so the first query does not pay for reading the index in
+        db.session.execute(search.statement(TASK_COLUMNS, user_id, queries[0], None, limit + 1)).all()
+        latencies = []
+        for terms in queries:
+            started = time.perf_counter()
+            db.session.execute(search.statement(TASK_COLUMNS, user_id, terms, None, limit + 1)).all()
+            latencies.append(time.perf_counter() - started)
+        db.session.remove()
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=50, help='queries per band and term count')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--dir', help='where to create the database file')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    words = vocabulary(rng)
+    directory = tempfile.mkdtemp(dir=args.dir)
+    try:
+        uri = f'sqlite:///{directory}/search.sqlite3'
+        config.TestingConfig.SQLALCHEMY_DATABASE_URI = uri
+        config.TestingConfig.SQLALCHEMY_ENGINE_OPTIONS = config.engine_options(uri)
+        config.TestingConfig.SLOW_QUERY_MS = 0
+        app = create_app('testing', async_mode=False)
+        user_id, elapsed = seed(app, args, words, rng)
+        size = os.path.getsize(f'{directory}/search.sqlite3') / 2 ** 20
+        print(f'{args.tasks} tasks over {args.users} users seeded and indexed in {elapsed:.1f}s ({size:.0f} MiB); '
+              f'searching {args.tasks // args.users} tasks of one user, first page of {args.limit}')
+        print(f"{'band':<8} {'terms':>5} {'backend':<7} {'p50 ms':>9} {'p95 ms':>9}")
+        for band, (low, high) in BANDS.items():
+            for term_count in (1, 2):
+                queries = [rng.sample(words[low:high], term_count) for _ in range(args.queries)]
+                for backend in ('fts5', 'like'):
+                    latencies = run_queries(app, backend, user_id, queries, args.limit)
+                    cuts = statistics.quantiles(latencies, n=20)
+                    print(f'{band:<8} {term_count:>5} {backend:<7} '
+                          f'{statistics.median(latencies) * 1000:>9.2f} {cuts[18] * 1000:>9.2f}')
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark: TaskSchema.dump + stdlib json vs the compiled serializer + fast encoder.
+
+    python -m benchmarks.serialization [--count 100] [--seconds 1.0]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from app.models import Task
+from app.schemas import TaskSchema
+from app.serializers import serialize_tasks, dumps, orjson
+
+
+def make_tasks(count):
+    now = datetime.now(timezone.utc)
+    return [
+        Task(id=i, title=f'Task {i}', description='Benchmark task description ' * 4,
+             completed=i % 2 == 0, created_at=now, updated_at=now, user_id=1)
+        for i in range(count)
+    ]
+
+
+def objects_per_second(fn, tasks, seconds):
+    """Call ``fn(tasks)`` repeatedly for about ``seconds`` and return objects serialized per second."""
+    fn(tasks)  # warm up
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        fn(tasks)
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return calls * len(tasks) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100, help='objects per call (page size)')
+    parser.add_argument('--seconds', type=float, default=1.0, help='time budget per case')
+    args = parser.parse_args(argv)
+
+    tasks = make_tasks(args.count)
+    schema = TaskSchema(many=True)
+    cases = [
+        ('TaskSchema.dump', schema.dump),
+        ('compiled serializer', serialize_tasks),
+        ('TaskSchema.dump + json.dumps', lambda items: json.dumps(schema.dump(items), separators=(',', ':'))),
+        (f"compiled + {'orjson' if orjson else 'json'} dumps", lambda items: dumps(serialize_tasks(items))),
+    ]
+    print(f'{args.count} objects per call')
+    baseline = None
+    for name, fn in cases:
+        rate = objects_per_second(fn, tasks, args.seconds)
+        if baseline is None or name.startswith('TaskSchema'):
+            baseline = rate
+        print(f'{name:<34} {rate:>12,.0f} objects/sec  ({rate / baseline:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: gunicorn throughput by worker/thread layout.
+
+For each ``WORKERSxTHREADS`` layout, seeds a fresh SQLite file database,
+starts ``gunicorn -c gunicorn.conf.py run:app`` on it in production mode and
+replays the ``benchmarks.load`` request mix over HTTP, reporting req/s and
+latency percentiles. ``auto`` is the layout ``app.serving.worker_layout``
+picks for this machine. The load generator runs on the same machine and
+takes CPU from the server, so compare layouts with each other rather than
+with other hosts.
+
+    python -m benchmarks.serving [--layouts 1x1 1x4 2x1 2x4 auto] [--requests 3000] [--concurrency 16]
+"""
+import argparse
+import http.client
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import config
+from app import create_app
+from app.extensions import db
+from app.serving import CONFIG_FILE, worker_layout
+from .load.report import summarize
+from .load.seed import seed
+from .load.workload import parse_mix, replay, HTTPTransport
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = 'list=4,get=4,create=1,update=1'
+
+
+def parse_layout(text):
+    """``'2x4'`` -> ``(2, 4)``; ``'auto'`` -> :func:`worker_layout` for this machine."""
+    if text == 'auto':
+        return worker_layout()
+    workers, _, threads = text.partition('x')
+    return int(workers), int(threads or 1)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(uri, port, workers, threads, **settings):
+    """Start gunicorn on ``uri`` and wait until it answers; ``settings`` are extra environment variables."""
+    env = {
+        **os.environ, 'FLASK_ENV': 'production', 'DATABASE_URL': uri, 'BIND': f'127.0.0.1:{port}',
+        'WEB_CONCURRENCY': str(workers), 'WEB_THREADS': str(threads),
+        'SECRET_KEY': 'benchmark', 'JWT_SECRET_KEY': 'benchmark', **settings,
+    }
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', CONFIG_FILE, 'run:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with status {server.returncode}')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/')
+            if conn.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f'gunicorn did not start on port {port}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--layouts', nargs='+', default=['1x1', '1x4', '2x1', '2x4', 'auto'])
+    parser.add_argument('--users', type=int, default=16)
+    parser.add_argument('--tasks', type=int, default=200, help='tasks seeded per user')
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='operation=weight pairs')
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    print(f'{os.cpu_count()} CPUs, {args.requests} requests from {args.concurrency} clients, mix {args.mix}')
+    print(f"{'layout':<8} {'workers':>7} {'threads':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>6}")
+    for layout in args.layouts:
+        workers, threads = parse_layout(layout)
+        directory = tempfile.mkdtemp()
+        try:
+            uri = f'sqlite:///{directory}/serving.sqlite3'
+            config.TestingConfig.SQLALCHEMY_DATABASE_URI = uri
+            config.TestingConfig.SQLALCHEMY_ENGINE_OPTIONS = config.engine_options(uri)
+            app = create_app('testing', async_mode=False)
+            owned = seed(app, args.users, args.tasks)
+            with app.app_context():
+                db.engine.dispose()
+            port = free_port()
+            server = start_server(uri, port, workers, threads)
+            try:
+                samples, elapsed = replay(HTTPTransport(port), owned, mix, args.requests, args.concurrency)
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait()
+        finally:
+            shutil.rmtree(directory)
+        row = summarize(samples, elapsed, {})['overall']
+        print(f"{layout:<8} {workers:>7} {threads:>7} {row['throughput_rps']:>9.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['errors']:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark: concurrent reads and writes on SQLite with and without the pragma profile.
+
+Writer threads insert tasks (insert, counter update, commit) while reader
+threads run the list page query, against a fresh database file per run.
+``--http`` drives POST/GET /tasks through the test client instead, where
+per-request overhead hides most of the storage difference.
+"baseline" uses the rollback journal, no pragmas and pre-ping; "profile" uses
+the SQLITE_PRAGMAS/engine_options defaults from config.py.
+
+    python -m benchmarks.sqlite_profile [--writers 4] [--readers 8] [--seconds 5] [--http]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from sqlalchemy import insert
+import config
+from app import create_app
+from app.counters import adjust_task_counts
+from app.extensions import db
+from app.models import User, Task
+from app.routes.tasks import _task_rows_select
+from flask_jwt_extended import create_access_token
+
+
+def run(profile, args, directory):
+    uri = f"sqlite:///{os.path.join(directory, f'{profile}.sqlite3')}"
+    overrides = {'SQLALCHEMY_DATABASE_URI': uri, 'CACHE_BACKEND': 'null'}
+    if profile == 'baseline':
+        overrides.update(
+            SQLALCHEMY_ENGINE_OPTIONS={'pool_pre_ping': True, 'pool_recycle': 300},
+            SQLITE_PRAGMAS={}
+        )
+    else:
+        overrides['SQLALCHEMY_ENGINE_OPTIONS'] = config.engine_options(uri)
+    for name, value in overrides.items():
+        setattr(config.TestingConfig, name, value)
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        headers = {'Authorization': create_access_token(identity=str(user_id))}
+
+    counts = {'writes': 0, 'reads': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def http_op(client, kind):
+        if kind == 'writes':
+            return client.post('/tasks', json={'title': 'Benchmark task'}, headers=headers).status_code < 400
+        return client.get('/tasks?per_page=20', headers=headers).status_code < 400
+
+    def sql_op(client, kind):
+        if kind == 'writes':
+            db.session.execute(insert(Task), [{'title': 'Benchmark task', 'user_id': user_id}])
+            adjust_task_counts(user_id, total=1)
+            db.session.commit()
+        else:
+            db.session.execute(_task_rows_select(user_id).order_by(Task.created_at, Task.id).limit(20)).all()
+            db.session.commit()
+        return True
+
+    def worker(kind):
+        op = http_op if args.http else sql_op
+        client = app.test_client()
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                try:
+                    ok = op(client, kind)
+                except Exception:  # "database is locked" propagates in testing mode
+                    db.session.rollback()
+                    ok = False
+                with lock:
+                    counts[kind if ok else 'errors'] += 1
+
+    threads = [threading.Thread(target=worker, args=('writes',)) for _ in range(args.writers)]
+    threads += [threading.Thread(target=worker, args=('reads',)) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        db.engine.dispose()
+    print(f"{profile:<9} {counts['writes'] / args.seconds:>9.1f} {counts['reads'] / args.seconds:>9.1f} "
+          f"{counts['errors']:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--http', action='store_true', help='go through the routes')
+    parser.add_argument('--dir', help='where to create the database files (use a real disk, not tmpfs)')
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(dir=args.dir)
+    try:
+        print(f'{args.writers} writers, {args.readers} readers, {args.seconds:g}s per run')
+        print(f"{'profile':<9} {'writes/s':>9} {'reads/s':>9} {'errors':>7}")
+        for profile in ('baseline', 'profile'):
+            run(profile, args, directory)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: cold start, import time and time to first response.
+
+Starts fresh interpreters that import the app, build it with
+``create_app`` and answer one health check through the test client,
+reporting each phase and the wall time from process start to the first
+response (best and median of ``--runs``). Exits with status 1 when the
+best run is over ``BUDGET_MS``; ``tests/test_startup.py`` enforces the same
+budget.
+
+    python -m benchmarks.startup [--runs 5] [--config testing] [--no-swagger-ui]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Generous for one slow CPU; a regression like importing Alembic again adds ~0.2 s
+BUDGET_MS = {'import_ms': 1500, 'first_response_ms': 2500}
+# Only needed by the CLI, or when enabled; serving must not import them
+LAZY_MODULES = ('flask_migrate', 'alembic', 'flask_swagger_ui')
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app(sys.argv[1])
+created = time.perf_counter()
+assert app.test_client().get('/').status_code == 200
+responded = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_ms': (created - imported) * 1000,
+    'request_ms': (responded - created) * 1000,
+    'lazy_loaded': sorted(name for name in %r if name in sys.modules),
+}))
+""" % (LAZY_MODULES,)
+
+
+def measure(config_name='testing', swagger_ui=True):
+    """One cold start in a fresh interpreter; returns the phase timings in ms."""
+    env = {**os.environ, 'SWAGGER_UI_ENABLED': 'true' if swagger_ui else 'false'}
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, config_name], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    # From process start, so interpreter startup counts too
+    result['first_response_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def over_budget(result):
+    return [name for name, budget in BUDGET_MS.items() if result[name] > budget]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--config', default='testing')
+    parser.add_argument('--no-swagger-ui', action='store_true', help='start with SWAGGER_UI_ENABLED off')
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.config, not args.no_swagger_ui) for _ in range(args.runs)]
+    best = {name: min(run[name] for run in runs) for name in runs[0] if name.endswith('_ms')}
+    loaded = ', '.join(runs[0]['lazy_loaded']) or 'none'
+    print(f'{args.runs} cold starts, config {args.config!r}; optional modules loaded: {loaded}')
+    print(f"{'phase':<18} {'best ms':>8} {'median ms':>10} {'budget ms':>10}")
+    for name in best:
+        median = statistics.median(run[name] for run in runs)
+        print(f"{name:<18} {best[name]:>8.0f} {median:>10.0f} {BUDGET_MS.get(name, ''):>10}")
+    failures = over_budget(best)
+    if failures:
+        print(f"over budget: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,19 @@
 import os
 from datetime import timedelta
+from sqlalchemy.pool import QueuePool
+
+def engine_options(uri):
+    """SQLAlchemy engine options suited to the database behind ``uri``."""
+    if uri and uri.startswith('sqlite'):
+        if ':memory:' in uri or 'mode=memory' in uri or uri.rstrip('/') == 'sqlite:':
+            return {}  # Flask-SQLAlchemy pins in-memory databases to a single connection
+        # A local file has no server connection to drop, so no pre-ping or recycling;
+        # pooled connections keep their pragmas and page cache warm between requests
+        return {'poolclass': QueuePool, 'pool_size': 10, 'max_overflow': 10}
+    return {
+        'pool_pre_ping': True,
+        'pool_recycle': 300,
+    }
 
 class Config:
     """Application configuration class."""
@@ -10,17 +24,65 @@ class Config:
     # Database settings
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Read replicas (comma-separated URLs) become binds replica_0, replica_1, ...;
+    # GET requests read from them, and a user who just wrote reads from the
+    # primary for REPLICA_STICKY_SECONDS while the replicas catch up
+    SQLALCHEMY_BINDS = {
+        f'replica_{index}': {'url': url, **engine_options(url)}
+        for index, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(',')))
+    }
+    SQLALCHEMY_READ_REPLICAS = list(SQLALCHEMY_BINDS)
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    # Applied to every new SQLite connection (see app/sqlite_profile.py): WAL lets
+    # readers run alongside a writer, NORMAL sync is durable at checkpoints in WAL
+    # mode, and writers wait up to busy_timeout ms for the lock instead of failing
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,  # negative means KiB, i.e. ~64 MB
+        'temp_store': 'MEMORY',
     }
     
+    # Group commit: single-task writes from concurrent requests are committed
+    # together by one writer thread, after a window or once a batch fills up
+    GROUP_COMMIT = os.environ.get('GROUP_COMMIT', '').lower() in ('1', 'true', 'yes')
+    GROUP_COMMIT_WINDOW_MS = float(os.environ.get('GROUP_COMMIT_WINDOW_MS', 2))
+    GROUP_COMMIT_MAX_BATCH = int(os.environ.get('GROUP_COMMIT_MAX_BATCH', 64))
+    
+    # Async mode: async task/auth handlers on an async engine (aiosqlite,
+    # asyncpg, ...) for the same database. Pool async connections only when
+    # every request shares one event loop, i.e. when served through asgi.py
+    ASYNC_MODE = os.environ.get('ASYNC_MODE', '').lower() in ('1', 'true', 'yes')
+    ASYNC_SQLALCHEMY_POOLED = os.environ.get('ASYNC_SQLALCHEMY_POOLED', '').lower() in ('1', 'true', 'yes')
+    ASYNC_SQLALCHEMY_ENGINE_OPTIONS = {}
+    
     # JWT settings - configured for direct token usage (no Bearer prefix)
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = ''  # Empty string means no prefix required
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # Remember verified token claims until the token expires, skipping the
+    # decode and signature check on repeat requests with the same token
+    JWT_CLAIMS_CACHE = os.environ.get('JWT_CLAIMS_CACHE', '').lower() in ('1', 'true', 'yes')
+    JWT_CLAIMS_CACHE_MAX_ENTRIES = int(os.environ.get('JWT_CLAIMS_CACHE_MAX_ENTRIES', 10000))
+
+    # Interactive docs at /swagger/; /static/swagger.json is served either way
+    SWAGGER_UI_ENABLED = os.environ.get('SWAGGER_UI_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # Request/SQL instrumentation served at /metrics in Prometheus text format
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # Views declare their most SQL statements per request with @query_budget;
+    # going over logs a warning, or fails the request when enforced
+    QUERY_BUDGET_ENFORCE = os.environ.get('QUERY_BUDGET_ENFORCE', '').lower() in ('1', 'true', 'yes')
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 200))  # log slower statements, 0 = off
+
+    # Backend for GET /tasks/search: 'fts5' (SQLite) or 'like'; unset picks by database
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND')
     
     # API settings
     API_TITLE = 'Task Manager API'
@@ -30,6 +92,59 @@ class Config:
     DEFAULT_PAGE_SIZE = 10
     MAX_PAGE_SIZE = 100
 
+    # Bulk task endpoints (/tasks/bulk): maximum items per request
+    BULK_MAX_BATCH_SIZE = int(os.environ.get('BULK_MAX_BATCH_SIZE', 500))
+
+    # Delta sync (/tasks/changes): deleted task ids are kept this many days
+    # (purged by `flask tasks purge-tombstones`); older checkpoints get 410.
+    # Writes newer than SYNC_SETTLE_SECONDS wait for the next sync, so a
+    # checkpoint never passes a write that has not committed yet.
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    SYNC_SETTLE_SECONDS = float(os.environ.get('SYNC_SETTLE_SECONDS', 1))
+
+    # Rows fetched per server-side cursor batch by /tasks/export
+    EXPORT_BATCH_SIZE = 1000
+
+    # Task import (/tasks/import and `flask tasks import`): rows per commit and
+    # how many rejected lines to echo back in the report
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    IMPORT_MAX_ERROR_SAMPLES = 20
+
+    # Per-user read cache for task reads: 'shared' (uses CACHE_SHARED_CLIENT,
+    # e.g. a redis.Redis instance), 'lru' (in-process: only safe with a single
+    # worker process, since a write invalidates the worker that handled it) or
+    # 'null' to disable. Unset means 'shared' when a client is configured,
+    # otherwise 'null'
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND')
+    CACHE_SHARED_CLIENT = None
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 10000))
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 60))
+
+    # Server-sent task events (/tasks/stream): 'local' fans out within this
+    # process, 'shared' relays through EVENTS_SHARED_CLIENT (e.g. a redis.Redis
+    # instance) so streams on every worker see every write. Unset means
+    # 'shared' when a client is configured, otherwise 'local'
+    EVENTS_BACKEND = os.environ.get('EVENTS_BACKEND')
+    EVENTS_SHARED_CLIENT = None
+    EVENTS_BUFFER_SIZE = int(os.environ.get('EVENTS_BUFFER_SIZE', 100))  # undelivered events before a stream is dropped
+    EVENTS_HISTORY_SIZE = int(os.environ.get('EVENTS_HISTORY_SIZE', 1000))  # recent events kept for Last-Event-ID
+    EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('EVENTS_HEARTBEAT_SECONDS', 15))
+    # Open streams per process before new ones get 503 (unset: no limit, but
+    # gunicorn's threaded workers keep half their threads for other requests)
+    EVENTS_MAX_STREAMS = int(os.environ['EVENTS_MAX_STREAMS']) if os.environ.get('EVENTS_MAX_STREAMS') else None
+    EVENTS_RETRY_AFTER = int(os.environ.get('EVENTS_RETRY_AFTER', 5))
+
+    # Password hashing: werkzeug method string (algorithm and cost) and the
+    # bounded pool that runs the KDF off the request thread. Logins re-hash
+    # stored passwords whose method differs from PASSWORD_HASH_METHOD.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_SALT_LENGTH = 16
+    PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR', 'thread')  # or 'process'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 16))
+    PASSWORD_HASH_TIMEOUT = None  # seconds to wait for a queued hash before answering 503
+    PASSWORD_HASH_RETRY_AFTER = 1  # Retry-After seconds sent with 503
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -46,13 +161,18 @@ class ProductionConfig(Config):
     
     # Production database
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
 
 
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'  # cheap hashes keep the suite fast
+    QUERY_BUDGET_ENFORCE = True
+    SYNC_SETTLE_SECONDS = 0
 
 
 # Configuration dictionary
@@ -0,0 +1,45 @@
+"""
+Gunicorn settings for production
+
+    gunicorn -c gunicorn.conf.py run:app
+    FLASK_ENV=production python run.py    # the same, through app.serving.serve
+
+The master builds the app once (preload), checks that nothing it keeps in
+process memory would go stale across the workers, and forks them from it.
+Each worker drops the database connections it inherited right after the
+fork and caps its open /tasks/stream connections to half its threads.
+Send the master SIGHUP to replace the workers gracefully with
+re-read settings, or SIGUSR2 then SIGQUIT to the old master to deploy new
+code (see README, Deployment).
+"""
+
+import os
+from app.serving import worker_layout, check_workers, dispose_engines, limit_streams
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers, threads = worker_layout()
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = True
+
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+# On SIGHUP/SIGTERM workers stop accepting and get this long to finish in-flight requests
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+# Recycle workers every N requests (0 = never), staggered so they do not all restart at once
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+pidfile = os.environ.get('PIDFILE')
+accesslog = os.environ.get('ACCESS_LOG')
+
+
+def on_starting(server):
+    # Fail before forking rather than serve stale data from per-process caches
+    for warning in check_workers(server.app.wsgi(), server.cfg.workers):
+        server.log.warning(warning)
+
+
+def post_fork(server, worker):
+    app = server.app.wsgi()
+    # Connections opened while preloading belong to the master
+    dispose_engines(app)
+    limit_streams(app, server.cfg.worker_class_str, server.cfg.threads)
@@ -0,0 +1,46 @@
+"""add task_tombstone table for /tasks/changes and extend the updated_at index with id
+
+Revision ID: 569f68751952
+Revises: c4a91e7b2f18
+Create Date: 2026-10-17 00:41:14.850358
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '569f68751952'
+down_revision = 'c4a91e7b2f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_tombstone',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.create_index('ix_task_tombstone_user_id_deleted_at', ['user_id', 'deleted_at', 'id'], unique=False)
+
+    # id breaks updated_at ties in the (updated_at, id) order /tasks/changes pages on
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task_user_id_updated_at'))
+        batch_op.create_index('ix_task_user_id_updated_at', ['user_id', 'updated_at', 'id'], unique=False)
+
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_id_updated_at')
+        batch_op.create_index(batch_op.f('ix_task_user_id_updated_at'), ['user_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('task_tombstone', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_tombstone_user_id_deleted_at')
+
+    op.drop_table('task_tombstone')
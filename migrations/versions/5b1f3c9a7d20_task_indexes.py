@@ -0,0 +1,30 @@
+"""add task indexes for user-scoped access patterns
+
+Revision ID: 5b1f3c9a7d20
+Revises: 24659a2e81cb
+Create Date: 2026-10-16 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1f3c9a7d20'
+down_revision = '24659a2e81cb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_id_created_at', ['user_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_task_user_id_completed_created_at', ['user_id', 'completed', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_task_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_id_updated_at')
+        batch_op.drop_index('ix_task_user_id_completed_created_at')
+        batch_op.drop_index('ix_task_user_id_created_at')
@@ -0,0 +1,45 @@
+"""add task_counter table with per-user totals
+
+Revision ID: 8e4d2a61c0f3
+Revises: 5b1f3c9a7d20
+Create Date: 2026-10-16 14:37:05.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d2a61c0f3'
+down_revision = '5b1f3c9a7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_counter',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('open', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_id_completed_updated_at', ['user_id', 'completed', 'updated_at'], unique=False)
+
+    # Backfill counters for existing users
+    op.execute(
+        "INSERT INTO task_counter (user_id, total, completed, open) "
+        "SELECT u.id, COUNT(t.id), "
+        "COALESCE(SUM(CASE WHEN t.completed THEN 1 ELSE 0 END), 0), "
+        "COUNT(t.id) - COALESCE(SUM(CASE WHEN t.completed THEN 1 ELSE 0 END), 0) "
+        "FROM \"user\" u LEFT OUTER JOIN task t ON t.user_id = u.id GROUP BY u.id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_id_completed_updated_at')
+
+    op.drop_table('task_counter')
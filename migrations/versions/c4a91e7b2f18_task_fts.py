@@ -0,0 +1,51 @@
+"""add task_fts full-text index (SQLite FTS5) kept in sync by triggers
+
+Revision ID: c4a91e7b2f18
+Revises: 8e4d2a61c0f3
+Create Date: 2026-10-17 00:25:41.318204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a91e7b2f18'
+down_revision = '8e4d2a61c0f3'
+branch_labels = None
+depends_on = None
+
+# Same statements as app/search.py FTS5_DDL, frozen at this revision
+FTS5_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "title, description, user_id, content='task', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description, user_id) "
+    "VALUES (new.id, new.title, new.description, new.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description, user_id ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description, user_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.user_id); "
+    "INSERT INTO task_fts(rowid, title, description, user_id) "
+    "VALUES (new.id, new.title, new.description, new.user_id); END",
+)
+
+
+def upgrade():
+    # Other databases search with the LIKE backend until they get their own index
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in FTS5_DDL:
+        op.execute(statement)
+    # Index the tasks that already exist
+    op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ('task_fts_ai', 'task_fts_ad', 'task_fts_au'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS task_fts')
@@ -3,7 +3,9 @@
 Task Manager API Application Entry Point
 
 This module starts the Flask application for the Task Manager API.
-It can be run directly for development or used with a WSGI server for production.
+It runs the development server, or with FLASK_ENV=production serves the app
+under gunicorn with the settings in gunicorn.conf.py (preloaded, pre-fork
+workers). WSGI servers can also import `app` from here directly.
 """
 
 import os
@@ -15,7 +17,10 @@ config_name = os.environ.get('FLASK_ENV', 'development')
 # Create application instance
 app = create_app()
 
-if __name__ == '__main__':
+if __name__ == '__main__' and config_name == 'production':
+    from app.serving import serve
+    serve(app)
+elif __name__ == '__main__':
     # Development server
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
@@ -66,3 +66,73 @@ def test_error_handlers():
     data = response.get_json()
     assert 'error' in data
     assert data['error'] == 'Resource not found'
+
+def test_engine_options_by_database():
+    """SQLite files get a plain connection pool; server databases keep pre-ping."""
+    from sqlalchemy.pool import QueuePool
+    from config import engine_options
+    assert engine_options('sqlite:///db.sqlite3') == {'poolclass': QueuePool, 'pool_size': 10, 'max_overflow': 10}
+    assert engine_options('sqlite:///:memory:') == {}
+    assert engine_options('postgresql://u:p@db/tasks')['pool_pre_ping'] is True
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path, monkeypatch):
+    """Every new SQLite connection gets the SQLITE_PRAGMAS profile."""
+    from config import TestingConfig, engine_options
+    from app.extensions import db
+    uri = f"sqlite:///{tmp_path / 'profile.sqlite3'}"
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', uri)
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', engine_options(uri))
+    app = create_app('testing')
+    with app.app_context():
+        with db.engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f'PRAGMA {name}').scalar()
+            assert pragma('journal_mode') == 'wal'
+            assert pragma('synchronous') == 1  # NORMAL
+            assert pragma('busy_timeout') == 5000
+            assert pragma('temp_store') == 2  # MEMORY
+        db.engine.dispose()
+
+def test_swagger_spec_served_from_memory():
+    """swagger.json comes with an ETag and max-age, and revalidates to 304."""
+    app = create_app()
+    client = app.test_client()
+    response = client.get('/static/swagger.json')
+    assert response.status_code == 200
+    with open(f'{app.static_folder}/swagger.json', 'rb') as spec:
+        assert response.data == spec.read()
+    assert response.cache_control.public and response.cache_control.max_age == 3600
+    etag = response.headers['ETag']
+    response = client.get('/static/swagger.json', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+def test_swagger_spec_documents_every_route():
+    """Each /auth and /tasks endpoint has an operation in swagger.json."""
+    import json
+    app = create_app('testing')
+    with open(f'{app.static_folder}/swagger.json') as spec:
+        paths = json.load(spec)['paths']
+    for rule in app.url_map.iter_rules():
+        if rule.rule.startswith(('/auth', '/tasks')):
+            path = rule.rule.replace('<int:task_id>', '{id}')
+            for method in rule.methods - {'HEAD', 'OPTIONS'}:
+                assert method.lower() in paths.get(path, {}), f'{method} {path}'
+
+def test_swagger_ui_can_be_disabled(monkeypatch):
+    """Without the UI the docs page is gone but the spec is still served."""
+    from config import TestingConfig
+    monkeypatch.setattr(TestingConfig, 'SWAGGER_UI_ENABLED', False)
+    app = create_app('testing')
+    client = app.test_client()
+    assert 'swagger_ui' not in app.blueprints
+    assert client.get('/swagger/').status_code == 404
+    assert client.get('/static/swagger.json').status_code == 200
+
+def test_migrate_registered_for_cli_only():
+    """Flask-Migrate and the `flask db` group are only set up under a flask command."""
+    import click
+    assert 'migrate' not in create_app('testing').extensions
+    with click.Context(click.Command('flask')):
+        app = create_app('testing')
+    assert 'migrate' in app.extensions
+    assert 'db' in app.cli.commands
@@ -0,0 +1,70 @@
+import inspect
+import unittest
+from app import create_app
+from app.async_db import to_async_url
+from app.extensions import db, adb
+
+
+class AsyncModeTestCase(unittest.TestCase):
+    """The async blueprints against the shared in-memory database.
+
+    The whole suite also runs in async mode with ``ASYNC_MODE=1 python -m pytest``.
+    """
+
+    def setUp(self):
+        self.app = create_app('testing', async_mode=True)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _login(self):
+        self.client.post('/auth/register', json={'username': 'async', 'password': 'pw'})
+        res = self.client.post('/auth/login', json={'username': 'async', 'password': 'pw'})
+        self.assertEqual(res.status_code, 200)
+        return {'Authorization': res.get_json()['access_token']}
+
+    def test_routes_are_async_and_use_async_engine(self):
+        self.assertTrue(self.client.get('/').get_json()['async_mode'])
+        self.assertTrue(inspect.iscoroutinefunction(self.app.view_functions['tasks.get_tasks'].__wrapped__))
+        with self.app.app_context():
+            self.assertEqual(adb.engine.url.drivername, 'sqlite+aiosqlite')
+            self.assertEqual(adb.engine.url.database, db.engine.url.database)
+
+    def test_task_lifecycle(self):
+        headers = self._login()
+        res = self.client.post('/tasks', json={'title': 'Async'}, headers=headers)
+        self.assertEqual(res.status_code, 201)
+        task_id = res.get_json()['id']
+        res = self.client.put(f'/tasks/{task_id}', json={'completed': True}, headers=headers)
+        self.assertTrue(res.get_json()['completed'])
+        data = self.client.get('/tasks', headers=headers).get_json()
+        self.assertEqual((data['total'], data['tasks'][0]['title']), (1, 'Async'))
+        self.assertEqual(self.client.get('/tasks/stats', headers=headers).get_json(),
+                         {'total': 1, 'completed': 1, 'open': 0})
+        # Export is shared with the sync blueprint and reads through db.session
+        export = self.client.get('/tasks/export', headers=headers).get_data(as_text=True)
+        self.assertIn('"title":"Async"', export)
+        self.assertEqual(self.client.delete(f'/tasks/{task_id}', headers=headers).status_code, 200)
+        self.assertEqual(self.client.get(f'/tasks/{task_id}', headers=headers).status_code, 404)
+
+    def test_sync_mode_has_no_async_engine(self):
+        app = create_app('testing', async_mode=False)
+        self.assertFalse(inspect.iscoroutinefunction(app.view_functions['tasks.get_tasks'].__wrapped__))
+        with app.app_context():
+            with self.assertRaises(RuntimeError):
+                adb.session()
+
+    def test_to_async_url(self):
+        self.assertEqual(to_async_url('sqlite:///db.sqlite3').drivername, 'sqlite+aiosqlite')
+        self.assertEqual(to_async_url('postgresql://u:p@h/db').drivername, 'postgresql+asyncpg')
+        with self.assertRaises(ValueError):
+            to_async_url('oracle://h/db')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
+import threading
 import unittest
 from app import create_app
-from app.extensions import db
+from app.extensions import db, hasher
 from app.models import User
 
 class AuthTestCase(unittest.TestCase):
@@ -83,5 +84,51 @@ class AuthTestCase(unittest.TestCase):
         self.assertEqual(res.status_code, 200)
         self.assertIn('access_token', res.get_json())
 
+    def test_login_rehashes_outdated_password_hash(self):
+        self.client.post('/auth/register', json={'username': 'legacy', 'password': 'legacypass'})
+        with self.app.app_context():
+            old_hash = User.query.filter_by(username='legacy').first().password_hash
+        self.app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:2000'
+        res = self.client.post('/auth/login', json={'username': 'legacy', 'password': 'legacypass'})
+        self.assertEqual(res.status_code, 200)
+        with self.app.app_context():
+            new_hash = User.query.filter_by(username='legacy').first().password_hash
+        self.assertTrue(old_hash.startswith('pbkdf2:sha256:1000$'))
+        self.assertTrue(new_hash.startswith('pbkdf2:sha256:2000$'))
+        # The upgraded hash still verifies and is not rewritten again
+        res = self.client.post('/auth/login', json={'username': 'legacy', 'password': 'legacypass'})
+        self.assertEqual(res.status_code, 200)
+        with self.app.app_context():
+            self.assertEqual(User.query.filter_by(username='legacy').first().password_hash, new_hash)
+
+    def test_saturated_hashing_pool_returns_503(self):
+        app = create_app('testing')
+        app.config['PASSWORD_HASH_WORKERS'] = 1
+        app.config['PASSWORD_HASH_QUEUE_SIZE'] = 0
+        hasher.init_app(app)
+        client = app.test_client()
+        with app.app_context():
+            db.create_all()
+        started, release = threading.Event(), threading.Event()
+
+        def occupy_worker():
+            started.set()
+            release.wait()
+
+        worker = threading.Thread(target=app.extensions['password_hasher'].run, args=(occupy_worker,))
+        worker.start()
+        started.wait()
+        try:
+            res = client.post('/auth/register', json={'username': 'busy', 'password': 'busypass'})
+            self.assertEqual(res.status_code, 503)
+            self.assertEqual(res.headers['Retry-After'], '1')
+        finally:
+            release.set()
+            worker.join()
+        res = client.post('/auth/register', json={'username': 'busy', 'password': 'busypass'})
+        self.assertEqual(res.status_code, 201)
+        with app.app_context():
+            db.drop_all()
+
 if __name__ == '__main__':
     unittest.main()
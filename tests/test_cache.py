@@ -0,0 +1,182 @@
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import TestingConfig, engine_options
+from app import create_app
+from app.cache import LRUCache, SharedCache, LocalSharedClient
+from app.extensions import db, cache
+from app.models import User
+from flask_jwt_extended import create_access_token
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    def test_eviction_and_counters(self):
+        lru = LRUCache(max_entries=2)
+        lru.set('a', 1, ttl=60)
+        lru.set('b', 2, ttl=60)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3, ttl=60)  # evicts 'b', the least recently used
+        self.assertIsNone(lru.get('b'))
+        stats = lru.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (1, 1, 1))
+        self.assertEqual(stats['entries'], 2)
+
+    def test_ttl_expiry(self):
+        lru = LRUCache()
+        lru.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(lru.stats()['expirations'], 1)
+
+    def test_generations_survive_eviction(self):
+        lru = LRUCache(max_entries=1)
+        lru.incr_generation('gen:1')
+        lru.set('x', 1, ttl=60)
+        lru.set('y', 2, ttl=60)
+        self.assertEqual(lru.get_generation('gen:1'), 1)
+
+
+class SharedCacheTestCase(unittest.TestCase):
+    def test_shared_backend_with_local_client(self):
+        client = LocalSharedClient()
+        first, second = SharedCache(client), SharedCache(client)
+        first.set('k', {'body': [1, 2]}, ttl=60)
+        self.assertEqual(second.get('k'), {'body': [1, 2]})
+        first.incr_generation('gen:7')
+        self.assertEqual(second.get_generation('gen:7'), 1)
+        self.assertEqual(second.stats()['hits'], 1)
+
+
+class TaskCacheTestCase(unittest.TestCase):
+    backend = {'CACHE_BACKEND': 'lru'}
+
+    def setUp(self):
+        with mock.patch.multiple(TestingConfig, **self.backend):
+            self.app = create_app('testing')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(username='cacheuser')
+            user.set_password('pw')
+            db.session.add(user)
+            db.session.commit()
+            self.headers = {'Authorization': create_access_token(identity=str(user.id))}
+        self.queries = 0
+        # Listen on every Engine so async mode's engine is counted as well
+        event.listen(Engine, 'before_cursor_execute', self._count)
+
+    def tearDown(self):
+        event.remove(Engine, 'before_cursor_execute', self._count)
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _count(self, *args):
+        self.queries += 1
+
+    def _queries_for(self, path, headers=None):
+        self.queries = 0
+        res = self.client.get(path, headers=headers or self.headers)
+        return res, self.queries
+
+    def test_repeat_reads_served_from_cache(self):
+        res = self.client.post('/tasks', json={'title': 'Cached'}, headers=self.headers)
+        task_id = res.get_json()['id']
+        for path in ('/tasks?per_page=5', f'/tasks/{task_id}'):
+            first, queries = self._queries_for(path)
+            self.assertGreater(queries, 0)
+            second, queries = self._queries_for(path)
+            self.assertEqual(queries, 0)
+            self.assertEqual(second.get_json(), first.get_json())
+            self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+            res, queries = self._queries_for(path, {**self.headers, 'If-None-Match': first.headers['ETag']})
+            self.assertEqual((res.status_code, queries), (304, 0))
+        with self.app.app_context():
+            self.assertGreaterEqual(cache.stats()['hits'], 4)
+
+    def test_writes_invalidate_user_entries(self):
+        res = self.client.post('/tasks', json={'title': 'Before'}, headers=self.headers)
+        task_id = res.get_json()['id']
+        self.client.get('/tasks', headers=self.headers)
+        self.client.get(f'/tasks/{task_id}', headers=self.headers)
+        self.client.put(f'/tasks/{task_id}', json={'title': 'After'}, headers=self.headers)
+        self.assertEqual(self.client.get(f'/tasks/{task_id}', headers=self.headers).get_json()['title'], 'After')
+        self.assertEqual(self.client.get('/tasks', headers=self.headers).get_json()['tasks'][0]['title'], 'After')
+        self.client.delete(f'/tasks/{task_id}', headers=self.headers)
+        self.assertEqual(self.client.get(f'/tasks/{task_id}', headers=self.headers).status_code, 404)
+        self.assertEqual(self.client.get('/tasks', headers=self.headers).get_json()['total'], 0)
+        self.client.post('/tasks/bulk', json={'tasks': [{'title': 'Bulk'}]}, headers=self.headers)
+        self.assertEqual(self.client.get('/tasks', headers=self.headers).get_json()['total'], 1)
+
+    def test_entries_are_scoped_per_user(self):
+        with self.app.app_context():
+            other = User(username='other')
+            other.set_password('pw')
+            db.session.add(other)
+            db.session.commit()
+            other_headers = {'Authorization': create_access_token(identity=str(other.id))}
+        self.client.post('/tasks', json={'title': 'Mine'}, headers=self.headers)
+        self.assertEqual(self.client.get('/tasks', headers=self.headers).get_json()['total'], 1)
+        self.assertEqual(self.client.get('/tasks', headers=other_headers).get_json()['total'], 0)
+
+    def test_null_backend_disables_caching(self):
+        self.app.config['CACHE_BACKEND'] = 'null'
+        cache.init_app(self.app)
+        self.client.get('/tasks', headers=self.headers)
+        _, queries = self._queries_for('/tasks')
+        self.assertGreater(queries, 0)
+
+
+class SharedTaskCacheTestCase(TaskCacheTestCase):
+    def setUp(self):
+        # A fresh client per test, as entries would outlive the in-memory database
+        self.backend = {'CACHE_BACKEND': None, 'CACHE_SHARED_CLIENT': LocalSharedClient()}
+        super().setUp()
+
+    def test_shared_backend_is_used(self):
+        self.assertEqual(self.client.get('/').get_json()['cache']['backend'], 'shared')
+
+
+class CacheBackendConfigTestCase(unittest.TestCase):
+    def test_default_is_null_without_a_shared_client(self):
+        self.assertEqual(create_app('testing').extensions['task_cache'].stats()['backend'], 'null')
+
+    def test_shared_needs_a_client(self):
+        with mock.patch.multiple(TestingConfig, CACHE_BACKEND='shared', CACHE_SHARED_CLIENT=None):
+            with self.assertRaises(ValueError):
+                create_app('testing')
+
+    def test_writes_invalidate_other_workers(self):
+        # Two workers: two app instances on one database file and one shared client
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        uri = f'sqlite:///{directory}/workers.sqlite3'
+        with mock.patch.multiple(TestingConfig, SQLALCHEMY_DATABASE_URI=uri,
+                                 SQLALCHEMY_ENGINE_OPTIONS=engine_options(uri),
+                                 CACHE_BACKEND=None, CACHE_SHARED_CLIENT=LocalSharedClient()):
+            first, second = create_app('testing'), create_app('testing')
+        with first.app_context():
+            db.create_all()
+            user = User(username='worker')
+            user.set_password('pw')
+            db.session.add(user)
+            db.session.commit()
+            headers = {'Authorization': create_access_token(identity=str(user.id))}
+        for app in (first, second):
+            with app.app_context():
+                self.addCleanup(db.engine.dispose)
+        a, b = first.test_client(), second.test_client()
+        task_id = a.post('/tasks', json={'title': 'Before'}, headers=headers).get_json()['id']
+        self.assertEqual(b.get(f'/tasks/{task_id}', headers=headers).get_json()['title'], 'Before')
+        a.put(f'/tasks/{task_id}', json={'title': 'After'}, headers=headers)
+        self.assertEqual(b.get(f'/tasks/{task_id}', headers=headers).get_json()['title'], 'After')
+        a.delete(f'/tasks/{task_id}', headers=headers)
+        self.assertEqual(b.get(f'/tasks/{task_id}', headers=headers).status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
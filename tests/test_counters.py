@@ -0,0 +1,93 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.models import User, TaskCounter
+from app.counters import get_task_counts, rebuild_task_counts
+from flask_jwt_extended import create_access_token
+
+
+class TaskCounterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(username='counter')
+            user.set_password('pw')
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+            self.headers = {'Authorization': create_access_token(identity=str(user.id))}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _stats(self):
+        res = self.client.get('/tasks/stats', headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        return res.get_json()
+
+    def _assert_matches_rebuild(self):
+        with self.app.app_context():
+            maintained = get_task_counts(self.user_id)
+            rebuild_task_counts(self.user_id)
+            self.assertEqual(maintained, get_task_counts(self.user_id))
+            db.session.rollback()
+
+    def test_counters_follow_every_write_path(self):
+        self.assertEqual(self._stats(), {'total': 0, 'completed': 0, 'open': 0})
+        ids = [self.client.post('/tasks', json={'title': f'T{i}'}, headers=self.headers).get_json()['id']
+               for i in range(3)]
+        self.client.put(f'/tasks/{ids[0]}', json={'completed': True}, headers=self.headers)
+        self.client.put(f'/tasks/{ids[0]}', json={'completed': True}, headers=self.headers)
+        self.assertEqual(self._stats(), {'total': 3, 'completed': 1, 'open': 2})
+        self.client.delete(f'/tasks/{ids[0]}', headers=self.headers)
+        self.assertEqual(self._stats(), {'total': 2, 'completed': 0, 'open': 2})
+        res = self.client.post('/tasks/bulk', json={'tasks': [{'title': 'B1'}, {'title': 'B2'}]},
+                               headers=self.headers)
+        bulk_ids = [r['task']['id'] for r in res.get_json()['results']]
+        self.client.put('/tasks/bulk', json={'tasks': [
+            {'id': bulk_ids[0], 'completed': True}, {'id': bulk_ids[1], 'completed': True},
+            {'id': bulk_ids[1], 'completed': False}]}, headers=self.headers)
+        self.assertEqual(self._stats(), {'total': 4, 'completed': 1, 'open': 3})
+        self.client.delete('/tasks/bulk', json={'ids': bulk_ids}, headers=self.headers)
+        body = '{"title": "I1", "completed": true}\n{"title": "I2"}\n'
+        self.client.post('/tasks/import', data=body, content_type='application/x-ndjson', headers=self.headers)
+        self.assertEqual(self._stats(), {'total': 4, 'completed': 1, 'open': 3})
+        self._assert_matches_rebuild()
+
+    def test_list_totals_read_from_counters(self):
+        for i in range(3):
+            self.client.post('/tasks', json={'title': f'T{i}'}, headers=self.headers)
+        with self.app.app_context():
+            # Skew the counter to prove list totals come from it, not from COUNT(*)
+            db.session.get(TaskCounter, self.user_id).total = 42
+            db.session.commit()
+        self.client.post('/tasks', json={'title': 'Bump cache generation'}, headers=self.headers)
+        data = self.client.get('/tasks?per_page=10', headers=self.headers).get_json()
+        self.assertEqual((data['total'], data['pages']), (43, 5))
+        data = self.client.get('/tasks?completed=false&per_page=10', headers=self.headers).get_json()
+        self.assertEqual(data['total'], 4)
+
+    def test_reconcile_command_rebuilds_counters(self):
+        self.client.post('/tasks', json={'title': 'T'}, headers=self.headers)
+        with self.app.app_context():
+            db.session.get(TaskCounter, self.user_id).total = 99
+            db.session.commit()
+        result = self.app.test_cli_runner().invoke(args=['tasks', 'reconcile-counters'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self._stats()['total'], 1)
+
+    def test_missing_counter_row_is_rebuilt(self):
+        self.client.post('/tasks', json={'title': 'T'}, headers=self.headers)
+        with self.app.app_context():
+            db.session.delete(db.session.get(TaskCounter, self.user_id))
+            db.session.commit()
+        self.client.post('/tasks', json={'title': 'U'}, headers=self.headers)
+        self.assertEqual(self._stats()['total'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import json
+import time
+import tracemalloc
+import unittest
+from flask import Flask
+from app import create_app
+from app.events import EventBroker, SharedEventBroker, LocalPubSubClient, TaskEvents
+from app.extensions import db
+from app.models import User
+from flask_jwt_extended import create_access_token
+
+
+def read_event(frames):
+    """Next non-heartbeat frame of a stream as ``(id, event, data)``."""
+    for frame in frames:
+        if frame.startswith(b':'):
+            continue
+        fields = dict(line.split(': ', 1) for line in frame.decode().strip().split('\n'))
+        return fields['id'], fields['event'], json.loads(fields['data'])
+
+
+class EventStreamTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config['EVENTS_HEARTBEAT_SECONDS'] = 0.05
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            users = [User(username=name, password_hash='x') for name in ('streamer', 'other')]
+            db.session.add_all(users)
+            db.session.commit()
+            self.headers, self.other_headers = [
+                {'Authorization': create_access_token(identity=str(user.id))} for user in users
+            ]
+        self.responses = []
+
+    def tearDown(self):
+        for res in self.responses:
+            res.close()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _stream(self, headers=None, last_event_id=None):
+        headers = dict(headers or self.headers)
+        if last_event_id:
+            headers['Last-Event-ID'] = last_event_id
+        res = self.client.get('/tasks/stream', headers=headers, buffered=False)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, 'text/event-stream')
+        self.responses.append(res)
+        return iter(res.response)
+
+    def test_streams_own_task_writes(self):
+        frames = self._stream()
+        self.client.post('/tasks', json={'title': 'Not mine'}, headers=self.other_headers)
+        self.client.post('/tasks', json={'title': 'Mine'}, headers=self.headers)
+        self.client.put('/tasks/2', json={'completed': True}, headers=self.headers)
+        self.client.delete('/tasks/bulk', json={'ids': [1, 2]}, headers=self.headers)
+        events = [read_event(frames)[1:] for _ in range(3)]
+        self.assertEqual(events[0][0], 'created')
+        self.assertEqual(events[0][1]['title'], 'Mine')
+        self.assertEqual((events[1][0], events[1][1]['completed']), ('updated', True))
+        # Task 1 belongs to the other user, so only task 2 is reported deleted
+        self.assertEqual(events[2], ('deleted', {'id': 2}))
+
+    def test_heartbeat_while_idle(self):
+        self.assertEqual(next(self._stream()), b': keep-alive\n\n')
+
+    def test_resume_from_last_event_id(self):
+        frames = self._stream()
+        for i in range(3):
+            self.client.post('/tasks', json={'title': f'Task {i}'}, headers=self.headers)
+        first_id = read_event(frames)[0]
+        resumed = self._stream(last_event_id=first_id)
+        self.assertEqual([read_event(resumed)[2]['title'] for _ in range(2)], ['Task 1', 'Task 2'])
+
+        event_id, name, _ = read_event(self._stream(last_event_id='unknown-1'))
+        self.assertEqual(name, 'reset')
+        # The reset id is current, so resuming from it replays nothing
+        self.client.post('/tasks', json={'title': 'After reset'}, headers=self.headers)
+        self.assertEqual(read_event(self._stream(last_event_id=event_id))[2]['title'], 'After reset')
+
+    def test_slow_consumer_is_dropped(self):
+        self.app.extensions['task_events'].buffer_size = 2
+        frames = self._stream()
+        for i in range(3):
+            self.client.post('/tasks', json={'title': f'Task {i}'}, headers=self.headers)
+        self.assertEqual([read_event(frames)[2]['title'] for _ in range(2)], ['Task 0', 'Task 1'])
+        self.assertEqual(list(frames), [])
+        res = self.client.get('/')
+        self.assertEqual(res.get_json()['events']['dropped'], 1)
+
+    def test_closing_the_stream_unsubscribes(self):
+        self._stream()
+        self.assertEqual(self.client.get('/').get_json()['events']['subscribers'], 1)
+        self.responses.pop().close()
+        self.assertEqual(self.client.get('/').get_json()['events']['subscribers'], 0)
+
+    def test_streams_past_the_limit_are_refused(self):
+        self.app.config['EVENTS_MAX_STREAMS'] = 1
+        self._stream()
+        res = self.client.get('/tasks/stream', headers=self.other_headers)
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.headers['Retry-After'], '5')
+        self.assertEqual(self.client.get('/tasks', headers=self.headers).status_code, 200)
+        self.responses.pop().close()
+        self._stream(self.other_headers)
+
+    def test_shared_backend_reaches_other_workers(self):
+        client = LocalPubSubClient()
+        self.app.extensions['task_events'] = SharedEventBroker(client)
+        # Another worker process, subscribed to the same channel
+        worker = SharedEventBroker(client)
+        self.addCleanup(worker.close)
+        self.addCleanup(self.app.extensions['task_events'].close)
+        subscription, _ = worker.subscribe(1)
+        local = self._stream()
+        self.client.post('/tasks', json={'title': 'Everywhere'}, headers=self.headers)
+        self.assertEqual(read_event(local)[2]['title'], 'Everywhere')
+        frames = subscription.frames([], 1)
+        self.assertEqual(read_event(frames)[2]['title'], 'Everywhere')
+
+    def test_unknown_backend(self):
+        app = Flask(__name__)
+        app.config['EVENTS_BACKEND'] = 'carrier-pigeon'
+        with self.assertRaises(ValueError):
+            TaskEvents().init_app(app)
+
+    def test_shared_backend_needs_a_client(self):
+        app = Flask(__name__)
+        app.config['EVENTS_BACKEND'] = 'shared'
+        with self.assertRaises(ValueError):
+            TaskEvents().init_app(app)
+        app.config.update(EVENTS_BACKEND=None, EVENTS_SHARED_CLIENT=LocalPubSubClient())
+        TaskEvents().init_app(app)
+        self.addCleanup(app.extensions['task_events'].close)
+        self.assertIsInstance(app.extensions['task_events'], SharedEventBroker)
+
+    def test_idle_subscribers_are_cheap(self):
+        broker = EventBroker()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        subscriptions = [broker.subscribe(user_id)[0] for user_id in range(5000)]
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / len(subscriptions)
+        tracemalloc.stop()
+        self.assertLess(per_subscriber, 1024)
+        started = time.perf_counter()
+        broker.publish(42, 'created', {'id': 1})
+        # Publishing touches only the target user's subscribers
+        self.assertLess(time.perf_counter() - started, 0.01)
+        self.assertEqual(subscriptions[42].queue.qsize(), 1)
+        self.assertEqual(sum(s.queue.qsize() for s in subscriptions), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
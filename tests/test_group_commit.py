@@ -0,0 +1,117 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from sqlalchemy import func, select
+from config import TestingConfig, engine_options
+from app import create_app
+from app.extensions import db, group_commit
+from app.models import User, Task
+from app.counters import get_task_counts
+from flask_jwt_extended import create_access_token
+
+
+class GroupCommitTestCase(unittest.TestCase):
+    async_mode = False
+
+    def setUp(self):
+        # A file database: the writer thread and request threads need their own connections
+        self.dir = tempfile.mkdtemp()
+        uri = f'sqlite:///{self.dir}/group.sqlite3'
+        with mock.patch.multiple(
+            TestingConfig,
+            SQLALCHEMY_DATABASE_URI=uri,
+            SQLALCHEMY_ENGINE_OPTIONS=engine_options(uri),
+            GROUP_COMMIT=True,
+            GROUP_COMMIT_WINDOW_MS=50,
+        ):
+            self.app = create_app('testing', async_mode=self.async_mode)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(username='grouped')
+            user.set_password('pw')
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+            self.headers = {'Authorization': create_access_token(identity=str(user.id))}
+
+    def tearDown(self):
+        with self.app.app_context():
+            group_commit.stop()
+            db.session.remove()
+            db.engine.dispose()
+        shutil.rmtree(self.dir)
+
+    def _concurrently(self, fn, count):
+        results = [None] * count
+
+        def run(index):
+            results[index] = fn(index)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_creates_share_commits(self):
+        def create(index):
+            client = self.app.test_client()
+            return client.post('/tasks', json={'title': f'T{index}'}, headers=self.headers)
+
+        responses = self._concurrently(create, 8)
+        self.assertEqual([res.status_code for res in responses], [201] * 8)
+        self.assertEqual(len({res.get_json()['id'] for res in responses}), 8)
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(select(func.count(Task.id))), 8)
+            self.assertEqual(get_task_counts(self.user_id)['total'], 8)
+            stats = group_commit.stats()
+        self.assertEqual(stats['writes'], 8)
+        self.assertLess(stats['batches'], 8)
+
+    def test_update_and_delete(self):
+        task_id = self.client.post('/tasks', json={'title': 'T'}, headers=self.headers).get_json()['id']
+        res = self.client.put(f'/tasks/{task_id}', json={'completed': True}, headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.get_json()['completed'])
+        self.assertEqual(self.client.delete(f'/tasks/{task_id}', headers=self.headers).status_code, 200)
+        self.assertEqual(self.client.put(f'/tasks/{task_id}', json={'title': 'X'}, headers=self.headers).status_code, 404)
+        with self.app.app_context():
+            self.assertEqual(get_task_counts(self.user_id), {'total': 0, 'completed': 0, 'open': 0})
+
+    def test_failing_write_fails_only_its_request(self):
+        def insert(title):
+            db.session.add(Task(title=title, user_id=self.user_id))
+            db.session.flush()
+
+        def fail():
+            db.session.add(Task(title=None, user_id=self.user_id))  # NOT NULL violation
+            db.session.flush()
+
+        def submit(index):
+            with self.app.app_context():
+                try:
+                    group_commit.submit(fail if index == 1 else insert, *(() if index == 1 else (f'T{index}',)))
+                    return 'ok'
+                except Exception as exc:
+                    return type(exc).__name__
+
+        outcomes = self._concurrently(submit, 3)
+        self.assertEqual(outcomes[0], 'ok')
+        self.assertEqual(outcomes[2], 'ok')
+        self.assertEqual(outcomes[1], 'IntegrityError')
+        with self.app.app_context():
+            titles = db.session.scalars(select(Task.title).order_by(Task.title)).all()
+        self.assertEqual(titles, ['T0', 'T2'])
+
+
+class AsyncGroupCommitTestCase(GroupCommitTestCase):
+    """The async views hand single-task writes to the same writer thread."""
+    async_mode = True
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import unittest
+from datetime import timedelta
+from app import create_app
+from app.extensions import db, jwt
+from app.models import User
+from flask_jwt_extended import create_access_token, decode_token
+
+
+class JWTClaimsCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config['JWT_CLAIMS_CACHE'] = True
+        jwt.init_app(self.app)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(username='jwtcache')
+            user.set_password('pw')
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+            self.token = create_access_token(identity=str(user.id))
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _stats(self):
+        with self.app.app_context():
+            return jwt.cache_stats()
+
+    def test_repeat_requests_hit_the_cache(self):
+        for _ in range(3):
+            res = self.client.post('/tasks', json={'title': 'T'}, headers={'Authorization': self.token})
+            self.assertEqual(res.status_code, 201)
+            self.assertEqual(res.get_json()['user_id'], self.user_id)
+        stats = self._stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3, places=3)
+        self.assertEqual(self.client.get('/').get_json()['jwt_cache']['hits'], 2)
+
+    def test_expired_token_is_rejected(self):
+        with self.app.app_context():
+            token = create_access_token(identity=str(self.user_id), expires_delta=timedelta(seconds=1))
+        self.assertEqual(self.client.get('/tasks', headers={'Authorization': token}).status_code, 200)
+        time.sleep(1.1)
+        self.assertEqual(self.client.get('/tasks', headers={'Authorization': token}).status_code, 401)
+
+    def test_tampered_token_is_verified(self):
+        self.client.get('/tasks', headers={'Authorization': self.token})
+        tampered = self.token[:-2] + ('AA' if not self.token.endswith('AA') else 'BB')
+        res = self.client.get('/tasks', headers={'Authorization': tampered})
+        self.assertIn(res.status_code, (401, 422))
+
+    def test_cached_claims_are_copies(self):
+        with self.app.app_context():
+            decode_token(self.token)['sub'] = 'mutated'
+            self.assertEqual(decode_token(self.token)['sub'], str(self.user_id))
+
+    def test_disabled_by_default(self):
+        app = create_app('testing')
+        with app.app_context():
+            self.assertIsNone(jwt.cache_stats())
+            self.assertIsNone(app.test_client().get('/').get_json()['jwt_cache'])
+
+
+if __name__ == '__main__':
+    unittest.main()
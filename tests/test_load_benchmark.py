@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from config import TestingConfig, engine_options
+from app import create_app
+from app.extensions import db
+from benchmarks.load.report import summarize, compare
+from benchmarks.load.seed import seed
+from benchmarks.load.workload import parse_mix, replay, FlaskClientTransport
+
+
+class LoadBenchmarkTestCase(unittest.TestCase):
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('list=3, get=1,create'), {'list': 3.0, 'get': 1.0, 'create': 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix('list=1,explode=2')
+        with self.assertRaises(ValueError):
+            parse_mix('list=0')
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        def result(p95, rps, errors=0):
+            row = {'p95_ms': p95, 'throughput_rps': rps, 'errors': errors}
+            return {'overall': row, 'endpoints': {'list': row}}
+
+        baseline = result(10.0, 100.0)
+        self.assertEqual(compare(result(11.0, 95.0), baseline, 0.15)[1], [])
+        failures = compare(result(12.0, 100.0), baseline, 0.15)[1]
+        self.assertEqual([name for name, _ in failures], ['overall', 'list'])
+        self.assertTrue(compare(result(10.0, 80.0), baseline, 0.15)[1])
+        self.assertTrue(compare(result(10.0, 100.0, errors=2), baseline, 0.15)[1])
+
+    def test_seed_and_replay(self):
+        # A file database: replay threads need their own connections
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        uri = f'sqlite:///{directory}/load.sqlite3'
+        with mock.patch.multiple(TestingConfig, SQLALCHEMY_DATABASE_URI=uri,
+                                 SQLALCHEMY_ENGINE_OPTIONS=engine_options(uri)):
+            app = create_app('testing', async_mode=False)
+        owned = seed(app, users=2, tasks_per_user=5)
+        self.assertEqual(sorted(len(ids) for ids in owned.values()), [5, 5])
+
+        mix = parse_mix('login=1,list=1,get=1,create=1,update=1,delete=1')
+        samples, elapsed = replay(FlaskClientTransport(app), owned, mix, requests=60, concurrency=2)
+        result = summarize(samples, elapsed, {})
+        self.assertEqual(result['overall']['requests'], 60)
+        self.assertEqual(result['overall']['errors'], 0)
+        self.assertLessEqual(result['overall']['p50_ms'], result['overall']['p99_ms'])
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from config import TestingConfig, engine_options
+from app import create_app
+from app.extensions import db
+from app.models import User
+from flask_jwt_extended import create_access_token
+
+
+def sample(text, line_start):
+    match = re.search(rf'^{re.escape(line_start)} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(username='metrics')
+            user.set_password('pw')
+            db.session.add(user)
+            db.session.commit()
+            self.headers = {'Authorization': create_access_token(identity=str(user.id))}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _scrape(self):
+        res = self.client.get('/metrics')
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.content_type.startswith('text/plain; version=0.0.4'))
+        return res.get_data(as_text=True)
+
+    def test_request_and_sql_metrics(self):
+        self.client.post('/tasks', json={'title': 'Observed'}, headers=self.headers)
+        res = self.client.get('/tasks', headers=self.headers)
+        self.client.get('/no-such-page')
+        text = self._scrape()
+
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertEqual(sample(text, 'http_requests_total{endpoint="tasks.create_task",method="POST",status="201"}'), 1)
+        self.assertEqual(sample(text, 'http_requests_total{endpoint="unmatched",method="GET",status="404"}'), 1)
+        self.assertEqual(sample(text, 'http_request_duration_seconds_count{endpoint="tasks.get_tasks",method="GET"}'), 1)
+        self.assertEqual(
+            sample(text, 'http_request_duration_seconds_bucket{endpoint="tasks.get_tasks",method="GET",le="+Inf"}'), 1)
+        self.assertEqual(sample(text, 'http_response_size_bytes_sum{endpoint="tasks.get_tasks"}'), len(res.get_data()))
+        self.assertGreater(sample(text, 'http_request_db_statements_sum{endpoint="tasks.get_tasks"}'), 0)
+        self.assertGreater(sample(text, 'db_statements_total'), 0)
+        self.assertGreater(sample(text, 'db_pool_checkout_seconds_count'), 0)
+
+    def test_counts_from_many_threads_are_merged(self):
+        # A file database: each request thread needs its own connection
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        uri = f'sqlite:///{directory}/metrics.sqlite3'
+        with mock.patch.multiple(TestingConfig, SQLALCHEMY_DATABASE_URI=uri,
+                                 SQLALCHEMY_ENGINE_OPTIONS=engine_options(uri)):
+            app = create_app('testing', async_mode=False)
+        with app.app_context():
+            db.create_all()
+
+        def worker():
+            client = app.test_client()
+            for _ in range(5):
+                client.get('/')
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        text = app.test_client().get('/metrics').get_data(as_text=True)
+        self.assertEqual(sample(text, 'http_requests_total{endpoint="health",method="GET",status="200"}'), 20)
+        with app.app_context():
+            db.engine.dispose()
+
+    def test_disabled(self):
+        with mock.patch.object(TestingConfig, 'METRICS_ENABLED', False):
+            app = create_app('testing')
+        self.assertEqual(app.test_client().get('/metrics').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
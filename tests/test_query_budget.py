@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+from flask import jsonify
+from sqlalchemy import delete, insert
+from config import TestingConfig
+from app import create_app
+from app.extensions import db
+from app.models import User, Task, TaskCounter
+from app.query_budget import QueryBudgetExceeded, query_budget, normalize_sql
+from flask_jwt_extended import create_access_token
+
+
+def add_user_listing_route(app):
+    @app.route('/task-owners')
+    @query_budget(2)
+    def task_owners():
+        # Lazy-loads User.tasks once per user: an N+1
+        return jsonify({user.username: len(user.tasks) for user in User.query.all()})
+
+
+class QueryBudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        add_user_listing_route(self.app)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            for n in range(3):
+                user = User(username=f'owner{n}', password_hash='x')
+                db.session.add(user)
+            db.session.commit()
+            self.user_id = db.session.scalar(db.select(User.id).filter_by(username='owner0'))
+            self.headers = {'Authorization': create_access_token(identity=str(self.user_id))}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_n_plus_one_fails_the_request_in_testing(self):
+        with self.assertRaisesRegex(QueryBudgetExceeded, r'ran 4 queries, budget is 2'):
+            self.client.get('/task-owners')
+
+    def test_over_budget_only_warns_when_not_enforced(self):
+        with mock.patch.object(TestingConfig, 'QUERY_BUDGET_ENFORCE', False):
+            app = create_app('testing')
+        add_user_listing_route(app)
+        with app.app_context():
+            db.create_all()
+            db.session.add_all([User(username='first', password_hash='x'), User(username='second', password_hash='x')])
+            db.session.commit()
+        with self.assertLogs(app.logger, 'WARNING') as logs:
+            res = app.test_client().get('/task-owners')
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('Query budget exceeded: GET task_owners ran 3 queries, budget is 2', logs.output[0])
+
+    def test_writes_without_counter_rows_stay_within_budget(self):
+        # Counter rows are rebuilt on the first write, the costliest path
+        with self.app.app_context():
+            task_id = db.session.execute(
+                insert(Task).returning(Task.id), {'title': 'T', 'user_id': self.user_id}
+            ).scalar()
+            db.session.commit()
+        requests = [
+            ('put', f'/tasks/{task_id}', {'completed': True}, 200),
+            ('post', '/tasks', {'title': 'New'}, 201),
+            ('delete', f'/tasks/{task_id}', None, 200),
+            ('post', '/tasks/bulk', {'tasks': [{'title': f'B{n}'} for n in range(50)]}, 201),
+        ]
+        for method, path, body, status in requests:
+            with self.app.app_context():
+                db.session.execute(delete(TaskCounter))
+                db.session.commit()
+            res = getattr(self.client, method)(path, json=body, headers=self.headers)
+            self.assertEqual(res.status_code, status, path)
+
+    def test_slow_query_log(self):
+        with mock.patch.object(TestingConfig, 'SLOW_QUERY_MS', 0.000001):
+            app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+        with self.assertLogs(app.logger, 'WARNING') as logs:
+            app.test_client().post('/auth/register', json={'username': "o'brien", 'password': 'pw'})
+        self.assertTrue(any('in auth.register: SELECT' in line for line in logs.output))
+        self.assertFalse(any("o'brien" in line for line in logs.output))
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT *\n  FROM task WHERE id IN (?, ?, ?) AND title = 'a''b' LIMIT 10"),
+            'SELECT * FROM task WHERE id IN (...) AND title = ? LIMIT ?'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
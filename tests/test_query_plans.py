@@ -0,0 +1,103 @@
+import io
+import re
+import unittest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import create_app
+from app.extensions import db, cache
+
+# Any "SCAN <table>" reads the whole table, including "SCAN t USING [COVERING]
+# INDEX", which walks the full index (e.g. a query that lost its user_id
+# predicate). Only a constant row and an FTS5 table scanned through a MATCH
+# ("VIRTUAL TABLE INDEX 0:M...") are fine; indexed lookups show as SEARCH
+FULL_SCAN = re.compile(r'\bSCAN (?!CONSTANT ROW)(\w+)\b(?! VIRTUAL TABLE INDEX \d+:M)')
+
+
+class QueryPlanTestCase(unittest.TestCase):
+    """Drive every route and assert SQLite answers each query from an index."""
+
+    def setUp(self):
+        self.app = create_app('testing')
+        # Bypass the read cache so every request reaches the database
+        self.app.config['CACHE_BACKEND'] = 'null'
+        cache.init_app(self.app)
+        self.client = self.app.test_client()
+        self.statements = []
+        with self.app.app_context():
+            db.create_all()
+            self.engine = db.engine
+        # Listen on every Engine so async mode's engine is counted as well
+        event.listen(Engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(Engine, 'before_cursor_execute', self._record)
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')):
+            # executemany passes a list of parameter sets, or a single set for one-row batches
+            many = executemany and isinstance(parameters, list)
+            self.statements.append((statement, parameters[0] if many else parameters))
+
+    def _exercise_routes(self):
+        self.client.post('/auth/register', json={'username': 'planner', 'password': 'pw'})
+        token = self.client.post('/auth/login', json={
+            'username': 'planner', 'password': 'pw'}).get_json()['access_token']
+        headers = {'Authorization': token}
+        for i in range(5):
+            res = self.client.post('/tasks', json={'title': f'Task {i}'}, headers=headers)
+        task_id = res.get_json()['id']
+        self.client.get('/tasks?page=2&per_page=2', headers=headers)
+        self.client.get('/tasks?completed=false', headers=headers)
+        self.client.get('/tasks?fields=id,title&per_page=2', headers=headers)
+        res = self.client.get('/tasks?limit=2&include_total=true', headers=headers)
+        cursor = res.get_json()['next_cursor']
+        self.client.get(f'/tasks?limit=2&cursor={cursor}', headers=headers)
+        self.client.get(f'/tasks?limit=2&completed=true&cursor={cursor}', headers=headers)
+        res = self.client.get(f'/tasks/{task_id}', headers=headers)
+        self.client.get(f'/tasks/{task_id}', headers={**headers, 'If-None-Match': res.headers['ETag']})
+        self.client.get('/tasks/stats', headers=headers)
+        res = self.client.get('/tasks/changes?limit=2', headers=headers)
+        self.client.get(f"/tasks/changes?limit=2&since={res.get_json()['checkpoint']}", headers=headers)
+        res = self.client.get('/tasks/search?q=task&limit=2', headers=headers)
+        self.client.get(f"/tasks/search?q=task&limit=2&cursor={res.get_json()['next_cursor']}", headers=headers)
+        self.client.get('/tasks/export?format=ndjson', headers=headers).get_data()
+        self.client.get('/tasks/export?format=csv&completed=false', headers=headers).get_data()
+        self.client.post('/tasks/import?format=ndjson', data='{"title": "Imported"}\n',
+                         content_type='application/x-ndjson', headers=headers)
+        self.client.post('/tasks/import', data={'file': (io.BytesIO(b'title\nUploaded\n'), 'tasks.csv')},
+                         headers=headers)
+        self.client.put(f'/tasks/{task_id}', json={'completed': True}, headers=headers)
+        self.client.delete(f'/tasks/{task_id}', headers=headers)
+        res = self.client.post('/tasks/bulk', json={'tasks': [{'title': 'B1'}, {'title': 'B2'}]}, headers=headers)
+        bulk_ids = [r['task']['id'] for r in res.get_json()['results']]
+        self.client.put('/tasks/bulk', json={'tasks': [{'id': i, 'completed': True} for i in bulk_ids]},
+                        headers=headers)
+        self.client.delete('/tasks/bulk', json={'ids': bulk_ids}, headers=headers)
+
+    def test_full_scan_pattern(self):
+        for plan in ('SCAN task', 'SCAN task USING INDEX ix_task_user_id_created_at',
+                     'SCAN task_tombstone USING COVERING INDEX ix_task_tombstone_user_id_deleted_at'):
+            self.assertIsNotNone(FULL_SCAN.search(plan), plan)
+        for plan in ('SEARCH task USING INDEX ix_task_user_id_created_at (user_id=?)', 'SCAN CONSTANT ROW',
+                     'SCAN task_fts VIRTUAL TABLE INDEX 0:M3'):
+            self.assertIsNone(FULL_SCAN.search(plan), plan)
+
+    def test_route_queries_use_indexes(self):
+        self._exercise_routes()
+        self.assertTrue(self.statements)
+        event.remove(Engine, 'before_cursor_execute', self._record)
+        try:
+            with self.engine.connect() as conn:
+                for statement, parameters in self.statements:
+                    rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+                    plan = '\n'.join(row[-1] for row in rows)
+                    self.assertIsNone(FULL_SCAN.search(plan), f'{statement}\n{plan}')
+        finally:
+            event.listen(Engine, 'before_cursor_execute', self._record)
+
+
+if __name__ == '__main__':
+    unittest.main()
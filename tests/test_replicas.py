@@ -0,0 +1,131 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import delete, insert, select
+from config import TestingConfig, engine_options
+from app import create_app
+from app.cache import LocalSharedClient
+from app.extensions import db
+from app.models import User
+from flask_jwt_extended import create_access_token
+
+
+class ReplicaRoutingTestCase(unittest.TestCase):
+    """Primary and replica are two SQLite files; ``_replicate`` plays the replication stream."""
+
+    async_mode = False
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        primary = f'sqlite:///{self.dir}/primary.sqlite3'
+        replica = f'sqlite:///{self.dir}/replica.sqlite3'
+        with mock.patch.multiple(
+            TestingConfig,
+            SQLALCHEMY_DATABASE_URI=primary,
+            SQLALCHEMY_ENGINE_OPTIONS=engine_options(primary),
+            SQLALCHEMY_BINDS={'replica_0': {'url': replica, **engine_options(replica)}},
+            SQLALCHEMY_READ_REPLICAS=['replica_0'],
+            CACHE_BACKEND='null',
+        ):
+            self.app = create_app('testing', async_mode=self.async_mode)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            db.metadata.create_all(db.engines['replica_0'])
+            user = User(username='replicated')
+            user.set_password('pw')
+            db.session.add(user)
+            db.session.commit()
+            self.headers = {'Authorization': create_access_token(identity=str(user.id))}
+        self._replicate()
+
+    def tearDown(self):
+        self._dispose(self.app)
+        shutil.rmtree(self.dir)
+
+    def _dispose(self, app):
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+    def _replicate(self):
+        with self.app.app_context():
+            with db.engines[None].connect() as source, db.engines['replica_0'].begin() as target:
+                for table in db.metadata.sorted_tables:
+                    target.execute(delete(table))
+                    rows = [dict(row._mapping) for row in source.execute(select(table))]
+                    if rows:
+                        target.execute(insert(table), rows)
+
+    def _set_sticky_seconds(self, seconds):
+        self.app.extensions['replica_router']['sticky_seconds'] = seconds
+
+    def _total(self):
+        return self.client.get('/tasks', headers=self.headers).get_json()['total']
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        self._set_sticky_seconds(0)
+        res = self.client.post('/tasks', json={'title': 'Written'}, headers=self.headers)
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(self._total(), 0)  # replica has not caught up
+        self._replicate()
+        self.assertEqual(self._total(), 1)
+
+    def test_user_sticks_to_primary_after_write(self):
+        self.client.post('/tasks', json={'title': 'Written'}, headers=self.headers)
+        self.assertEqual(self._total(), 1)
+
+    def test_read_after_write_in_same_request_uses_primary(self):
+        self._set_sticky_seconds(0)
+        self.client.post('/tasks', json={'title': 'Written'}, headers=self.headers)
+        with self.app.app_context():
+            with db.engines['replica_0'].begin() as conn:
+                conn.exec_driver_sql('DELETE FROM task_counter')
+        # Stats finds no counters on the replica, rebuilds them on the primary
+        # and must then read them back from the primary
+        res = self.client.get('/tasks/stats', headers=self.headers)
+        self.assertEqual(res.get_json(), {'total': 1, 'completed': 0, 'open': 1})
+
+    def test_stickiness_holds_across_workers(self):
+        # A second worker process: its own app on the same databases and shared client
+        client = LocalSharedClient()
+        with mock.patch.multiple(
+            TestingConfig,
+            SQLALCHEMY_DATABASE_URI=self.app.config['SQLALCHEMY_DATABASE_URI'],
+            SQLALCHEMY_ENGINE_OPTIONS=self.app.config['SQLALCHEMY_ENGINE_OPTIONS'],
+            SQLALCHEMY_BINDS=self.app.config['SQLALCHEMY_BINDS'],
+            SQLALCHEMY_READ_REPLICAS=['replica_0'],
+            CACHE_BACKEND='null',
+            CACHE_SHARED_CLIENT=client,
+        ):
+            workers = [create_app('testing', async_mode=self.async_mode) for _ in range(2)]
+        for app in workers:
+            self.addCleanup(self._dispose, app)
+        res = workers[0].test_client().post('/tasks', json={'title': 'Written'}, headers=self.headers)
+        self.assertEqual(res.status_code, 201)
+        # The replica has not caught up, yet the other worker reads the write
+        res = workers[1].test_client().get('/tasks', headers=self.headers)
+        self.assertEqual(res.get_json()['total'], 1)
+
+    def test_unknown_replica_bind_is_rejected(self):
+        with mock.patch.object(TestingConfig, 'SQLALCHEMY_READ_REPLICAS', ['missing']):
+            with self.assertRaises(ValueError):
+                create_app('testing')
+
+
+class AsyncReplicaRoutingTestCase(ReplicaRoutingTestCase):
+    """The async views read through an async engine per replica."""
+    async_mode = True
+
+    def _dispose(self, app):
+        super()._dispose(app)
+        state = app.extensions['async_db']
+        for engine in (state['engine'], *state['replicas'].values()):
+            if engine is not None:
+                engine.sync_engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+from config import TestingConfig
+from app import create_app
+from app.extensions import db
+from app.models import User
+from app.search import search_terms
+from flask_jwt_extended import create_access_token
+
+
+class SearchTestCase(unittest.TestCase):
+    backend = None
+
+    def setUp(self):
+        with mock.patch.object(TestingConfig, 'SEARCH_BACKEND', self.backend):
+            self.app = create_app('testing')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            users = [User(username=name, password_hash='x') for name in ('searcher', 'other')]
+            db.session.add_all(users)
+            db.session.commit()
+            self.headers, self.other_headers = [
+                {'Authorization': create_access_token(identity=str(user.id))} for user in users
+            ]
+        for title, description in [
+            ('Call the plumber', 'kitchen sink is leaking'),
+            ('Plumber invoice', ''),
+            ('Groceries', 'milk, eggs and a plumber snack'),
+            ('Gym', 'leg day'),
+        ]:
+            self.client.post('/tasks', json={'title': title, 'description': description}, headers=self.headers)
+        self.client.post('/tasks', json={'title': 'Plumber for the neighbours'}, headers=self.other_headers)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _search(self, query, headers=None):
+        res = self.client.get(f'/tasks/search?{query}', headers=headers or self.headers)
+        self.assertEqual(res.status_code, 200)
+        return res.get_json()
+
+    def test_ranked_and_scoped_to_user(self):
+        titles = [task['title'] for task in self._search('q=plumber')['tasks']]
+        # Title hits rank above the description-only hit; the other user's task never shows
+        self.assertEqual(sorted(titles[:2]), ['Call the plumber', 'Plumber invoice'])
+        self.assertEqual(titles[2:], ['Groceries'])
+
+    def test_all_terms_must_match(self):
+        titles = [task['title'] for task in self._search('q=plumber+sink')['tasks']]
+        self.assertEqual(titles, ['Call the plumber'])
+
+    def test_cursor_pagination(self):
+        seen = []
+        body = self._search('q=plumber&limit=1')
+        while True:
+            self.assertLessEqual(len(body['tasks']), 1)
+            seen.extend(task['id'] for task in body['tasks'])
+            if not body['next_cursor']:
+                break
+            body = self._search(f"q=plumber&limit=1&cursor={body['next_cursor']}")
+        full = [task['id'] for task in self._search('q=plumber')['tasks']]
+        self.assertEqual(seen, full)
+        self.assertEqual(len(seen), 3)
+
+    def test_index_follows_updates_and_deletes(self):
+        task = self._search('q=gym')['tasks'][0]
+        self.client.put(f"/tasks/{task['id']}", json={'title': 'Swimming'}, headers=self.headers)
+        self.assertEqual(self._search('q=gym')['tasks'], [])
+        self.assertEqual(self._search('q=swimming')['tasks'][0]['id'], task['id'])
+        self.client.delete(f"/tasks/{task['id']}", headers=self.headers)
+        self.assertEqual(self._search('q=swimming')['tasks'], [])
+
+    def test_bad_requests(self):
+        res = self.client.get('/tasks/search?q=+%22*', headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        res = self.client.get('/tasks/search?q=plumber&cursor=bogus', headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        # FTS5 syntax in the query is treated as plain words
+        self.assertEqual(self._search('q=plumber+OR+%28NEAR')['tasks'], [])
+
+    def test_search_terms(self):
+        self.assertEqual(search_terms('"call" the-plumber*'), ['call', 'the', 'plumber'])
+
+
+class LikeSearchTestCase(SearchTestCase):
+    backend = 'like'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import unittest
+from unittest import mock
+from datetime import datetime, timezone
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from app.models import Task
+from app.schemas import TaskSchema
+from app.serializers import (
+    serialize_task, serialize_tasks, task_serializer, dumps, parse_task_fields, InvalidFields, TASK_FIELDS
+)
+
+
+def make_tasks():
+    naive = datetime(2025, 8, 10, 21, 4, 18, 77415)
+    aware = datetime(2025, 8, 11, 9, 30, tzinfo=timezone.utc)
+    return [
+        Task(id=1, title='Plain', description='Text', completed=False,
+             created_at=naive, updated_at=naive, user_id=1),
+        Task(id=2, title='Ünïcødé ✓', description=None, completed=True,
+             created_at=aware, updated_at=aware, user_id=2),
+        Task(id=3, title='Nulls', description='', completed=None,
+             created_at=None, updated_at=None, user_id=3),
+    ]
+
+
+class SerializerParityTestCase(unittest.TestCase):
+    def test_matches_task_schema_dump(self):
+        tasks = make_tasks()
+        self.assertEqual(serialize_tasks(tasks), TaskSchema(many=True).dump(tasks))
+        for task in tasks:
+            self.assertEqual(serialize_task(task), TaskSchema().dump(task))
+
+    def test_only_subset(self):
+        task = make_tasks()[0]
+        only = frozenset({'id', 'title'})
+        self.assertEqual(task_serializer(only)(task), TaskSchema(only=only).dump(task))
+
+    def test_parse_task_fields(self):
+        self.assertIsNone(parse_task_fields(None))
+        self.assertIsNone(parse_task_fields(' , '))
+        self.assertIsNone(parse_task_fields(','.join(reversed(TASK_FIELDS))))
+        # Schema order and no duplicates, so equivalent requests share a serializer
+        self.assertEqual(parse_task_fields('title, id,title'), ('id', 'title'))
+        with self.assertRaisesRegex(InvalidFields, 'Unknown fields: password_hash, secret'):
+            parse_task_fields('id,secret,password_hash')
+        task = make_tasks()[0]
+        self.assertEqual(serialize_task(task, ('id', 'completed')), {'id': 1, 'completed': False})
+
+    def test_dumps_round_trips(self):
+        payload = {'tasks': serialize_tasks(make_tasks()), 1: 'non-string key'}
+        self.assertEqual(json.loads(dumps(payload)), json.loads(json.dumps(payload)))
+
+    def test_stdlib_fallback(self):
+        payload = {'tasks': serialize_tasks(make_tasks())}
+        with mock.patch('app.serializers.orjson', None):
+            self.assertEqual(json.loads(dumps(payload)), payload)
+            app = create_app('testing')
+            self.assertEqual(json.loads(app.json.dumps(payload)), payload)
+
+    def test_json_provider_matches_default(self):
+        app = create_app('testing')
+        payload = {'b': [1, 2.5, None, True], 'a': 'ü', 'when': datetime(2025, 8, 10, tzinfo=timezone.utc)}
+        fast = app.json.dumps(payload)
+        default = DefaultJSONProvider(app).dumps(payload)
+        self.assertEqual(json.loads(fast), json.loads(default))
+
+
+if __name__ == '__main__':
+    unittest.main()
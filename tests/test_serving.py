@@ -0,0 +1,175 @@
+import http.client
+import importlib.util
+import json
+import os
+import shutil
+import signal
+import tempfile
+import time
+import unittest
+from unittest import mock
+from sqlalchemy import text
+from config import TestingConfig, engine_options
+from app import create_app
+from app.extensions import db
+from app.cache import LocalSharedClient
+from app.serving import worker_layout, check_workers, dispose_engines, limit_streams
+
+
+class ServingTestCase(unittest.TestCase):
+    def setUp(self):
+        # A file database: in-memory ones are not shared between processes
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.uri = f'sqlite:///{self.directory}/serving.sqlite3'
+        with mock.patch.multiple(TestingConfig, SQLALCHEMY_DATABASE_URI=self.uri,
+                                 SQLALCHEMY_ENGINE_OPTIONS=engine_options(self.uri)):
+            self.app = create_app('testing', async_mode=False)
+        with self.app.app_context():
+            db.create_all()
+            self.addCleanup(db.engine.dispose)
+
+    def test_worker_layout(self):
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '', 'WEB_THREADS': ''}):
+            self.assertEqual(worker_layout(cpus=4), (5, 4))
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '3', 'WEB_THREADS': '1'}):
+            self.assertEqual(worker_layout(cpus=4), (3, 1))
+
+    def _app(self, **settings):
+        with mock.patch.multiple(TestingConfig, SQLALCHEMY_DATABASE_URI=self.uri,
+                                 SQLALCHEMY_ENGINE_OPTIONS=engine_options(self.uri), **settings):
+            return create_app('testing', async_mode=False)
+
+    def test_check_workers(self):
+        self.assertEqual(check_workers(self._app(CACHE_BACKEND='lru'), 1), [])
+        with self.assertRaisesRegex(RuntimeError, 'CACHE_BACKEND=lru'):
+            check_workers(self._app(CACHE_BACKEND='lru'), 2)
+        replicas = {
+            'SQLALCHEMY_BINDS': {'replica_0': {'url': self.uri, **engine_options(self.uri)}},
+            'SQLALCHEMY_READ_REPLICAS': ['replica_0'],
+        }
+        with self.assertRaisesRegex(RuntimeError, 'REPLICA_STICKY_SECONDS'):
+            check_workers(self._app(**replicas), 2)
+        self.assertEqual(check_workers(self._app(**replicas, REPLICA_STICKY_SECONDS=0), 2), [
+            'EVENTS_BACKEND=local: /tasks/stream only sees writes handled by its own worker'
+        ])
+        self.assertEqual(check_workers(self._app(**replicas, CACHE_SHARED_CLIENT=LocalSharedClient()), 2), [
+            'EVENTS_BACKEND=local: /tasks/stream only sees writes handled by its own worker'
+        ])
+
+    def test_limit_streams(self):
+        limit_streams(self.app, 'gthread', 4)
+        self.assertEqual(self.app.config['EVENTS_MAX_STREAMS'], 2)
+        self.app.config['EVENTS_MAX_STREAMS'] = 10
+        limit_streams(self.app, 'gthread', 4)
+        self.assertEqual(self.app.config['EVENTS_MAX_STREAMS'], 10)
+        self.app.config['EVENTS_MAX_STREAMS'] = None
+        limit_streams(self.app, 'gevent', 1)
+        self.assertIsNone(self.app.config['EVENTS_MAX_STREAMS'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_forked_worker_opens_its_own_connections(self):
+        with self.app.app_context():
+            db.session.execute(text('SELECT 1'))
+            db.session.remove()
+            pool = db.engine.pool
+            self.assertEqual(pool.checkedin(), 1)
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                dispose_engines(self.app)
+                with self.app.app_context():
+                    fresh = db.engine.pool.checkedin() == 0
+                    status = 0 if fresh and db.session.execute(text('SELECT 1')).scalar() == 1 else 1
+            finally:
+                os._exit(status)
+        self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        # The parent's pooled connection was left open for it
+        with self.app.app_context():
+            self.assertIs(db.engine.pool, pool)
+            self.assertEqual(pool.checkedin(), 1)
+            self.assertEqual(db.session.execute(text('SELECT 1')).scalar(), 1)
+
+    @unittest.skipUnless(importlib.util.find_spec('gunicorn'), 'needs gunicorn')
+    def test_gunicorn_serves_through_a_graceful_reload(self):
+        from benchmarks.serving import free_port, start_server
+        from benchmarks.load.workload import HTTPTransport
+        port = free_port()
+        server = start_server(self.uri, port, workers=2, threads=2)
+        try:
+            transport = HTTPTransport(port)
+            self.assertEqual(transport.request('POST', '/auth/register', {
+                'username': 'served', 'password': 'password123'
+            })[0], 201)
+            server.send_signal(signal.SIGHUP)
+            # Old workers finish what they have while new ones take over
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                self.assertEqual(transport.request('GET', '/')[0], 200)
+            self.assertEqual(transport.request('POST', '/auth/login', {
+                'username': 'served', 'password': 'password123'
+            })[0], 200)
+        finally:
+            server.send_signal(signal.SIGTERM)
+        self.assertEqual(server.wait(timeout=30), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec('gunicorn'), 'needs gunicorn')
+    def test_gunicorn_serves_requests_while_streams_are_open(self):
+        from benchmarks.serving import free_port, start_server
+        from benchmarks.load.workload import HTTPTransport
+        port = free_port()
+        # One worker with two threads: one may stream, one is kept for requests. A
+        # closed stream ends at its next heartbeat, so keep them short for shutdown
+        server = start_server(self.uri, port, workers=1, threads=2, EVENTS_HEARTBEAT_SECONDS='0.2')
+        stream = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        try:
+            transport = HTTPTransport(port)
+            credentials = {'username': 'listener', 'password': 'password123'}
+            transport.request('POST', '/auth/register', credentials)
+            token = json.loads(transport.request('POST', '/auth/login', credentials)[1])['access_token']
+            headers = {'Authorization': token}
+            stream.request('GET', '/tasks/stream', headers=headers)
+            self.assertEqual(stream.getresponse().status, 200)
+            status, _ = transport.request('GET', '/tasks/stream', headers=headers)
+            self.assertEqual(status, 503)
+            self.assertEqual(transport.request('GET', '/tasks', headers=headers)[0], 200)
+            self.assertEqual(transport.request('GET', '/')[0], 200)
+        finally:
+            stream.close()
+            server.send_signal(signal.SIGTERM)
+        self.assertEqual(server.wait(timeout=30), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec('gunicorn'), 'needs gunicorn')
+    def test_gunicorn_workers_serve_no_stale_tasks(self):
+        from benchmarks.serving import free_port, start_server
+        from benchmarks.load.workload import HTTPTransport
+        port = free_port()
+        server = start_server(self.uri, port, workers=2, threads=1)
+        try:
+            transport = HTTPTransport(port)
+            credentials = {'username': 'writer', 'password': 'password123'}
+            transport.request('POST', '/auth/register', credentials)
+            token = json.loads(transport.request('POST', '/auth/login', credentials)[1])['access_token']
+            headers = {'Authorization': token}
+            transport.request('POST', '/tasks', {'title': 'Before'}, headers)
+            # Spread reads over both workers before and after the write
+            for title in ('Before', 'After'):
+                if title == 'After':
+                    self.assertEqual(transport.request('PUT', '/tasks/1', {'title': title}, headers)[0], 200)
+                for _ in range(20):
+                    status, body = transport.request('GET', '/tasks/1', headers=headers)
+                    self.assertEqual((status, json.loads(body)['title']), (200, title))
+        finally:
+            server.send_signal(signal.SIGTERM)
+        self.assertEqual(server.wait(timeout=30), 0)
+
+    @unittest.skipUnless(importlib.util.find_spec('gunicorn'), 'needs gunicorn')
+    def test_gunicorn_refuses_per_process_cache_with_several_workers(self):
+        from benchmarks.serving import free_port, start_server
+        with self.assertRaisesRegex(RuntimeError, 'gunicorn exited'):
+            start_server(self.uri, free_port(), workers=2, threads=1, CACHE_BACKEND='lru')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+import unittest
+from benchmarks.startup import measure, over_budget
+
+
+class StartupTestCase(unittest.TestCase):
+    def test_cold_start_within_budget(self):
+        # Best of three, so one slow run on a busy machine does not fail the suite
+        runs = [measure('testing', swagger_ui=False) for _ in range(3)]
+        best = {name: min(run[name] for run in runs) for name in ('import_ms', 'first_response_ms')}
+        self.assertEqual(over_budget(best), [], best)
+
+    def test_serving_skips_cli_and_disabled_modules(self):
+        self.assertEqual(measure('testing', swagger_ui=False)['lazy_loaded'], [])
+        self.assertEqual(measure('testing', swagger_ui=True)['lazy_loaded'], ['flask_swagger_ui'])
+
+
+if __name__ == '__main__':
+    unittest.main()
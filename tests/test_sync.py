@@ -0,0 +1,122 @@
+import base64
+import unittest
+from datetime import datetime, timedelta, timezone
+from app import create_app
+from app.extensions import db
+from app.models import User, TaskTombstone
+from flask_jwt_extended import create_access_token
+
+
+class SyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            users = [User(username=name, password_hash='x') for name in ('syncer', 'other')]
+            db.session.add_all(users)
+            db.session.commit()
+            self.headers, self.other_headers = [
+                {'Authorization': create_access_token(identity=str(user.id))} for user in users
+            ]
+        for i in range(3):
+            self.client.post('/tasks', json={'title': f'Task {i}'}, headers=self.headers)
+        self.client.post('/tasks', json={'title': 'Not mine'}, headers=self.other_headers)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _changes(self, since=None, query=''):
+        url = f'/tasks/changes?{query}' + (f'&since={since}' if since else '')
+        res = self.client.get(url, headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        return res.get_json()
+
+    def test_first_sync_then_only_changes(self):
+        body = self._changes()
+        self.assertEqual([task['title'] for task in body['tasks']], ['Task 0', 'Task 1', 'Task 2'])
+        self.assertEqual(body['deleted'], [])
+        self.assertFalse(body['has_more'])
+        unchanged = self._changes(body['checkpoint'])
+        self.assertEqual((unchanged['tasks'], unchanged['deleted']), ([], []))
+
+        self.client.put('/tasks/2', json={'completed': True}, headers=self.headers)
+        self.client.delete('/tasks/1', headers=self.headers)
+        self.client.post('/tasks', json={'title': 'Task 3'}, headers=self.headers)
+        body = self._changes(unchanged['checkpoint'])
+        self.assertEqual([(task['id'], task['completed']) for task in body['tasks']], [(2, True), (5, False)])
+        self.assertEqual(body['deleted'], [1])
+        self.assertEqual(self._changes(body['checkpoint'])['tasks'], [])
+
+    def test_bulk_writes_are_reported(self):
+        checkpoint = self._changes()['checkpoint']
+        self.client.put('/tasks/bulk', json={'tasks': [{'id': 1, 'title': 'Renamed'}]}, headers=self.headers)
+        self.client.delete('/tasks/bulk', json={'ids': [2, 3]}, headers=self.headers)
+        body = self._changes(checkpoint)
+        self.assertEqual([task['title'] for task in body['tasks']], ['Renamed'])
+        self.assertEqual(sorted(body['deleted']), [2, 3])
+
+    def test_pages_until_caught_up(self):
+        checkpoint = self._changes()['checkpoint']
+        for i in range(4):
+            self.client.post('/tasks', json={'title': f'New {i}'}, headers=self.headers)
+        self.client.delete('/tasks/bulk', json={'ids': [1, 2, 3]}, headers=self.headers)
+        titles, deleted = [], []
+        while True:
+            body = self._changes(checkpoint, 'limit=2&fields=title')
+            self.assertLessEqual(len(body['tasks']), 2)
+            titles.extend(task['title'] for task in body['tasks'])
+            deleted.extend(body['deleted'])
+            checkpoint = body['checkpoint']
+            if not body['has_more']:
+                break
+        self.assertEqual(titles, [f'New {i}' for i in range(4)])
+        self.assertEqual(sorted(deleted), [1, 2, 3])
+
+    def test_reused_id_is_reported_as_a_task(self):
+        checkpoint = self._changes()['checkpoint']
+        self.client.delete('/tasks/4', headers=self.other_headers)
+        self.client.delete('/tasks/3', headers=self.headers)
+        # SQLite hands the highest deleted rowid out again
+        res = self.client.post('/tasks', json={'title': 'Reborn'}, headers=self.headers)
+        self.assertEqual(res.get_json()['id'], 3)
+        body = self._changes(checkpoint)
+        self.assertEqual([task['title'] for task in body['tasks']], ['Reborn'])
+        self.assertEqual(body['deleted'], [])
+
+    def test_recent_writes_wait_to_settle(self):
+        checkpoint = self._changes()['checkpoint']
+        self.app.config['SYNC_SETTLE_SECONDS'] = 60
+        self.client.post('/tasks', json={'title': 'Too fresh'}, headers=self.headers)
+        self.assertEqual(self._changes(checkpoint)['tasks'], [])
+        self.app.config['SYNC_SETTLE_SECONDS'] = 0
+        self.assertEqual([task['title'] for task in self._changes(checkpoint)['tasks']], ['Too fresh'])
+
+    def test_invalid_and_expired_checkpoints(self):
+        res = self.client.get('/tasks/changes?since=bogus', headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        # A hand-edited token with a naive timestamp
+        naive = base64.urlsafe_b64encode(b'[null,["2026-10-17T00:00:00",1]]').decode().rstrip('=')
+        res = self.client.get(f'/tasks/changes?since={naive}', headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        checkpoint = self._changes()['checkpoint']
+        self.app.config['SYNC_TOMBSTONE_RETENTION_DAYS'] = 0
+        res = self.client.get(f'/tasks/changes?since={checkpoint}', headers=self.headers)
+        self.assertEqual(res.status_code, 410)
+
+    def test_purge_tombstones_command(self):
+        self.client.delete('/tasks/bulk', json={'ids': [1, 2]}, headers=self.headers)
+        with self.app.app_context():
+            old = db.session.get(TaskTombstone, 1)
+            old.deleted_at = datetime.now(timezone.utc) - timedelta(days=31)
+            db.session.commit()
+        result = self.app.test_cli_runner().invoke(args=['tasks', 'purge-tombstones'])
+        self.assertIn('Purged 1 tombstones', result.output)
+        with self.app.app_context():
+            self.assertEqual([row.task_id for row in TaskTombstone.query.all()], [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
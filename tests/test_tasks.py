@@ -1,8 +1,15 @@
+import csv
+import io
+import json
+import os
+import tempfile
 import unittest
 from app import create_app
 from app.extensions import db
 from app.models import User, Task
 from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 class TasksTestCase(unittest.TestCase):
     def setUp(self):
@@ -129,5 +136,244 @@ class TasksTestCase(unittest.TestCase):
         res = self.client.options('/tasks/1', headers=self.headers)
         self.assertEqual(res.status_code, 200)
 
+    def test_get_tasks_per_page_capped(self):
+        for i in range(3):
+            self.client.post('/tasks', json={'title': f'Task {i}'}, headers=self.headers)
+        self.app.config['MAX_PAGE_SIZE'] = 2
+        res = self.client.get('/tasks?page=1&per_page=500', headers=self.headers)
+        data = res.get_json()
+        self.assertEqual(len(data['tasks']), 2)
+        self.assertEqual(data['pages'], 2)
+
+    def test_get_tasks_cursor_pagination(self):
+        for i in range(7):
+            self.client.post('/tasks', json={'title': f'Task {i}'}, headers=self.headers)
+        seen = []
+        res = self.client.get('/tasks?limit=3', headers=self.headers)
+        data = res.get_json()
+        self.assertNotIn('total', data)
+        while True:
+            self.assertEqual(res.status_code, 200)
+            seen.extend(task['title'] for task in data['tasks'])
+            if not data['next_cursor']:
+                break
+            res = self.client.get(f"/tasks?limit=3&cursor={data['next_cursor']}", headers=self.headers)
+            data = res.get_json()
+        self.assertEqual(seen, [f'Task {i}' for i in range(7)])
+
+    def test_get_tasks_cursor_include_total_and_filter(self):
+        for i in range(6):
+            self.client.post('/tasks', json={'title': f'Task {i}'}, headers=self.headers)
+        res = self.client.get('/tasks?limit=2&completed=false&include_total=true', headers=self.headers)
+        data = res.get_json()
+        self.assertEqual(data['total'], 6)
+        self.assertEqual(len(data['tasks']), 2)
+        self.assertIsNotNone(data['next_cursor'])
+
+    def test_get_tasks_invalid_cursor(self):
+        res = self.client.get('/tasks?cursor=not-a-cursor', headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('msg', res.get_json())
+
+    def test_bulk_create_update_delete(self):
+        res = self.client.post('/tasks/bulk', json={'tasks': [
+            {'title': 'Bulk 1'}, {'title': 'Bulk 2', 'description': 'Second'}]}, headers=self.headers)
+        self.assertEqual(res.status_code, 201)
+        results = res.get_json()['results']
+        self.assertEqual([r['task']['title'] for r in results], ['Bulk 1', 'Bulk 2'])
+        ids = [r['task']['id'] for r in results]
+        res = self.client.put('/tasks/bulk', json={'tasks': [
+            {'id': ids[0], 'completed': True}, {'id': 9999, 'title': 'Missing'}]}, headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        results = res.get_json()['results']
+        self.assertTrue(results[0]['task']['completed'])
+        self.assertEqual(results[1]['status'], 404)
+        res = self.client.delete('/tasks/bulk', json={'ids': ids + [9999]}, headers=self.headers)
+        self.assertEqual([r['status'] for r in res.get_json()['results']], [200, 200, 404])
+        res = self.client.get('/tasks', headers=self.headers)
+        self.assertEqual(res.get_json()['total'], 0)
+
+    def test_bulk_create_invalid_item_rejects_batch(self):
+        res = self.client.post('/tasks/bulk', json={'tasks': [
+            {'title': 'Good'}, {'description': 'No title'}]}, headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('1', res.get_json()['errors'])
+        res = self.client.get('/tasks', headers=self.headers)
+        self.assertEqual(res.get_json()['total'], 0)
+
+    def test_bulk_batch_size_limit(self):
+        self.app.config['BULK_MAX_BATCH_SIZE'] = 2
+        res = self.client.post('/tasks/bulk', json={'tasks': [{'title': 'T'}] * 3}, headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('msg', res.get_json())
+
+    def test_bulk_is_scoped_to_user(self):
+        with self.app.app_context():
+            other = User(username='other')
+            other.set_password('otherpass')
+            db.session.add(other)
+            db.session.commit()
+            other_headers = {'Authorization': create_access_token(identity=str(other.id))}
+        res = self.client.post('/tasks', json={'title': 'Mine'}, headers=self.headers)
+        task_id = res.get_json()['id']
+        res = self.client.put('/tasks/bulk', json={'tasks': [{'id': task_id, 'title': 'Theirs'}]},
+                              headers=other_headers)
+        self.assertEqual(res.get_json()['results'][0]['status'], 404)
+        res = self.client.delete('/tasks/bulk', json={'ids': [task_id]}, headers=other_headers)
+        self.assertEqual(res.get_json()['results'][0]['status'], 404)
+        res = self.client.get(f'/tasks/{task_id}', headers=self.headers)
+        self.assertEqual(res.get_json()['title'], 'Mine')
+
+    def test_export_ndjson_and_csv(self):
+        self.client.post('/tasks/bulk', json={'tasks': [
+            {'title': f'Export {i}', 'description': 'a, "quoted" value'} for i in range(5)]}, headers=self.headers)
+        self.client.put('/tasks/1', json={'completed': True}, headers=self.headers)
+        self.app.config['EXPORT_BATCH_SIZE'] = 2
+        res = self.client.get('/tasks/export?format=ndjson', headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.is_streamed)
+        self.assertEqual(res.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+        self.assertEqual([row['title'] for row in rows], [f'Export {i}' for i in range(5)])
+        res = self.client.get('/tasks/export?format=csv&completed=false', headers=self.headers)
+        self.assertEqual(res.mimetype, 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(res.get_data(as_text=True))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['description'], 'a, "quoted" value')
+
+    def test_export_unsupported_format(self):
+        res = self.client.get('/tasks/export?format=xml', headers=self.headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('msg', res.get_json())
+
+    def test_import_ndjson_reports_rejected_lines(self):
+        self.app.config['IMPORT_CHUNK_SIZE'] = 2
+        body = '\n'.join(json.dumps({'title': f'Imported {i}'}) for i in range(5))
+        body += '\nnot json\n{"description": "No title"}\n'
+        res = self.client.post('/tasks/import?format=ndjson', data=body,
+                               content_type='application/x-ndjson', headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        report = res.get_json()
+        self.assertEqual((report['rows'], report['inserted'], report['rejected']), (7, 5, 2))
+        self.assertEqual([e['line'] for e in report['errors']], [6, 7])
+        self.assertIn('rows_per_second', report)
+        res = self.client.get('/tasks', headers=self.headers)
+        self.assertEqual(res.get_json()['total'], 5)
+
+    def test_import_csv_upload(self):
+        self.app.config['IMPORT_MAX_ERROR_SAMPLES'] = 1
+        upload = b'title,description,completed\nFirst,,\nSecond,Desc,true\nBad,,maybe\nWorse,,nope\n'
+        res = self.client.post('/tasks/import', data={'file': (io.BytesIO(upload), 'tasks.csv')},
+                               headers=self.headers)
+        report = res.get_json()
+        self.assertEqual((report['inserted'], report['rejected']), (2, 2))
+        self.assertEqual(len(report['errors']), 1)
+        res = self.client.get('/tasks?completed=true', headers=self.headers)
+        self.assertEqual([t['title'] for t in res.get_json()['tasks']], ['Second'])
+
+    def test_import_cli_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('title,description\nFrom CLI,Row\n')
+        try:
+            result = self.app.test_cli_runner().invoke(
+                args=['tasks', 'import', f.name, '--username', 'testuser'])
+        finally:
+            os.remove(f.name)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Imported 1 of 1 rows', result.output)
+        res = self.client.get('/tasks', headers=self.headers)
+        self.assertEqual(res.get_json()['tasks'][0]['title'], 'From CLI')
+
+    def test_get_task_conditional_requests(self):
+        res = self.client.post('/tasks', json={'title': 'Cached'}, headers=self.headers)
+        task_id = res.get_json()['id']
+        res = self.client.get(f'/tasks/{task_id}', headers=self.headers)
+        etag = res.headers['ETag']
+        last_modified = res.headers['Last-Modified']
+        res = self.client.get(f'/tasks/{task_id}', headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.get_data(), b'')
+        self.assertEqual(res.headers['ETag'], etag)
+        res = self.client.get(f'/tasks/{task_id}', headers={**self.headers, 'If-Modified-Since': last_modified})
+        self.assertEqual(res.status_code, 304)
+        self.client.put(f'/tasks/{task_id}', json={'title': 'Changed'}, headers=self.headers)
+        res = self.client.get(f'/tasks/{task_id}', headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers['ETag'], etag)
+
+    def test_get_tasks_conditional_requests(self):
+        for i in range(3):
+            self.client.post('/tasks', json={'title': f'Task {i}'}, headers=self.headers)
+        res = self.client.get('/tasks?per_page=2', headers=self.headers)
+        etag = res.headers['ETag']
+        self.assertIn('Last-Modified', res.headers)
+        res = self.client.get('/tasks?per_page=2', headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(res.status_code, 304)
+        # Different page parameters are a different representation
+        res = self.client.get('/tasks?per_page=2&page=2', headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        # A delete does not move max(updated_at) but still changes the ETag
+        self.client.delete('/tasks/3', headers=self.headers)
+        res = self.client.get('/tasks?per_page=2', headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.get_json()['total'], 2)
+
+    def test_list_and_export_items_match_single_task(self):
+        res = self.client.post('/tasks', json={'title': 'Shape', 'description': 'Same'}, headers=self.headers)
+        task_id = res.get_json()['id']
+        self.client.put(f'/tasks/{task_id}', json={'completed': True}, headers=self.headers)
+        single = self.client.get(f'/tasks/{task_id}', headers=self.headers).get_json()
+        self.assertEqual(self.client.get('/tasks', headers=self.headers).get_json()['tasks'], [single])
+        self.assertEqual(self.client.get('/tasks?limit=5', headers=self.headers).get_json()['tasks'], [single])
+        exported = self.client.get('/tasks/export', headers=self.headers).get_data(as_text=True)
+        self.assertEqual(json.loads(exported), single)
+
+    def test_sparse_fieldsets(self):
+        for i in range(5):
+            self.client.post('/tasks', json={'title': f'Task {i}', 'description': 'Long text'}, headers=self.headers)
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        # Every Engine, so async mode's engine is seen as well
+        event.listen(Engine, 'before_cursor_execute', listener)
+        try:
+            res = self.client.get('/tasks?fields=title,id,completed&per_page=2', headers=self.headers)
+            self.assertEqual(res.get_json()['tasks'], [
+                {'id': 1, 'title': 'Task 0', 'completed': False}, {'id': 2, 'title': 'Task 1', 'completed': False}])
+            page_query = statements[-1]
+            self.assertIn('LIMIT', page_query)
+            self.assertNotIn('task.description', page_query)
+        finally:
+            event.remove(Engine, 'before_cursor_execute', listener)
+        # Cursor pages still carry their sort key forward when it is not requested
+        seen = []
+        res = self.client.get('/tasks?fields=title&limit=2', headers=self.headers)
+        while True:
+            data = res.get_json()
+            self.assertTrue(all(list(task) == ['title'] for task in data['tasks']))
+            seen.extend(task['title'] for task in data['tasks'])
+            if not data['next_cursor']:
+                break
+            res = self.client.get(f"/tasks?fields=title&limit=2&cursor={data['next_cursor']}", headers=self.headers)
+        self.assertEqual(seen, [f'Task {i}' for i in range(5)])
+        res = self.client.get('/tasks/1?fields=title', headers=self.headers)
+        self.assertEqual(res.get_json(), {'title': 'Task 0'})
+        full = self.client.get('/tasks/1', headers=self.headers)
+        self.assertIn('description', full.get_json())
+        # Each projection is its own representation
+        self.assertNotEqual(res.headers['ETag'], full.headers['ETag'])
+        res = self.client.get('/tasks/1?fields=title', headers={**self.headers, 'If-None-Match': res.headers['ETag']})
+        self.assertEqual(res.status_code, 304)
+        res = self.client.get('/tasks/export?format=csv&fields=completed,title', headers=self.headers)
+        self.assertEqual(res.get_data(as_text=True).splitlines()[0], 'title,completed')
+        res = self.client.get('/tasks/export?fields=id', headers=self.headers)
+        self.assertEqual([json.loads(line) for line in res.get_data(as_text=True).splitlines()],
+                         [{'id': i} for i in range(1, 6)])
+
+    def test_sparse_fieldsets_unknown_field(self):
+        for url in ('/tasks?fields=title,password', '/tasks/1?fields=password', '/tasks/export?fields=password'):
+            res = self.client.get(url, headers=self.headers)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.get_json()['msg'], 'Unknown fields: password')
+
 if __name__ == '__main__':
     unittest.main()